@@ -1,3 +1,4 @@
+import importlib
 import logging
 
 from .. import LOGGER
@@ -29,7 +30,18 @@ if not USING_CAPI:
 else:
     from .capi import *
 
-from .webui import DecisionTreeWebUi, show, to_html
+# The web UI is imported on first access, see __getattr__ below, so evaluation-only processes never load it.
+_WEBUI_EXPORTS = ('DecisionTreeWebUi', 'show', 'to_html')
+
+
+def __getattr__(name: str):
+    if name == 'webui' or name in _WEBUI_EXPORTS:
+        webui = importlib.import_module('.webui', __name__)
+        if name == 'webui':
+            return webui
+        value = globals()[name] = getattr(webui, name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def set_logger(logger: logging.Logger):
@@ -42,7 +54,9 @@ def set_logger(logger: logging.Logger):
     else:
         native.set_logger(logger.getChild('Native'))
 
-    webui.set_logger(logger.getChild('WebUI'))
+    # a lazily imported web UI derives its logger from LOGGER on import
+    if 'webui' in globals():
+        webui.set_logger(logger.getChild('WebUI'))
 
 
 __all__ = [
@@ -51,7 +65,7 @@ __all__ = [
     # .exc
     'NO_DEFAULT',
     'EmptyBlock', 'BreakBlock',
-    'NodeError', 'TooManyChildren', 'TooFewChildren', 'NodeNotFountError', 'NodeValueError', 'NodeTypeError', 'NodeContextError',
+    'NodeError', 'TooManyChildren', 'TooFewChildren', 'NodeNotFountError', 'NodeValueError', 'NodeTypeError', 'NodeContextError', 'NodeFrozenError',
     'EdgeValueError',
     'ResolutionError', 'ExpressFalse', 'ExpressEvaluationError', 'ContextsNotFound',
 
@@ -61,9 +75,9 @@ __all__ = [
     'NodeEdgeCondition', 'ConditionElse', 'ConditionAny', 'ConditionAuto', 'BinaryCondition', 'ConditionTrue', 'ConditionFalse',
     'NO_CONDITION', 'ELSE_CONDITION', 'AUTO_CONDITION', 'TRUE_CONDITION', 'FALSE_CONDITION',
     'SkipContextsBlock', 'LogicExpression', 'LogicNode',
-    'LogicGroupManager', 'LGM', 'LogicGroup',
+    'LogicGroupManager', 'LGM', 'LogicGroup', 'EvalContext',
     'ActionNode', 'BreakpointNode', 'PlaceholderNode',
-    'NoAction', 'LongAction', 'ShortAction',
+    'NoAction', 'DEFAULT_ACTION', 'LongAction', 'ShortAction',
 
     # .capi.c_node or .native.node
     'RootLogicNode', 'ContextLogicExpression',
@@ -74,7 +88,7 @@ __all__ = [
     'LogicalExpressionOperator', 'LogicalExpression',
 
     # .capi.c_collection or .native.collection
-    'LogicMapping', 'LogicSequence', 'LogicGenerator',
+    'LogicMapping', 'LogicSequence', 'LogicRecord', 'LogicGenerator',
 
     # .webui
     'DecisionTreeWebUi', 'show', 'to_html'
@@ -9,9 +9,9 @@ from .c_abc import (
     NodeEdgeCondition, ConditionElse, ConditionAny, ConditionAuto, BinaryCondition, ConditionTrue, ConditionFalse,
     NO_CONDITION, ELSE_CONDITION, AUTO_CONDITION, TRUE_CONDITION, FALSE_CONDITION,
     SkipContextsBlock, LogicExpression, LogicNode,
-    LogicGroupManager, LGM, LogicGroup,
+    LogicGroupManager, LGM, LogicGroup, EvalContext,
     ActionNode, BreakpointNode, PlaceholderNode,
-    NoAction, LongAction, ShortAction, CancelAction
+    NoAction, DEFAULT_ACTION, LongAction, ShortAction, CancelAction
 )
 
 from .c_node import (
@@ -26,6 +26,7 @@ from .c_node import (
 from .c_collection import (
     LogicMapping,
     LogicSequence,
+    LogicRecord,
     LogicGenerator,
 )
 
@@ -42,9 +43,9 @@ __all__ = [
     'NodeEdgeCondition', 'ConditionElse', 'ConditionAny', 'ConditionAuto', 'BinaryCondition', 'ConditionTrue', 'ConditionFalse',
     'NO_CONDITION', 'ELSE_CONDITION', 'AUTO_CONDITION', 'TRUE_CONDITION', 'FALSE_CONDITION',
     'SkipContextsBlock', 'LogicExpression', 'LogicNode',
-    'LogicGroupManager', 'LGM', 'LogicGroup',
+    'LogicGroupManager', 'LGM', 'LogicGroup', 'EvalContext',
     'ActionNode', 'BreakpointNode', 'PlaceholderNode',
-    'NoAction', 'LongAction', 'ShortAction', 'CancelAction',
+    'NoAction', 'DEFAULT_ACTION', 'LongAction', 'ShortAction', 'CancelAction',
 
     'RootLogicNode', 'ContextLogicExpression',
     'AttrExpression', 'AttrNestedExpression',
@@ -53,5 +54,5 @@ __all__ = [
     'ComparisonExpressionOperator', 'ComparisonExpression',
     'LogicalExpressionOperator', 'LogicalExpression',
 
-    'LogicMapping', 'LogicSequence', 'LogicGenerator'
+    'LogicMapping', 'LogicSequence', 'LogicRecord', 'LogicGenerator'
 ]
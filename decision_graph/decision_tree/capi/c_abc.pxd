@@ -77,6 +77,7 @@ cdef class LogicExpression(SkipContextsBlock):
     cdef readonly type dtype
     cdef readonly str repr
     cdef readonly object uid
+    cdef dict _log_records
 
     cdef object c_eval(self, bint enforce_dtype)
 
@@ -107,6 +108,40 @@ cdef struct LogicNodeStack:
     size_t size
 
 
+cdef struct FrameCell
+cdef struct FrameSlab
+
+
+cdef union FrameData:
+    LogicGroupFrame logic_group_frame
+    LogicNodeFrame logic_node_frame
+    FrameCell* next_free
+
+
+cdef struct FrameCell:
+    FrameData data  # first, so that the address of a frame is the address of its cell
+    FrameSlab* slab
+
+
+cdef enum:
+    FRAME_SLAB_SIZE = 256
+
+
+cdef struct FrameSlab:
+    FrameSlab* prev
+    FrameSlab* next
+    FrameCell* free_list
+    size_t n_carved
+    size_t n_live
+    bint available
+    FrameCell cells[FRAME_SLAB_SIZE]
+
+
+cdef void* c_frame_alloc() except NULL
+
+cdef void c_frame_free(void* frame) noexcept
+
+
 cdef struct ShelvedStateFrame:
     LogicGroupStack* active_groups
     LogicNodeStack* active_nodes
@@ -131,6 +166,21 @@ cdef class LogicGroupManager(Singleton):
     cdef readonly dict _cache
     cdef public bint inspection_mode
     cdef public bint vigilant_mode
+    cdef public double log_interval
+    cdef size_t _log_epoch
+    cdef readonly size_t n_default_fallback
+    cdef readonly size_t n_dtype_mismatch
+    cdef readonly size_t n_suppressed_logs
+    cdef readonly size_t structure_version
+    cdef readonly bint registry_weak
+    cdef readonly size_t registry_capacity
+    cdef readonly double registry_ttl
+    cdef dict _registry_clock
+    cdef readonly size_t n_registry_evicted
+    cdef object _bindings
+    cdef size_t _n_bindings
+    cdef object _awaited
+    cdef size_t _n_awaiting
 
     @staticmethod
     cdef inline void c_ln_stack_push(LogicNodeStack* stack, LogicNode logic_node)
@@ -149,6 +199,14 @@ cdef class LogicGroupManager(Singleton):
 
     cdef inline LogicGroup c_cached_init(self, str name, type cls, dict kwargs)
 
+    cdef inline LogicGroup c_registry_lookup(self, tuple reg_key, dict registry, str name)
+
+    cdef inline void c_registry_store(self, tuple reg_key, dict registry, str name, LogicGroup logic_group)
+
+    cdef inline void c_registry_drop(self, tuple reg_key, str name)
+
+    cdef inline void c_registry_evict(self, double now)
+
     cdef inline void c_lg_enter(self, LogicGroup logic_group)
 
     cdef inline void c_lg_exit(self, LogicGroup logic_group=*)
@@ -163,6 +221,29 @@ cdef class LogicGroupManager(Singleton):
 
     cdef inline void c_clear(self)
 
+    cdef Py_ssize_t c_log_permit(self, LogicExpression expression, str kind)
+
+    cdef dict c_layer(self, dict base, dict context)
+
+    cdef object c_bind(self, dict context)
+
+    cdef object c_bind_layered(self, dict bindings)
+
+    cdef void c_unbind(self, object token)
+
+    cdef object c_bound(self, LogicGroup logic_group)
+
+    cdef object c_stage_awaited(self, dict awaited)
+
+    cdef void c_unstage_awaited(self, object token)
+
+    cdef object c_awaited(self, LogicExpression expression)
+
+
+cdef class EvalContext:
+    cdef readonly dict bindings
+    cdef list _tokens
+
 
 cdef LogicGroupManager LGM
 
@@ -172,6 +253,7 @@ cdef class LogicGroup:
     cdef readonly LogicGroup parent
     cdef readonly type Break
     cdef readonly dict contexts
+    cdef object __weakref__
 
     cdef void c_break_inspection(self)
 
@@ -187,9 +269,20 @@ cdef class LogicNode(LogicExpression):
     cdef readonly dict children
     cdef readonly list labels
     cdef readonly bint autogen
+    cdef frozenset _dependencies
+    cdef bint _dependencies_resolved
+    cdef dict _slots
+    cdef list _placeholders
+    cdef readonly bint frozen
+    cdef tuple _dispatch
+    cdef LogicNode _fallback
 
     cdef NodeEdgeCondition c_infer_condition(self, LogicNode child)
 
+    cdef LogicNodeFrame* c_locate_child(self, LogicNode child)
+
+    cdef void c_reslot(self, LogicNodeFrame* frame, LogicNode original_node, LogicNode new_node)
+
     cdef PlaceholderNode c_get_placeholder(self)
 
     cdef void c_append(self, LogicNode child, NodeEdgeCondition condition)
@@ -198,14 +291,36 @@ cdef class LogicNode(LogicExpression):
 
     cdef void c_replace(self, LogicNode original_node, LogicNode new_node)
 
+    cdef void c_freeze(self)
+
     cdef void c_validate(self)
 
     cdef tuple c_eval_recursively(self, list path=*, object default=*)
 
+    cdef tuple c_no_match(self, object value, list path, object default)
+
+    cdef LogicNode c_select(self, object value)
+
+    cdef void c_collect_pending(self, list pending)
+
     cdef void c_auto_fill(self)
 
     cdef size_t c_consolidate_placeholder(self)
 
+    cdef object c_signature(self)
+
+    cdef LogicNode c_deduplicate(self, dict registry, size_t* merged)
+
+    @staticmethod
+    cdef object c_value_signature(object value)
+
+    cdef frozenset c_dependencies(self)
+
+    cdef frozenset c_resolve_dependencies(self)
+
+    @staticmethod
+    cdef frozenset c_value_dependencies(object value)
+
 
 cdef class BreakpointNode(LogicNode):
     cdef readonly LogicGroup break_from
@@ -216,6 +331,7 @@ cdef class BreakpointNode(LogicNode):
 
 cdef class ActionNode(LogicNode):
     cdef readonly object action
+    cdef readonly bint shared
 
     cdef void c_auto_connect(self)
 
@@ -230,6 +346,9 @@ cdef class NoAction(ActionNode):
     cdef readonly ssize_t sig
 
 
+cdef NoAction DEFAULT_ACTION
+
+
 cdef class LongAction(ActionNode):
     cdef readonly ssize_t sig
 
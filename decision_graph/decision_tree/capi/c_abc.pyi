@@ -230,10 +230,31 @@ class LogicGroupManager(Singleton):
     Attributes:
         inspection_mode (bool): If True, generate layout without executing actions.
         vigilant_mode (bool): If True, perform stricter validation and avoid auto-generated nodes.
+        log_interval (float): Minimal seconds between two identical warnings emitted by the same node on the
+            evaluation hot path. Repeated warnings within the interval are counted and suppressed. Defaults to 1.
+        n_default_fallback (int): Number of evaluations that fell back to the default value.
+        n_dtype_mismatch (int): Number of evaluated values not matching the expression dtype.
+        n_suppressed_logs (int): Number of hot-path warnings suppressed by rate limiting.
+        structure_version (int): Global counter bumped on every edge mutation (append, overwrite, replace and
+            deduplicate merges) of any tree. Views derived from a tree structure, e.g. the serialized web UI
+            layout, are valid as long as this counter is unchanged.
+        registry_weak (bool): If True, the cached LogicGroups are weakly referenced. See ``configure_registry``.
+        registry_capacity (int): Maximal number of cached LogicGroups, 0 for unbounded.
+        registry_ttl (float): Maximal idle seconds of a cached LogicGroup, ``inf`` for unbounded.
+        n_registry_evicted (int): Number of cached LogicGroups evicted by the capacity or idle-time bounds.
     """
 
     inspection_mode: bool
     vigilant_mode: bool
+    log_interval: float
+    n_default_fallback: int
+    n_dtype_mismatch: int
+    n_suppressed_logs: int
+    structure_version: int
+    registry_weak: bool
+    registry_capacity: int
+    registry_ttl: float
+    n_registry_evicted: int
 
     def __call__(self, name: str, cls: type[LogicGroup], **kwargs) -> LogicGroup:
         """Get or create a cached LogicGroup instance with the given name.
@@ -252,6 +273,23 @@ class LogicGroupManager(Singleton):
     def __contains__(self, instance: LogicGroup) -> bool:
         """Return True if the given LogicGroup instance is cached by this manager."""
 
+    def configure_registry(self, weak: bool = False, capacity: int = 0, ttl: float = float('inf')) -> None:
+        """Bound the registry of cached LogicGroups, which by default keeps every group until ``clear``.
+
+        Services creating per-request or per-instrument groups should bound the registry. An evicted or collected
+        group is simply created anew by the next ``LGM(name, cls)`` call, which stays O(1) in every mode.
+
+        Args:
+            weak (bool): Hold the cached groups by weak references, a group is dropped once no longer used elsewhere.
+            capacity (int): Evict the least recently used groups beyond this number of entries, 0 for unbounded.
+            ttl (float): Evict the groups not accessed for this many seconds, ``inf`` for unbounded.
+
+        The live entries are kept, re-registered under the new mode.
+        """
+
+    def registry_stats(self) -> dict[str, object]:
+        """Return a snapshot of the registry: ``size`` (live entries), ``evicted``, ``weak``, ``capacity`` and ``ttl``."""
+
     def shelve(self) -> None:
         """Shelve the current active group and node stacks and breakpoint stacks for later restoration.
 
@@ -263,6 +301,18 @@ class LogicGroupManager(Singleton):
     def unshelve(self) -> None:
         """Restore the most recently shelved active group and node stacks."""
 
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of the evaluation counters.
+
+        The counters are always updated, even when the warnings are filtered by the logger level.
+
+        Returns:
+            dict[str, int]: ``default_fallback``, ``dtype_mismatch`` and ``suppressed_logs`` counts.
+        """
+
+    def reset_stats(self) -> None:
+        """Reset the evaluation counters and the rate limiting state of the hot-path warnings."""
+
     def clear(self) -> None:
         """Clear all cached LogicGroup instances and reset runtime stacks."""
 
@@ -275,6 +325,24 @@ class LogicGroupManager(Singleton):
         """The currently active LogicNode expression, or None if no expression context is entered."""
 
 
+class EvalContext(object):
+    """A context manager binding data to logic groups for the evaluations within its ``with`` block.
+
+    Created by ``LogicNode.bind``. It can be re-entered, but must be exited in the thread or task it was entered.
+
+    Attributes:
+        bindings (dict[LogicGroup | str, Any]): The data to bind, keyed by the logic groups or their names.
+    """
+
+    bindings: dict[LogicGroup | str, Any]
+
+    def __enter__(self) -> EvalContext:
+        ...
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        ...
+
+
 # Global instance of the manager
 LGM: LogicGroupManager
 
@@ -363,6 +431,7 @@ class LogicNode(LogicExpression):
         children (dict[NodeEdgeCondition, LogicNode]): Mapping of edge conditions to child nodes.
         labels (list[str]): LogicGroup names this node belongs to.
         autogen (bool): Whether this node was auto-generated to fill a missing branch.
+        frozen (bool): Whether this node is frozen, see ``freeze``.
     """
 
     parent: LogicNode | None
@@ -370,6 +439,7 @@ class LogicNode(LogicExpression):
     children: dict[NodeEdgeCondition, LogicNode]
     labels: list[str]
     autogen: bool
+    frozen: bool
 
     def __init__(self, *, expression: object = None, dtype: type = None, repr: str = None, uid: uuid.UUID = None, **kwargs):
         """
@@ -394,18 +464,66 @@ class LogicNode(LogicExpression):
         Returns the ``other`` node so calls can be chained.
         """
 
-    def __call__(self, default: Any = NO_DEFAULT) -> Any:
+    def __call__(self, default: Any = NO_DEFAULT, context: dict[LogicGroup | str, Any] = None) -> Any:
         """Evaluate the tree from this node and return the final action/value.
 
-        If ``default`` is not provided, a ``NoAction`` node will be used as the
-        fallback terminal.
+        If ``default`` is not provided, the shared ``DEFAULT_ACTION`` node will be
+        used as the fallback terminal.
 
         You can pass ``NO_DEFAULT`` to explicitly require a matching branch;
         if no edge matches, a ``ValueError`` will be raised.
         See ``eval_recursively`` for details.
+
+        If ``context`` is provided, the evaluation reads the given data instead of the
+        data of the logic groups, see ``bind``.
+        """
+        ...
+
+    async def aeval(self, default: Any = NO_DEFAULT, context: dict[LogicGroup | str, Any] = None) -> Any:
+        """Evaluate the tree from this node like ``__call__``, awaiting the expressions doing I/O.
+
+        A node whose ``expression`` is a callable returning an awaitable, e.g. an ``async def``
+        function, is awaited instead of blocking. Before a node is evaluated, the callables it
+        reads, including the operands of its math, comparison and logical expressions, are called
+        once and their awaitables are run concurrently with ``asyncio.gather``. The node is then
+        evaluated as usual on the awaited values. Only the expressions of one node are gathered:
+        the branch taken depends on its value, so the nodes below it are never called ahead.
+
+        ``__call__`` and the other synchronous evaluations are unchanged, they do not await.
+
+        >>> async def risk_limit():
+        ...     return await risk_service.fetch('limit')
+        >>> action = await root.aeval(context={'quote': {'price': 101.}})
+
+        Args:
+            default: The fallback terminal, as in ``__call__``.
+            context: The data to bind for this evaluation, see ``bind``.
+
+        Returns:
+            The final action/value.
         """
         ...
 
+    def bind(self, context: dict[LogicGroup | str, Any] = None, **groups: Any) -> EvalContext:
+        """Bind data to logic groups for the evaluations within a ``with`` block.
+
+        While bound, attribute and getter expressions of a group read the bound data instead of the
+        ``data`` of a ``LogicMapping`` / ``LogicSequence``, or the ``contexts`` of a plain ``LogicGroup``.
+        Groups are matched by name, keyword arguments are keyed by the group name as well::
+
+        >>> with root.bind(quote={'price': 101.}):
+        ...     action = root()
+
+        The binding is held in a ``contextvars.ContextVar``, so it is local to the current thread and
+        asyncio task, and the same tree can be evaluated concurrently for different inputs. Bindings
+        nest, an inner one overrides the data of the same group. The shared state of the tree, like
+        the ``eval_path`` of a ``RootLogicNode``, only reflects the last evaluation.
+
+        Returns:
+            EvalContext: The context manager binding the data on enter, and restoring the previous
+                binding on exit.
+        """
+
     def append(self, child: LogicNode, condition: NodeEdgeCondition = AUTO_CONDITION) -> None:
         """Append a child node with the given edge condition.
 
@@ -459,6 +577,45 @@ class LogicNode(LogicExpression):
                 path list of nodes traversed during evaluation.
         """
 
+    def freeze(self) -> LogicNode:
+        """Make the subtree rooted at this node read-only and optimized for evaluation.
+
+        Remaining placeholders are replaced by ``NoAction`` nodes, as exiting a ``with`` block does,
+        and the construction states are dropped. Unconnected breakpoints are no longer connected
+        by the LGM. Each node precomputes its dispatch table, so evaluation no longer walks and
+        inspects the edge conditions of the children.
+
+        Afterwards ``append``, ``overwrite``, ``replace``, ``>>`` and entering the ``with`` block of
+        a frozen node raise ``NodeFrozenError``, and ``deduplicate`` leaves its edges untouched.
+        Deduplicate before freezing. Freezing can not be undone.
+
+        Returns:
+            LogicNode: This node, so that ``root = root.freeze()`` can be chained.
+
+        Raises:
+            RuntimeError: If a node of the subtree is still active, i.e. its ``with`` block is not exited.
+        """
+
+    def deduplicate(self, registry: dict = None) -> int:
+        """Merge structurally identical subtrees under this node into a single shared instance.
+
+        Nodes are fingerprinted bottom-up by class, repr, dtype, expression (operator, operands and
+        the bound logic group), labels and the edge condition to their parent. Callable expressions and
+        actions only match themselves. A subtree with an equal fingerprint is replaced by the first
+        one registered, so the tree becomes a DAG and evaluation returns the very same node instances.
+
+        Shared nodes keep the ``parent`` of their first registration. Breakpoints, placeholders and
+        subclasses defined outside this package are never merged. Only call this on a
+        finished tree, i.e. after all ``with`` blocks have exited.
+
+        Args:
+            registry (dict | None): The fingerprint registry. Pass the same dict to share nodes
+                across several trees.
+
+        Returns:
+            int: The number of child references redirected to a shared node.
+        """
+
     def list_labels(self) -> dict[str, list[LogicNode]]:
         """List all LogicGroup names in the subtree rooted at this node.
 
@@ -475,6 +632,15 @@ class LogicNode(LogicExpression):
     def is_leaf(self) -> bool:
         """True if this node has no children; otherwise False."""
 
+    @property
+    def dependencies(self) -> frozenset[str] | None:
+        """The input keys this node's expression reads, resolved statically and cached.
+
+        Attribute and getter expressions depend on their (top-level) key, composite expressions
+        on the union of their operands. Constants have no dependencies, while callables yield
+        ``None`` as their inputs are unknown.
+        """
+
     @property
     def child_stack(self) -> Iterable[LogicNode]:
         """An iterable of all child nodes in the subtree rooted at this node."""
@@ -546,6 +712,7 @@ class ActionNode(LogicNode):
     """A terminal node that can execute an optional ``action`` upon selection."""
 
     action: Callable[[], Any] | None
+    shared: bool
 
     def __init__(
             self,
@@ -555,6 +722,7 @@ class ActionNode(LogicNode):
             dtype: type = None,
             repr: str = None,
             auto_connect: bool = True,
+            shared: bool = False,
             **kwargs,
     ) -> None:
         """
@@ -566,6 +734,8 @@ class ActionNode(LogicNode):
             dtype (type, optional): The expected type of the evaluated value (e.g. float, int, or bool).
             repr (str, optional): A string representation of the expression.
             auto_connect (bool): If True, automatically connect this action node to the active node in the LGM upon creation.
+            shared (bool): If True, the node is a detached singleton shared by many evaluations, such as ``DEFAULT_ACTION``;
+                appending, overwriting or replacing with it raises ``NodeValueError``, so it never gets a parent.
             kwargs: __cinit__ extra kwargs guardian of for subclassing support.
         """
 
@@ -632,6 +802,11 @@ class NoAction(ActionNode):
         """
 
 
+# Shared, detached ``NoAction`` returned by ``LogicNode.__call__`` when no branch matches and no default is given.
+# It is created with ``shared=True``, attaching it to a tree raises ``NodeValueError``.
+DEFAULT_ACTION: NoAction
+
+
 class LongAction(ActionNode):
     """An action node variant carrying a positive ``sig`` marker.
 
@@ -1,15 +1,22 @@
+import asyncio
+import contextvars
+import functools
+import inspect
 import linecache
+import logging
 import operator
 import sys
-import traceback
+import time
 import uuid
 import warnings
+import weakref
 
-from cpython.mem cimport PyMem_Calloc, PyMem_Free
+from cpython.mem cimport PyMem_Calloc, PyMem_Malloc, PyMem_Free
 from cpython.pystate cimport PyThreadState_Get
 from cpython.ref cimport Py_INCREF, Py_DECREF
 from cython import final
 from libc.stdint cimport uintptr_t
+from libc.string cimport memset
 
 from .. import LOGGER
 from ..exc import *
@@ -306,6 +313,33 @@ cdef class SkipContextsBlock:
         return self.global_profile_tracer
 
 
+async def _await_pending(list pending):
+    # calls each expression once, and awaits the awaitable results concurrently
+    cdef dict results = {}
+    cdef list keys = []
+    cdef LogicExpression expression
+    cdef object key
+    try:
+        for expression in pending:
+            key = <uintptr_t> <PyObject*> expression
+            if key in results:
+                continue
+            results[key] = expression.expression()
+            if inspect.isawaitable(results[key]):
+                keys.append(key)
+    except BaseException:
+        # do not leave the coroutines already created un-awaited
+        for key in keys:
+            if inspect.iscoroutine(results[key]):
+                results[key].close()
+        raise
+
+    if keys:
+        for key, value in zip(keys, await asyncio.gather(*[results[key] for key in keys])):
+            results[key] = value
+    return results
+
+
 cdef class LogicExpression(SkipContextsBlock):
     def __cinit__(self, *, object expression=None, type dtype=None, str repr=None, object uid=None, **kwargs):
         self.expression = expression
@@ -317,10 +351,13 @@ cdef class LogicExpression(SkipContextsBlock):
         return bool(self.c_eval(False))
 
     cdef object c_eval(self, bint enforce_dtype):
+        cdef Py_ssize_t suppressed
         if isinstance(self.expression, (float, int, bool, str)):
             value = self.expression
         elif callable(self.expression):
-            value = self.expression()
+            value = LGM.c_awaited(self) if LGM._n_awaiting else NO_DEFAULT
+            if value is NO_DEFAULT:
+                value = self.expression()
         elif isinstance(self.expression, Exception):
             raise self.expression
         else:
@@ -331,7 +368,14 @@ cdef class LogicExpression(SkipContextsBlock):
         elif enforce_dtype:
             value = self.dtype(value)
         elif not isinstance(value, self.dtype):
-            LOGGER.warning(f"Evaluated value {value} does not match dtype {self.dtype.__name__}.")
+            LGM.n_dtype_mismatch += 1
+            if LOGGER.isEnabledFor(logging.WARNING):
+                suppressed = LGM.c_log_permit(self, 'dtype_mismatch')
+                if suppressed >= 0:
+                    LOGGER.warning(
+                        'Evaluated value %s does not match dtype %s.%s',
+                        value, self.dtype.__name__, f' ({suppressed} similar messages suppressed)' if suppressed else ''
+                    )
 
         return value
 
@@ -451,6 +495,91 @@ cdef class LogicExpression(SkipContextsBlock):
         return f"<{self.__class__.__name__}>(dtype={'Any' if self.dtype is None else self.dtype.__name__}, repr={self.repr})"
 
 
+# LogicNodeFrame and LogicGroupFrame are carved from slabs and recycled through a free list per slab.
+# Stack pushes and pops then rarely reach the allocator, and the frames of one tree stay close in memory.
+# The frames are never moved, so their addresses remain valid. The slabs with free cells are linked together,
+# and a slab whose frames are all freed is released, unless it is the last one with free cells.
+cdef FrameSlab* FRAME_AVAILABLE = NULL
+cdef size_t FRAME_N_SLABS = 0
+cdef size_t FRAME_N_LIVE = 0
+
+
+cdef inline void c_slab_link(FrameSlab* slab) noexcept:
+    global FRAME_AVAILABLE
+    slab.prev = NULL
+    slab.next = FRAME_AVAILABLE
+    if FRAME_AVAILABLE:
+        FRAME_AVAILABLE.prev = slab
+    FRAME_AVAILABLE = slab
+    slab.available = True
+
+
+cdef inline void c_slab_unlink(FrameSlab* slab) noexcept:
+    global FRAME_AVAILABLE
+    if slab.prev:
+        slab.prev.next = slab.next
+    else:
+        FRAME_AVAILABLE = slab.next
+    if slab.next:
+        slab.next.prev = slab.prev
+    slab.prev = slab.next = NULL
+    slab.available = False
+
+
+cdef void* c_frame_alloc() except NULL:
+    global FRAME_N_SLABS, FRAME_N_LIVE
+    cdef FrameSlab* slab = FRAME_AVAILABLE
+    cdef FrameCell* cell
+
+    if not slab:
+        slab = <FrameSlab*> PyMem_Malloc(sizeof(FrameSlab))
+        if not slab:
+            raise MemoryError()
+        slab.free_list = NULL
+        slab.n_carved = 0
+        slab.n_live = 0
+        c_slab_link(slab)
+        FRAME_N_SLABS += 1
+
+    if slab.free_list:
+        cell = slab.free_list
+        slab.free_list = cell.data.next_free
+    else:
+        cell = &slab.cells[slab.n_carved]
+        cell.slab = slab
+        slab.n_carved += 1
+
+    slab.n_live += 1
+    FRAME_N_LIVE += 1
+    if not slab.free_list and slab.n_carved == FRAME_SLAB_SIZE:
+        c_slab_unlink(slab)
+
+    memset(&cell.data, 0, sizeof(FrameData))
+    return cell
+
+
+cdef void c_frame_free(void* frame) noexcept:
+    global FRAME_N_SLABS, FRAME_N_LIVE
+    cdef FrameCell* cell = <FrameCell*> frame
+    cdef FrameSlab* slab = cell.slab
+
+    cell.data.next_free = slab.free_list
+    slab.free_list = cell
+    slab.n_live -= 1
+    FRAME_N_LIVE -= 1
+
+    if not slab.available:
+        c_slab_link(slab)
+    if not slab.n_live and (slab.prev or slab.next):
+        c_slab_unlink(slab)
+        PyMem_Free(slab)
+        FRAME_N_SLABS -= 1
+
+
+def _frame_arena_stats() -> dict[str, int]:
+    return {'slabs': FRAME_N_SLABS, 'live': FRAME_N_LIVE}
+
+
 cdef class LogicGroupManager(Singleton):
     def __cinit__(self):
         self._cache = {}
@@ -462,6 +591,28 @@ cdef class LogicGroupManager(Singleton):
         self.inspection_mode = False  # run node graph in inspection mode, without evaluating value, to map the graph
         self.vigilant_mode = False  # disable auto generation of missing action nodes
 
+        self.log_interval = 1.  # minimal seconds between two identical hot-path log messages of the same node
+        self._log_epoch = 0  # the throttle records of the nodes are stale once it moved on
+        self.n_default_fallback = 0
+        self.n_dtype_mismatch = 0
+        self.n_suppressed_logs = 0
+        self.structure_version = 0  # bumped on every edge mutation, used to invalidate cached views of the trees
+
+        # registry of the cached LogicGroups, strong and unbounded by default, see configure_registry
+        self.registry_weak = False
+        self.registry_capacity = 0
+        self.registry_ttl = float('inf')
+        self._registry_clock = None  # (reg_key, name) -> last access, least recent first, only when bounded
+        self.n_registry_evicted = 0
+
+        # data bound to the LogicGroups for the current evaluation, per thread and per asyncio task
+        self._bindings = contextvars.ContextVar('bindings', default=None)  # group name -> data, see c_bind
+        self._n_bindings = 0  # bindings entered in any thread, the unbound evaluation skips the lookup when zero
+
+        # values of the callables already awaited by an async evaluation, see LogicNode.aeval
+        self._awaited = contextvars.ContextVar('awaited', default=None)  # id of the expression -> value
+        self._n_awaiting = 0  # staged in any thread, the sync evaluation skips the lookup when zero
+
     def __dealloc__(self):
         if self._active_groups:
             while self._active_groups.size:
@@ -485,7 +636,7 @@ cdef class LogicGroupManager(Singleton):
 
     @staticmethod
     cdef inline void c_ln_stack_push(LogicNodeStack* stack, LogicNode logic_node):
-        cdef LogicNodeFrame* frame = <LogicNodeFrame*> PyMem_Calloc(1, sizeof(LogicNodeFrame))
+        cdef LogicNodeFrame* frame = <LogicNodeFrame*> c_frame_alloc()
         frame.logic_node = <PyObject*> logic_node
         Py_INCREF(logic_node)
         frame.prev = stack.top
@@ -505,7 +656,7 @@ cdef class LogicGroupManager(Singleton):
         stack.top = frame.prev
         stack.size -= 1
         Py_DECREF(<object> frame.logic_node)
-        PyMem_Free(frame)
+        c_frame_free(frame)
 
     @staticmethod
     cdef inline void c_ln_stack_remove(LogicNodeStack* stack, LogicNode logic_node):
@@ -525,7 +676,7 @@ cdef class LogicGroupManager(Singleton):
                 stack.size -= 1
 
                 Py_DECREF(<object> curc.logic_node)
-                PyMem_Free(curc)
+                c_frame_free(curc)
                 return
 
             prev = curc
@@ -582,13 +733,77 @@ cdef class LogicGroupManager(Singleton):
         else:
             registry = self._cache[reg_key] = {}
 
-        if name in registry:
-            return registry[name]
+        cdef LogicGroup logic_group = self.c_registry_lookup(reg_key, registry, name)
+        if logic_group is not None:
+            return logic_group
 
-        cdef LogicGroup logic_group = cls(name=name, **kwargs)
-        registry[name] = logic_group
+        logic_group = cls(name=name, **kwargs)
+        self.c_registry_store(reg_key, registry, name, logic_group)
         return logic_group
 
+    cdef inline LogicGroup c_registry_lookup(self, tuple reg_key, dict registry, str name):
+        # returns None if the name is not registered, or its entry has expired (dropped here)
+        cdef object entry = registry.get(name)
+        if entry is None:
+            return None
+
+        cdef object logic_group = entry() if type(entry) is weakref.ref else entry
+        if logic_group is None:
+            self.c_registry_drop(reg_key, name)
+            return None
+
+        cdef tuple key
+        cdef double now
+        if self._registry_clock is not None:
+            key = (reg_key, name)
+            now = time.monotonic()
+            if now - <double> self._registry_clock[key] > self.registry_ttl:
+                self.c_registry_drop(reg_key, name)
+                self.n_registry_evicted += 1
+                return None
+            # move to the most recent end
+            del self._registry_clock[key]
+            self._registry_clock[key] = now
+        return <LogicGroup> logic_group
+
+    cdef inline void c_registry_store(self, tuple reg_key, dict registry, str name, LogicGroup logic_group):
+        if self.registry_weak:
+            registry[name] = weakref.ref(logic_group, functools.partial(self._registry_reap, reg_key, name))
+        else:
+            registry[name] = logic_group
+
+        cdef double now
+        if self._registry_clock is not None:
+            now = time.monotonic()
+            self._registry_clock[(reg_key, name)] = now
+            self.c_registry_evict(now)
+
+    cdef inline void c_registry_drop(self, tuple reg_key, str name):
+        cdef dict registry = self._cache.get(reg_key)
+        if registry is not None:
+            registry.pop(name, None)
+            if not registry:
+                del self._cache[reg_key]
+        if self._registry_clock is not None:
+            self._registry_clock.pop((reg_key, name), None)
+
+    cdef inline void c_registry_evict(self, double now):
+        # the least recently used entries are first, evict them while over capacity or idle for too long
+        cdef dict clock = self._registry_clock
+        cdef tuple key
+        while clock:
+            key = next(iter(clock))
+            if not ((self.registry_capacity and len(clock) > self.registry_capacity) or now - <double> clock[key] > self.registry_ttl):
+                break
+            self.c_registry_drop(key[0], key[1])
+            self.n_registry_evicted += 1
+
+    def _registry_reap(self, tuple reg_key, str name, object ref):
+        # weakref callback, only drop the entry if it is still the collected reference
+        cdef dict registry = self._cache.get(reg_key)
+        if registry is not None and registry.get(name) is ref:
+            self.c_registry_drop(reg_key, name)
+
     cdef inline void c_lg_enter(self, LogicGroup logic_group):
         # Step 1: Update parent info
         cdef LogicGroupFrame* frame = self._active_groups.top
@@ -596,7 +811,7 @@ cdef class LogicGroupManager(Singleton):
             logic_group.parent = <LogicGroup> <object> frame.logic_group
 
         # Step 2: Push to active_groups stack
-        frame = <LogicGroupFrame*> PyMem_Calloc(1, sizeof(LogicGroupFrame))
+        frame = <LogicGroupFrame*> c_frame_alloc()
         frame.logic_group = <PyObject*> logic_group
         Py_INCREF(logic_group)
         frame.prev = self._active_groups.top
@@ -629,7 +844,7 @@ cdef class LogicGroupManager(Singleton):
         self._active_groups.top = frame.prev
         self._active_groups.size -= 1
         Py_DECREF(logic_group)
-        PyMem_Free(frame)
+        c_frame_free(frame)
 
     cdef inline void c_ln_enter(self, LogicNode logic_node):
         # Step 1: Filter action node
@@ -655,7 +870,7 @@ cdef class LogicGroupManager(Singleton):
                     self._breakpoint_nodes.top = breakpoint_frame_next
                 self._breakpoint_nodes.size -= 1
                 Py_DECREF(<object> breakpoint_node)
-                PyMem_Free(breakpoint_frame)
+                c_frame_free(breakpoint_frame)
                 # will NOT update breakpoint_frame_prev
                 breakpoint_frame = breakpoint_frame_next
             else:
@@ -750,7 +965,52 @@ cdef class LogicGroupManager(Singleton):
         if reg_key not in self._cache:
             return False
         cdef dict registry = self._cache[reg_key]
-        return name in registry
+        cdef object entry = registry.get(name)
+        if type(entry) is weakref.ref:
+            return entry() is not None
+        return entry is not None
+
+    def configure_registry(self, bint weak=False, size_t capacity=0, double ttl=float('inf')):
+        cdef list entries = []
+        cdef tuple reg_key
+        cdef dict registry
+        cdef str name
+        cdef object entry, logic_group
+        for reg_key, registry in self._cache.items():
+            for name, entry in registry.items():
+                logic_group = entry() if type(entry) is weakref.ref else entry
+                if logic_group is not None:
+                    entries.append((reg_key, name, logic_group))
+
+        self.registry_weak = weak
+        self.registry_capacity = capacity
+        self.registry_ttl = ttl
+        self._registry_clock = {} if capacity or ttl != float('inf') else None
+
+        # re-register the live entries under the new mode, existing entries count as just accessed
+        self._cache.clear()
+        for reg_key, name, logic_group in entries:
+            if reg_key in self._cache:
+                registry = self._cache[reg_key]
+            else:
+                registry = self._cache[reg_key] = {}
+            self.c_registry_store(reg_key, registry, name, <LogicGroup> logic_group)
+
+    def registry_stats(self) -> dict[str, object]:
+        cdef size_t size = 0
+        cdef dict registry
+        cdef object entry
+        for registry in self._cache.values():
+            for entry in registry.values():
+                if type(entry) is not weakref.ref or entry() is not None:
+                    size += 1
+        return {
+            'size': size,
+            'evicted': self.n_registry_evicted,
+            'weak': self.registry_weak,
+            'capacity': self.registry_capacity,
+            'ttl': self.registry_ttl,
+        }
 
     def shelve(self):
         self.c_shelve()
@@ -758,8 +1018,102 @@ cdef class LogicGroupManager(Singleton):
     def unshelve(self):
         self.c_unshelve()
 
+    cdef Py_ssize_t c_log_permit(self, LogicExpression expression, str kind):
+        # returns -1 if the message should be suppressed, otherwise the number of messages suppressed since the last one
+        # the records live on the expression, they are released along with it
+        cdef double now = time.monotonic()
+        cdef list record = None
+        cdef Py_ssize_t suppressed
+
+        if expression._log_records is None:
+            expression._log_records = {}
+        else:
+            record = expression._log_records.get(kind)
+
+        if record is None or record[0] != self._log_epoch:
+            expression._log_records[kind] = [self._log_epoch, now, 0]
+            return 0
+
+        if now - <double> record[1] < self.log_interval:
+            record[2] += 1
+            self.n_suppressed_logs += 1
+            return -1
+
+        suppressed = record[2]
+        record[1] = now
+        record[2] = 0
+        return suppressed
+
+    cdef dict c_layer(self, dict base, dict context):
+        # Nested bindings are layered, the inner one overrides the data of the same group
+        cdef dict bindings = {} if base is None else base.copy()
+
+        cdef object key
+        cdef object data
+        for key, data in context.items():
+            if isinstance(key, LogicGroup):
+                key = (<LogicGroup> key).name
+            elif not isinstance(key, str):
+                raise TypeError(f'Context must be keyed by LogicGroup or its name, got {key!r}.')
+            bindings[key] = data
+        return bindings
+
+    cdef object c_bind(self, dict context):
+        return self.c_bind_layered(self.c_layer(self._bindings.get(), context))
+
+    cdef object c_bind_layered(self, dict bindings):
+        # binds bindings already layered over the current ones by c_layer
+        cdef object token = self._bindings.set(bindings)
+        self._n_bindings += 1
+        return token
+
+    cdef void c_unbind(self, object token):
+        self._bindings.reset(token)
+        self._n_bindings -= 1
+
+    cdef object c_bound(self, LogicGroup logic_group):
+        # returns the data bound to the logic group for the current evaluation, None if not bound
+        if not self._n_bindings:
+            return None
+        cdef dict bindings = self._bindings.get()
+        if bindings is None:
+            return None
+        return bindings.get(logic_group.name)
+
+    cdef object c_stage_awaited(self, dict awaited):
+        cdef object token = self._awaited.set(awaited)
+        self._n_awaiting += 1
+        return token
+
+    cdef void c_unstage_awaited(self, object token):
+        self._awaited.reset(token)
+        self._n_awaiting -= 1
+
+    cdef object c_awaited(self, LogicExpression expression):
+        # returns the value awaited for the expression by the current async evaluation, NO_DEFAULT if none
+        cdef dict awaited = self._awaited.get()
+        if awaited is None:
+            return NO_DEFAULT
+        return awaited.get(<uintptr_t> <PyObject*> expression, NO_DEFAULT)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'default_fallback': self.n_default_fallback,
+            'dtype_mismatch': self.n_dtype_mismatch,
+            'suppressed_logs': self.n_suppressed_logs,
+        }
+
+    def reset_stats(self):
+        self._log_epoch += 1
+        self.n_default_fallback = 0
+        self.n_dtype_mismatch = 0
+        self.n_suppressed_logs = 0
+
     def clear(self):
         self._cache.clear()
+        if self._registry_clock is not None:
+            self._registry_clock.clear()
+        self._log_epoch += 1
         self.c_clear()
 
         self._active_groups = <LogicGroupStack*> PyMem_Calloc(1, sizeof(LogicGroupStack))
@@ -784,6 +1138,22 @@ cdef class LogicGroupManager(Singleton):
             return <LogicNode> <object> ln
 
 
+cdef class EvalContext:
+    def __cinit__(self, dict bindings):
+        self.bindings = bindings
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(LGM.c_bind(self.bindings))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        LGM.c_unbind(self._tokens.pop())
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}>({", ".join(map(str, self.bindings))})'
+
+
 cdef LogicGroupManager LGM = LogicGroupManager()
 globals()['LGM'] = LGM
 
@@ -904,6 +1274,11 @@ cdef class LogicNode(LogicExpression):
         self.children = {}
         self.labels = []
         self.autogen = False
+        self._slots = {}  # address of child -> address of its frame in subordinates
+        self._placeholders = []  # placeholder children in push order, the last one is the current placeholder
+        self.frozen = False
+        self._dispatch = None  # (condition value, child) in matching order, only when frozen
+        self._fallback = None  # the unconditional or else child, only when frozen
 
         # update labels from active groups
         cdef LogicGroupFrame* frame = LGM._active_groups.top
@@ -964,23 +1339,42 @@ cdef class LogicNode(LogicExpression):
         # Case 4: both conditions are non-binary, cannot infer
         raise EdgeValueError('Cannot auto-infer condition for non-binary existing condition.')
 
+    cdef LogicNodeFrame* c_locate_child(self, LogicNode child):
+        cdef object slot = self._slots.get(<uintptr_t> <PyObject*> child)
+        if slot is None:
+            return NULL
+        return <LogicNodeFrame*> <uintptr_t> slot
+
+    cdef void c_reslot(self, LogicNodeFrame* frame, LogicNode original_node, LogicNode new_node):
+        # Swap the node held by the frame, keeping the slot index and the placeholder list in sync
+        Py_INCREF(new_node)
+        frame.logic_node = <PyObject*> new_node
+        del self._slots[<uintptr_t> <PyObject*> original_node]
+        self._slots[<uintptr_t> <PyObject*> new_node] = <uintptr_t> frame
+
+        cdef Py_ssize_t i
+        if isinstance(original_node, PlaceholderNode):
+            # The LogicExpression overloads __eq__, so list.remove can not be used. Usually the last one.
+            for i in range(len(self._placeholders) - 1, -1, -1):
+                if self._placeholders[i] is original_node:
+                    del self._placeholders[i]
+                    break
+        if isinstance(new_node, PlaceholderNode):
+            self._placeholders.append(new_node)
+        Py_DECREF(original_node)
+
     cdef PlaceholderNode c_get_placeholder(self):
-        cdef LogicNodeFrame* frame = self.subordinates.top
         cdef PlaceholderNode placeholder
 
         # Case 1: No child node registered, return a TRUE placeholder
-        if not frame:
+        if not self.subordinates.top:
             placeholder = PlaceholderNode(auto_connect=False)
             self.c_append(placeholder, TRUE_CONDITION)
             return placeholder
 
-        # Case 2: Traverse the stack to find existing placeholder
-        cdef LogicNode node
-        while frame:
-            node = <LogicNode> <object> frame.logic_node
-            if isinstance(node, PlaceholderNode):
-                return <PlaceholderNode> node
-            frame = frame.prev
+        # Case 2: The most recently registered placeholder
+        if self._placeholders:
+            return <PlaceholderNode> self._placeholders[-1]
 
         # Case 3: No existing placeholder, create a new one with AUTO_CONDITION.
         placeholder = PlaceholderNode(auto_connect=False)
@@ -989,6 +1383,12 @@ cdef class LogicNode(LogicExpression):
         return placeholder
 
     cdef void c_append(self, LogicNode child, NodeEdgeCondition condition):
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
+
+        if isinstance(child, ActionNode) and (<ActionNode> child).shared:
+            raise NodeValueError(f'{child} is shared, it can not be attached to a tree.')
+
         if condition is None:
             raise ValueError("LogicNode must have an valid edge condition.")
 
@@ -1000,10 +1400,20 @@ cdef class LogicNode(LogicExpression):
 
         self.children[condition] = child
         LogicGroupManager.c_ln_stack_push(self.subordinates, child)
+        self._slots[<uintptr_t> <PyObject*> child] = <uintptr_t> self.subordinates.top
+        if isinstance(child, PlaceholderNode):
+            self._placeholders.append(child)
         child.parent = self
         child.condition_to_parent = condition
+        LGM.structure_version += 1
 
     cdef void c_overwrite(self, LogicNode new_node, NodeEdgeCondition condition):
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
+
+        if isinstance(new_node, ActionNode) and (<ActionNode> new_node).shared:
+            raise NodeValueError(f'{new_node} is shared, it can not be attached to a tree.')
+
         if condition is None:
             raise ValueError("LogicNode must have an valid edge condition.")
 
@@ -1018,28 +1428,34 @@ cdef class LogicNode(LogicExpression):
         new_node.parent = self
         new_node.condition_to_parent = condition
 
-        cdef LogicNodeFrame* frame = LogicGroupManager.c_ln_stack_locate(self.subordinates, original_node)
+        cdef LogicNodeFrame* frame = self.c_locate_child(original_node)
         if not frame:
             raise LookupError(f'Failed to locate {original_node} from subordinates, buffer corruption detected.')
 
-        Py_DECREF(<object> frame.logic_node)
-        frame.logic_node = <PyObject*> new_node
-        Py_INCREF(<object> frame.logic_node)
+        self.c_reslot(frame, original_node, new_node)
         original_node.parent = None
         original_node.condition_to_parent = NO_CONDITION
+        LGM.structure_version += 1
 
     cdef void c_replace(self, LogicNode original_node, LogicNode new_node):
         cdef NodeEdgeCondition condition
         cdef LogicNode child
         cdef LogicNodeFrame* frame
 
-        # Step 1: Safety check:
-        frame = LogicGroupManager.c_ln_stack_locate(LGM._active_nodes, original_node)
-        if frame:
-            raise RuntimeError('Must not replace active node. Existing first required.')
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
+
+        if isinstance(new_node, ActionNode) and (<ActionNode> new_node).shared:
+            raise NodeValueError(f'{new_node} is shared, it can not be attached to a tree.')
 
-        # Step 2: Locate original node from stack
-        frame = LogicGroupManager.c_ln_stack_locate(self.subordinates, original_node)
+        # Step 1: Safety check, action nodes (e.g. placeholders) can not be entered, so never active
+        if not isinstance(original_node, ActionNode):
+            frame = LogicGroupManager.c_ln_stack_locate(LGM._active_nodes, original_node)
+            if frame:
+                raise RuntimeError('Must not replace active node. Existing first required.')
+
+        # Step 2: Locate original node from the slot index
+        frame = self.c_locate_child(original_node)
         if not frame:
             raise NodeNotFountError(f'Failed to locate {original_node} from subordinates.')
 
@@ -1047,12 +1463,41 @@ cdef class LogicNode(LogicExpression):
         new_node.parent = self
         new_node.condition_to_parent = original_node.condition_to_parent
 
-        Py_DECREF(<object> frame.logic_node)
-        frame.logic_node = <PyObject*> new_node
-        Py_INCREF(<object> frame.logic_node)
+        self.c_reslot(frame, original_node, new_node)
 
         original_node.parent = None
         original_node.condition_to_parent = NO_CONDITION
+        LGM.structure_version += 1
+
+    cdef void c_freeze(self):
+        # Step 1: Finalize the remaining placeholders, as exiting the with block does, and drop the construction states
+        if self._placeholders:
+            self.c_consolidate_placeholder()
+        self._placeholders = None
+
+        # Step 2: Precompute the dispatch table, in the order the children are matched by c_eval_recursively
+        cdef list dispatch = []
+        cdef LogicNode fallback = None
+        cdef LogicNode else_branch = None
+        cdef LogicNode child
+        cdef NodeEdgeCondition condition
+        cdef LogicNodeFrame* frame = self.subordinates.top
+        while frame:
+            child = <LogicNode> <object> frame.logic_node
+            condition = child.condition_to_parent
+            if condition is NO_CONDITION:
+                # matches any value, the children registered before it are never reached
+                fallback = child
+                break
+            elif condition is ELSE_CONDITION:
+                else_branch = child
+            else:
+                dispatch.append((condition.value, child))
+            frame = frame.prev
+
+        self._dispatch = tuple(dispatch)
+        self._fallback = else_branch if fallback is None else fallback
+        self.frozen = True
 
     cdef void c_validate(self):
         cdef size_t size = self.subordinates.size
@@ -1065,10 +1510,8 @@ cdef class LogicNode(LogicExpression):
         for condition, child in self.children.items():
             if child.condition_to_parent is not condition:
                 raise EdgeValueError('Child node condition does not match registered condition.')
-            frame = LogicGroupManager.c_ln_stack_locate(self.subordinates, child)
-            # in the locating function the existence is already checked
-            # but add this for a clearer error message
-            if not frame:
+            frame = self.c_locate_child(child)
+            if not frame or frame.logic_node != <PyObject*> child:
                 raise ValueError(f"LogicNode {child} not found in stack")
 
     cdef tuple c_eval_recursively(self, list path=None, object default=NO_DEFAULT):
@@ -1082,7 +1525,7 @@ cdef class LogicNode(LogicExpression):
             try:
                 value = self.c_eval(False)
             except Exception as e:
-                raise ExpressEvaluationError(f"Failed to evaluate {self}, {traceback.format_exc()}") from e
+                raise ExpressEvaluationError(node=self, path=path.copy(), exception=e) from e
         else:
             value = self.c_eval(False)
 
@@ -1093,6 +1536,55 @@ cdef class LogicNode(LogicExpression):
         cdef LogicNodeFrame* frame = self.subordinates.top
         cdef LogicNode child
         cdef NodeEdgeCondition condition
+        cdef tuple entry
+
+        if self.frozen:
+            for entry in self._dispatch:
+                if value == entry[0]:
+                    return (<LogicNode> entry[1]).c_eval_recursively(path, default)
+            else_branch = self._fallback
+        else:
+            while frame:
+                child = <LogicNode> <object> frame.logic_node
+                condition = child.condition_to_parent
+                if condition is ELSE_CONDITION:
+                    else_branch = child
+                elif condition is NO_CONDITION or value == condition.value:
+                    return child.c_eval_recursively(path, default)
+                frame = frame.prev
+
+        if else_branch is not None:
+            return else_branch.c_eval_recursively(path, default)
+        return self.c_no_match(value, path, default)
+
+    cdef tuple c_no_match(self, object value, list path, object default):
+        cdef Py_ssize_t suppressed
+        if default is NO_DEFAULT:
+            raise ValueError(f"No matching condition found for value {value} at '{self.repr}'.")
+
+        LGM.n_default_fallback += 1
+        if LOGGER.isEnabledFor(logging.WARNING):
+            suppressed = LGM.c_log_permit(self, 'default_fallback')
+            if suppressed >= 0:
+                LOGGER.warning(
+                    "No matching condition found for value %s at '%s', using default %s.%s",
+                    value, self.repr, default, f' ({suppressed} similar messages suppressed)' if suppressed else ''
+                )
+        return default, path
+
+    cdef LogicNode c_select(self, object value):
+        # the child c_eval_recursively descends into for the value, None if no condition matches
+        cdef LogicNodeFrame* frame = self.subordinates.top
+        cdef LogicNode else_branch = None
+        cdef LogicNode child
+        cdef NodeEdgeCondition condition
+        cdef tuple entry
+
+        if self.frozen:
+            for entry in self._dispatch:
+                if value == entry[0]:
+                    return <LogicNode> entry[1]
+            return self._fallback
 
         while frame:
             child = <LogicNode> <object> frame.logic_node
@@ -1100,17 +1592,61 @@ cdef class LogicNode(LogicExpression):
             if condition is ELSE_CONDITION:
                 else_branch = child
             elif condition is NO_CONDITION or value == condition.value:
-                return child.c_eval_recursively(path, default)
+                return child
             frame = frame.prev
+        return else_branch
+
+    cdef void c_collect_pending(self, list pending):
+        # the expressions called when this node is evaluated, called ahead by the async evaluation
+        if callable(self.expression):
+            pending.append(self)
+
+    async def _aeval_recursively(self, list path, object default):
+        cdef LogicNode node = self
+        cdef LogicNode linked_to
+        cdef list pending
+        cdef object token
+        cdef object value
 
-        if else_branch is not None:
-            return else_branch.c_eval_recursively(path, default)
+        while True:
+            if isinstance(node, ActionNode):
+                return node.c_eval_recursively(path, default)
+
+            path.append(node)
+            if isinstance(node, BreakpointNode):
+                # as BreakpointNode.c_eval_recursively, descend into the linked node
+                if not node.subordinates.size:
+                    if LGM.vigilant_mode:
+                        raise NodeValueError(f'{node} not connected.')
+                    return node.expression, path
+                linked_to = <LogicNode> <object> node.subordinates.top.logic_node
+                node = linked_to
+                continue
 
-        if default is NO_DEFAULT:
-            raise ValueError(f"No matching condition found for value {value} at '{self.repr}'.")
+            try:
+                pending = []
+                node.c_collect_pending(pending)
+                if pending:
+                    # the independent calls of the node are awaited together, then read back by c_eval
+                    token = LGM.c_stage_awaited(await _await_pending(pending))
+                    try:
+                        value = node.c_eval(False)
+                    finally:
+                        LGM.c_unstage_awaited(token)
+                else:
+                    value = node.c_eval(False)
+            except Exception as e:
+                if LGM.vigilant_mode:
+                    raise ExpressEvaluationError(node=node, path=path.copy(), exception=e) from e
+                raise
 
-        LOGGER.warning(f"No matching condition found for value {value} at '{self.repr}', using default {default}.")
-        return default, path
+            if node.is_leaf:
+                return value, path
+
+            linked_to = node.c_select(value)
+            if linked_to is None:
+                return node.c_no_match(value, path, default)
+            node = linked_to
 
     cdef void c_auto_fill(self):
         cdef size_t size = len(self.children)
@@ -1185,17 +1721,80 @@ cdef class LogicNode(LogicExpression):
             self.c_append(no_action, ELSE_CONDITION)
 
     cdef size_t c_consolidate_placeholder(self):
-        cdef LogicNodeFrame* frame = self.subordinates.top
         cdef LogicNode node
         cdef size_t placeholder_count = 0
 
+        # the most recent placeholder first, in the order of the subordinates stack
+        for node in reversed(self._placeholders.copy()):
+            self.c_replace(node, NoAction(auto_connect=False, autogen=True))
+            placeholder_count += 1
+        return placeholder_count
+
+    cdef object c_signature(self):
+        return (self.__class__, self.repr, self.dtype, self.autogen, LogicNode.c_value_signature(self.expression))
+
+    cdef LogicNode c_deduplicate(self, dict registry, size_t* merged):
+        cdef LogicNodeFrame* frame = self.subordinates.top
+        cdef LogicNode child
+        cdef LogicNode shared
+        cdef list edges = []
+
+        # Step 1: Post-order, so that every child is already interned when fingerprinting this node
         while frame:
-            node = <object> frame.logic_node
-            if isinstance(node, PlaceholderNode):
-                self.c_replace(node, NoAction(auto_connect=False, autogen=True))
-                placeholder_count += 1
+            child = <LogicNode> <object> frame.logic_node
+            shared = child.c_deduplicate(registry, merged)
+            if shared is not child and self.frozen:
+                # the edges of a frozen node are never redirected, it keeps referencing its own child
+                shared = child
+            elif shared is not child:
+                # shared node always carries the same condition_to_parent, as the condition is part of the fingerprint
+                # the parent pointer of the shared node is left untouched, it stays with the first registered parent
+                self.children[child.condition_to_parent] = shared
+                self.c_reslot(frame, child, shared)
+                merged[0] += 1
+                LGM.structure_version += 1
+            edges.append(<uintptr_t> <PyObject*> shared)
             frame = frame.prev
-        return placeholder_count
+
+        # Step 2: subclasses defined outside this package may carry extra states, never merge them
+        if not self.__class__.__module__.startswith(__package__):
+            return self
+
+        # Step 3: Intern this node, children are referenced by the address of their canonical node
+        # the labels are part of the key, so that nodes of different logic groups are never merged
+        cdef tuple key = (self.condition_to_parent, self.c_signature(), tuple(self.labels), tuple(edges))
+        shared = registry.get(key)
+        if shared is None:
+            registry[key] = self
+            return self
+        return shared
+
+    @staticmethod
+    cdef object c_value_signature(object value):
+        if isinstance(value, LogicNode):
+            return (<LogicNode> value).c_signature()
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            return (type(value), value)
+        # callables and other opaque objects are only equivalent to themselves
+        return <uintptr_t> <PyObject*> value
+
+    cdef frozenset c_dependencies(self):
+        if not self._dependencies_resolved:
+            self._dependencies = self.c_resolve_dependencies()
+            self._dependencies_resolved = True
+        return self._dependencies
+
+    cdef frozenset c_resolve_dependencies(self):
+        return LogicNode.c_value_dependencies(self.expression)
+
+    @staticmethod
+    cdef frozenset c_value_dependencies(object value):
+        if isinstance(value, LogicNode):
+            return (<LogicNode> value).c_dependencies()
+        if isinstance(value, (bool, int, float, str)) or value is None or value is NO_DEFAULT:
+            return frozenset()
+        # the inputs of callables and other opaque objects can not be determined statically
+        return None
 
     cdef bint c_entry_check(self):
         if LGM.inspection_mode:
@@ -1220,9 +1819,13 @@ cdef class LogicNode(LogicExpression):
         self.c_append(other, AUTO_CONDITION)
         return other  # Allow chaining
 
-    def __call__(self, object default=None):
+    def __call__(self, object default=None, dict context=None):
+        if context is not None:
+            with self.bind(context):
+                return self(default)
+
         if default is None:
-            default = NoAction(auto_connect=False, autogen=True)
+            default = DEFAULT_ACTION
 
         cdef bint inspection_mode = LGM.inspection_mode
         if inspection_mode:
@@ -1235,12 +1838,35 @@ cdef class LogicNode(LogicExpression):
         LGM.inspection_mode = inspection_mode
         return value
 
+    async def aeval(self, object default=None, dict context=None):
+        if context is not None:
+            with self.bind(context):
+                return await self.aeval(default)
+
+        if default is None:
+            default = DEFAULT_ACTION
+
+        cdef bint inspection_mode = LGM.inspection_mode
+        if inspection_mode:
+            LOGGER.info('LGM inspection mode temporally disabled to evaluate correctly.')
+            LGM.inspection_mode = False
+
+        try:
+            return (await self._aeval_recursively([], default))[0]
+        finally:
+            LGM.inspection_mode = inspection_mode
+
     def __repr__(self):
         return f'<{self.__class__.__name__}>({self.repr!r})'
 
     def __hash__(self):
         return <uintptr_t> <PyObject*> self
 
+    def bind(self, dict context=None, **groups) -> EvalContext:
+        if context is None:
+            return EvalContext(groups)
+        return EvalContext({**context, **groups})
+
     def append(self, LogicNode child, NodeEdgeCondition condition=AUTO_CONDITION):
         self.c_append(child, condition)
 
@@ -1253,6 +1879,28 @@ cdef class LogicNode(LogicExpression):
     def eval_recursively(self, list path=None, object default=NO_DEFAULT):
         return self.c_eval_recursively(path, default)
 
+    def freeze(self) -> LogicNode:
+        cdef LogicNode node
+        cdef list stack = [self]
+
+        while stack:
+            node = stack.pop()
+            # shared nodes of a deduplicated tree are visited once
+            if node.frozen:
+                continue
+            if LogicGroupManager.c_ln_stack_locate(LGM._active_nodes, node):
+                raise RuntimeError('Must not freeze active node. Existing first required.')
+            node.c_freeze()
+            stack.extend(node.children.values())
+        return self
+
+    def deduplicate(self, dict registry=None) -> int:
+        cdef size_t merged = 0
+        if registry is None:
+            registry = {}
+        self.c_deduplicate(registry, &merged)
+        return merged
+
     def list_labels(self) -> dict[str, list[LogicNode]]:
         labels = {}
 
@@ -1282,6 +1930,10 @@ cdef class LogicNode(LogicExpression):
         def __get__(self):
             return not self.children
 
+    property dependencies:
+        def __get__(self):
+            return self.c_dependencies()
+
     property child_stack:
         def __get__(self):
             cdef LogicNodeFrame* frame = self.subordinates.top
@@ -1342,6 +1994,15 @@ cdef class BreakpointNode(LogicNode):
     cdef void c_on_exit(self):
         LGM.c_ln_exit(self)
 
+    cdef void c_freeze(self):
+        # An unconnected breakpoint stays unconnected, it is no longer managed by LGM.
+        self.await_connection = False
+        try:
+            LogicGroupManager.c_ln_stack_remove(LGM._breakpoint_nodes, self)
+        except NodeNotFountError as _:
+            pass
+        LogicNode.c_freeze(self)
+
     cdef object c_eval(self, bint enforce_dtype):
         if not self.subordinates.size:
             if LGM.vigilant_mode:
@@ -1364,6 +2025,14 @@ cdef class BreakpointNode(LogicNode):
         cdef LogicNode linked_to = <LogicNode> <object> self.subordinates.top.logic_node
         return linked_to.c_eval_recursively(path, default)
 
+    cdef LogicNode c_deduplicate(self, dict registry, size_t* merged):
+        # Breakpoints only maintain a virtual link, the linked node is interned with its actual parent.
+        return self
+
+    cdef frozenset c_resolve_dependencies(self):
+        # Evaluation is delegated to the linked node, which tracks its own dependencies.
+        return frozenset()
+
     def __repr__(self):
         if self.subordinates.size:
             return f'<{self.__class__.__name__} connected>(break_from={self.break_from})'
@@ -1394,8 +2063,10 @@ cdef class BreakpointNode(LogicNode):
 
 
 cdef class ActionNode(LogicNode):
-    def __cinit__(self, *, object action=None, bint auto_connect=True, **kwargs):
+    def __cinit__(self, *, object action=None, bint auto_connect=True, bint shared=False, **kwargs):
         self.action = action
+        # a shared action is a detached singleton returned by many evaluations, it never gets a parent
+        self.shared = shared
 
         if auto_connect:
             self.c_auto_connect()
@@ -1418,6 +2089,18 @@ cdef class ActionNode(LogicNode):
         if self.action is not None:
             self.action()
 
+    cdef object c_signature(self):
+        return (
+            self.__class__, self.repr, self.dtype, self.autogen,
+            LogicNode.c_value_signature(self.expression),
+            LogicNode.c_value_signature(self.action),
+            getattr(self, 'sig', None)
+        )
+
+    cdef frozenset c_resolve_dependencies(self):
+        # Action nodes are leaves and always re-evaluated, so that their actions are triggered.
+        return frozenset()
+
     cdef void c_append(self, LogicNode child, NodeEdgeCondition condition):
         raise TooManyChildren('Action node must not have any child node.')
 
@@ -1452,6 +2135,9 @@ cdef class PlaceholderNode(ActionNode):
             return self
         return self.action
 
+    cdef object c_signature(self):
+        return <uintptr_t> <PyObject*> self
+
 
 cdef class NoAction(ActionNode):
     def __cinit__(self, *, ssize_t sig=0, str repr=None, bint auto_connect=True, bint autogen=False, **kwargs):
@@ -1466,6 +2152,12 @@ cdef class NoAction(ActionNode):
         return f'<{self.__class__.__name__}>(sig={self.sig})'
 
 
+# The shared fallback of evaluations without an explicit default, so that calls never allocate a NoAction.
+cdef NoAction DEFAULT_ACTION = NoAction(auto_connect=False, autogen=True, shared=True)
+
+globals()['DEFAULT_ACTION'] = DEFAULT_ACTION
+
+
 cdef class LongAction(ActionNode):
     def __cinit__(self, *, ssize_t sig=1, str repr=None, bint auto_connect=True, **kwargs):
         self.sig = sig
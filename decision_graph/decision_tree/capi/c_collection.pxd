@@ -3,10 +3,21 @@ from .c_abc cimport LogicGroup
 
 cdef class LogicMapping(LogicGroup):
     cdef dict __dict__
-    cdef readonly dict data
+    cdef readonly object data
+    cdef list _subscriptions
+    cdef readonly tuple schema
+    cdef dict _slot_index
+    cdef list _values
+    cdef dict _extra
 
     cdef object c_get(self, str key)
 
+    cdef Py_ssize_t c_slot_of(self, str key)
+
+    cdef object c_get_slot(self, Py_ssize_t slot)
+
+    cdef void c_notify(self, object keys)
+
 
 cdef class LogicSequence(LogicGroup):
     cdef dict __dict__
@@ -15,6 +26,31 @@ cdef class LogicSequence(LogicGroup):
     cdef object c_get(self, ssize_t index)
 
 
+cdef class LogicRecord(LogicGroup):
+    cdef dict __dict__
+    cdef readonly object data
+    cdef readonly object dtype
+    cdef readonly tuple schema
+    cdef const unsigned char[::1] _buffer
+    cdef dict _slot_index
+    cdef Py_ssize_t* _offsets
+    cdef Py_ssize_t* _sizes
+    cdef char* _codes
+    cdef Py_ssize_t _itemsize
+    cdef Py_ssize_t _n_records
+    cdef Py_ssize_t _index
+    cdef Py_ssize_t _base
+    cdef bint _scalar
+
+    cdef void c_seek(self, Py_ssize_t index) except *
+
+    cdef Py_ssize_t c_slot_of(self, str key)
+
+    cdef object c_get_slot(self, Py_ssize_t slot)
+
+    cdef object c_get(self, str key)
+
+
 cdef class LogicGenerator(LogicGroup):
     cdef dict __dict__
     cdef readonly object data
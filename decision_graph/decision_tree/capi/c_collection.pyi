@@ -1,8 +1,28 @@
-from collections.abc import Iterator, Sequence, Generator
+from collections.abc import Callable, Iterable, Iterator, MutableMapping, Sequence, Generator
 from typing import Any, Optional
 
 from .c_abc import LogicGroup
-from .c_node import GetterExpression, AttrExpression
+from .c_node import GetterExpression, AttrExpression, RootLogicNode
+
+
+class SlotMapping(MutableMapping[str, Any]):
+    """The ``data`` of a ``LogicMapping`` with a schema.
+
+    The values of the declared keys are read from and written to the slots of the mapping, the
+    undeclared keys are kept in a plain dict. A declared key without a value is missing.
+    """
+
+    def __init__(self, slot_index: dict[str, int], values: list[Any], extra: dict[str, Any]) -> None: ...
+
+    def __getitem__(self, key: str) -> Any: ...
+
+    def __setitem__(self, key: str, value: Any) -> None: ...
+
+    def __delitem__(self, key: str) -> None: ...
+
+    def __iter__(self) -> Iterator[str]: ...
+
+    def __len__(self) -> int: ...
 
 
 class LogicMapping(LogicGroup):
@@ -15,11 +35,13 @@ class LogicMapping(LogicGroup):
 
     Attributes:
         data: The underlying dict object used to store key/value pairs.
+        schema: The declared keys, or None. See ``__init__``.
     """
 
-    data: dict[str, Any]
+    data: dict[str, Any] | SlotMapping
+    schema: tuple[str, ...] | None
 
-    def __init__(self, *, name: str = None, data: dict[str, Any] = None, parent: Any | None = None, contexts: Optional[dict] = None) -> None:
+    def __init__(self, *, name: str = None, data: dict[str, Any] = None, parent: Any | None = None, contexts: Optional[dict] = None, schema: Iterable[str] = None) -> None:
         """Initialize the LogicMapping.
 
         Arguments:
@@ -32,6 +54,12 @@ class LogicMapping(LogicGroup):
             contexts: Optional dict to use for the group's contexts. When not
                 provided, a default contexts mapping will be used/created by
                 the runtime manager.
+            schema: Optional keys to declare. Their values are stored in a flat list of slots, and
+                when the tree is frozen (see ``LogicNode.freeze``), the attribute expressions reading
+                them are resolved to a fixed slot, so that a read is an index operation instead of a
+                dict lookup. ``data`` then becomes a ``SlotMapping``, a mutable view over the slots and
+                the undeclared keys, so writes through it are seen by frozen trees. The dict passed in
+                is copied, later writes to it are not seen.
         """
 
     def __bool__(self) -> bool:
@@ -74,14 +102,56 @@ class LogicMapping(LogicGroup):
     def __contains__(self, key: str) -> bool:
         """Return True if ``key`` exists in the mapping."""
 
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Write ``value`` under ``key`` and notify the subscribed decision trees."""
+
+    def __delitem__(self, key: str) -> None:
+        """Delete ``key`` and notify the subscribed decision trees."""
+
     def update(self, *args: Any, **kwargs: Any) -> None:
         """Update the underlying mapping with the provided items.
 
-        Accepts the same arguments as :meth:`dict.update`.
+        Accepts the same arguments as :meth:`dict.update`. Subscribed decision trees are notified
+        once with all the updated keys.
         """
 
     def clear(self) -> None:
-        """Remove all items from the underlying mapping."""
+        """Remove all items from the underlying mapping, and notify the subscribed decision trees."""
+
+    def set_row(self, values: Iterable[Any]) -> None:
+        """Write the values of all the declared keys at once, in the order of the schema.
+
+        Subscribed decision trees are notified once with all the declared keys.
+
+        Raises:
+            ValueError: If this mapping has no schema, or the number of values does not match it.
+        """
+
+    def subscribe(
+            self,
+            root: RootLogicNode,
+            callback: Callable[[RootLogicNode, Any, Any], Any] = None,
+            auto_eval: bool = True
+    ) -> None:
+        """Observe writes to this mapping on behalf of a decision tree.
+
+        Every write through ``__setitem__``, ``__delitem__``, ``update`` or ``clear`` marks the
+        written keys dirty on ``root``. With ``auto_eval`` the tree is re-evaluated at once with
+        ``root.eval_incremental()``, and ``callback(root, value, previous)`` fires only when the
+        selected action differs from the previous one. The first evaluation after subscribing
+        always fires, as there is no previous action yet.
+
+        Writes to ``data`` directly bypass the notification. Subscribing the same root again
+        replaces its previous subscription.
+
+        Args:
+            root: The decision tree to notify.
+            callback: Optional callable invoked when the selected action changes.
+            auto_eval: Re-evaluate on write. Otherwise, keys are only marked dirty.
+        """
+
+    def unsubscribe(self, root: RootLogicNode) -> None:
+        """Stop observing writes on behalf of ``root``, no-op if not subscribed."""
 
 
 class LogicSequence(LogicGroup):
@@ -167,6 +237,80 @@ class LogicSequence(LogicGroup):
         """Return True when the underlying sequence is non-empty."""
 
 
+class LogicRecord(LogicGroup):
+    """A logic group reading the fields of one record of a structured array, without copying it.
+
+    The wrapped data is a NumPy structured array (or a single record of one), or any C-contiguous
+    buffer together with a structured ``dtype``. Numpy is not imported, only the ``names``,
+    ``fields`` and ``itemsize`` of the dtype are used. The attribute expressions of this group read
+    their field straight from the buffer at the current record, so moving the cursor with
+    :meth:`seek` or :meth:`advance` rebinds every expression of the tree to another record, without
+    converting it to a dict.
+
+    Numeric and boolean fields of a native byte order, and fixed-width byte strings, are decoded
+    from the buffer. Other fields (sub-arrays, objects, non-native byte order, ...) are read by
+    indexing the wrapped array, which requires ``data`` to be an array.
+
+    Attributes:
+        data: The wrapped array or buffer.
+        dtype: The structured dtype of the records.
+        schema: The field names, in the order of the dtype.
+    """
+
+    data: Any
+    dtype: Any
+    schema: tuple[str, ...]
+
+    def __init__(self, *, name: str = None, data: Any = None, dtype: Any = None, index: int = 0, parent: Any | None = None, contexts: Optional[dict] = None) -> None:
+        """Initialize the LogicRecord.
+
+        Args:
+            name: Logical name for this group.
+            data: The structured array, or a buffer of records. If ``None``, it is taken from the
+                group's ``contexts`` under the key ``'data'``.
+            dtype: The structured dtype of the records, defaults to ``data.dtype``.
+            index: The initial position of the cursor.
+            parent: Optional parent logic group (opaque in this stub).
+            contexts: Optional contexts mapping used by the runtime manager.
+
+        Raises:
+            TypeError: If no structured dtype is available, or a field can only be read from an
+                array and ``data`` is a raw buffer.
+            ValueError: If ``data`` is not a C-contiguous buffer.
+            IndexError: If ``index`` is out of range.
+        """
+
+    @property
+    def index(self) -> int:
+        """The position of the current record."""
+
+    def seek(self, index: int) -> None:
+        """Move the cursor to the record at ``index``.
+
+        Raises:
+            IndexError: If ``index`` is out of range, negative indices are not supported.
+        """
+
+    def advance(self) -> bool:
+        """Move the cursor to the next record.
+
+        Returns:
+            False, leaving the cursor in place, if the current record is the last one; True otherwise.
+        """
+
+    def __len__(self) -> int:
+        """Return the number of records in the buffer."""
+
+    def __getitem__(self, key: str) -> AttrExpression:
+        """Return an expression reading the field ``key`` of the current record."""
+
+    def __getattr__(self, key: str) -> AttrExpression:
+        """Return an expression reading the field ``key`` of the current record."""
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if ``key`` is a field of the records."""
+
+
 class LogicGenerator:
     """Wraps a generator/iterator to expose generator protocol operations
     via a logic-group object.
@@ -1,17 +1,71 @@
-from collections.abc import Mapping, Sequence, Generator
+import sys
+from collections.abc import Mapping, MutableMapping, Sequence, Generator
 
+from cpython.bytes cimport PyBytes_FromStringAndSize
 from cpython.dict cimport PyDict_GetItem
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
 from cpython.object cimport PyObject
 from cpython.ref cimport Py_INCREF
+from cpython.list cimport PyList_GET_ITEM
+from libc.stdint cimport int8_t, int16_t, int32_t, int64_t, uint8_t, uint16_t, uint32_t, uint64_t
+from libc.string cimport memcpy
 
 from .c_abc cimport LogicGroup
-from .c_node cimport AttrExpression, GetterExpression
+from .c_node cimport AttrExpression, GetterExpression, RootLogicNode
 
 from . import LOGGER
+from ..exc import NO_DEFAULT
+
+
+class SlotMapping(MutableMapping):
+    """The data of a LogicMapping with a schema, the declared keys are stored in slots and the others in a dict."""
+    __slots__ = ('_slot_index', '_values', '_extra')
+
+    def __init__(self, slot_index: dict, values: list, extra: dict):
+        self._slot_index = slot_index
+        self._values = values
+        self._extra = extra
+
+    def __getitem__(self, key):
+        slot = self._slot_index.get(key)
+        if slot is None:
+            return self._extra[key]
+        value = self._values[slot]
+        if value is NO_DEFAULT:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        slot = self._slot_index.get(key)
+        if slot is None:
+            self._extra[key] = value
+        else:
+            self._values[slot] = value
+
+    def __delitem__(self, key):
+        slot = self._slot_index.get(key)
+        if slot is None:
+            del self._extra[key]
+        elif self._values[slot] is NO_DEFAULT:
+            raise KeyError(key)
+        else:
+            self._values[slot] = NO_DEFAULT
+
+    def __iter__(self):
+        for key, slot in self._slot_index.items():
+            if self._values[slot] is not NO_DEFAULT:
+                yield key
+        yield from self._extra
+
+    def __len__(self):
+        return sum(value is not NO_DEFAULT for value in self._values) + len(self._extra)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({dict(self)!r})'
 
 
 cdef class LogicMapping(LogicGroup):
-    def __cinit__(self, *, str name=None, object data=None, LogicGroup parent=None, dict contexts=None, **kwargs):
+    def __cinit__(self, *, str name=None, object data=None, LogicGroup parent=None, dict contexts=None, object schema=None, **kwargs):
         cdef object ctx_data
         if data is None:
             ctx_data = self.contexts.setdefault('data', {})
@@ -24,14 +78,76 @@ cdef class LogicMapping(LogicGroup):
                 raise TypeError("The 'data' parameter must be a Mapping!.")
         else:
             self.data = <dict> data
+        self._subscriptions = []
+
+        # With a schema, the values of the declared keys are stored in slots, and data becomes a view over them
+        self.schema = None
+        self._slot_index = None
+        self._values = None
+        self._extra = None
+        if schema is not None:
+            self.schema = tuple(schema)
+            self._slot_index = {key: slot for slot, key in enumerate(self.schema)}
+            if len(self._slot_index) != len(self.schema):
+                raise ValueError(f'Duplicated keys in the schema of {self}.')
+            self._values = [self.data.get(key, NO_DEFAULT) for key in self.schema]
+            self._extra = {key: value for key, value in self.data.items() if key not in self._slot_index}
+            self.data = SlotMapping(self._slot_index, self._values, self._extra)
+            if data is None:
+                self.contexts['data'] = self.data
 
     cdef object c_get(self, str key):
-        cdef PyObject* v = PyDict_GetItem(self.data, key)
+        cdef Py_ssize_t slot
+        cdef PyObject* v
+        if self._values is None:
+            v = PyDict_GetItem(<dict> self.data, key)
+        else:
+            slot = self.c_slot_of(key)
+            if slot >= 0:
+                return self.c_get_slot(slot)
+            v = PyDict_GetItem(self._extra, key)
         if v:
             Py_INCREF(<object> v)
             return <object> v
         raise KeyError(key)
 
+    cdef Py_ssize_t c_slot_of(self, str key):
+        # -1 if the key is not declared in the schema
+        if self._slot_index is None:
+            return -1
+        cdef object slot = self._slot_index.get(key)
+        if slot is None:
+            return -1
+        return slot
+
+    cdef object c_get_slot(self, Py_ssize_t slot):
+        # the slots are the only copy of the declared values, data is a view over them
+        cdef object value = <object> PyList_GET_ITEM(self._values, slot)
+        if value is NO_DEFAULT:
+            raise KeyError(self.schema[slot])
+        return value
+
+    cdef void c_notify(self, object keys):
+        cdef list subscription
+        cdef RootLogicNode root
+        cdef object callback
+        cdef object value
+        cdef object previous
+
+        # Iterate over a copy, callbacks are allowed to (un)subscribe
+        for subscription in self._subscriptions.copy():
+            root = <RootLogicNode> subscription[0]
+            root.c_mark_dirty(keys)
+            if not subscription[2]:
+                continue
+
+            value = root.eval_incremental()
+            previous = subscription[3]
+            subscription[3] = value
+            callback = subscription[1]
+            if callback is not None and value is not previous:
+                callback(root, value, previous)
+
     def __bool__(self):
         return bool(self.data)
 
@@ -47,11 +163,53 @@ cdef class LogicMapping(LogicGroup):
     def __contains__(self, str key):
         return key in self.data
 
+    def __setitem__(self, str key, object value):
+        self.data[key] = value
+        if self._subscriptions:
+            self.c_notify((key,))
+
+    def __delitem__(self, str key):
+        del self.data[key]
+        if self._subscriptions:
+            self.c_notify((key,))
+
     def update(self, *args, **kwargs):
-        self.data.update(*args, **kwargs)
+        if not self._subscriptions:
+            self.data.update(*args, **kwargs)
+            return
+
+        cdef dict updates = dict(*args, **kwargs)
+        self.data.update(updates)
+        self.c_notify(updates.keys())
 
     def clear(self):
+        cdef tuple keys = tuple(self.data)
         self.data.clear()
+        if self._subscriptions:
+            self.c_notify(keys)
+
+    def set_row(self, object values):
+        if self.schema is None:
+            raise ValueError(f'{self} has no schema, set_row requires one.')
+
+        cdef list row = list(values)
+        if len(row) != len(self.schema):
+            raise ValueError(f'Expected {len(self.schema)} values for the schema of {self}, got {len(row)}.')
+
+        self._values[:] = row
+        if self._subscriptions:
+            self.c_notify(self.schema)
+
+    def subscribe(self, RootLogicNode root, object callback=None, bint auto_eval=True):
+        self.unsubscribe(root)
+        self._subscriptions.append([root, callback, auto_eval, None])
+
+    def unsubscribe(self, RootLogicNode root):
+        cdef list subscription
+        for subscription in self._subscriptions:
+            if subscription[0] is root:
+                self._subscriptions.remove(subscription)
+                return
 
 
 cdef class LogicSequence(LogicGroup):
@@ -136,3 +294,188 @@ cdef class LogicGenerator(LogicGroup):
 
     def close(self):
         return self.data.close()
+
+
+# field codes of a LogicRecord, FIELD_OBJECT fields are read through the wrapped array
+cdef enum:
+    FIELD_OBJECT = 0
+    FIELD_F8
+    FIELD_F4
+    FIELD_I8
+    FIELD_I4
+    FIELD_I2
+    FIELD_I1
+    FIELD_U8
+    FIELD_U4
+    FIELD_U2
+    FIELD_U1
+    FIELD_B1
+    FIELD_BYTES
+
+cdef dict FIELD_CODES = {
+    ('f', 8): FIELD_F8, ('f', 4): FIELD_F4,
+    ('i', 8): FIELD_I8, ('i', 4): FIELD_I4, ('i', 2): FIELD_I2, ('i', 1): FIELD_I1,
+    ('u', 8): FIELD_U8, ('u', 4): FIELD_U4, ('u', 2): FIELD_U2, ('u', 1): FIELD_U1,
+    ('b', 1): FIELD_B1,
+}
+cdef tuple NATIVE_BYTEORDER = ('=', '|', '<' if sys.byteorder == 'little' else '>')
+
+
+cdef class LogicRecord(LogicGroup):
+    def __cinit__(self, *, str name=None, object data=None, object dtype=None, Py_ssize_t index=0, LogicGroup parent=None, dict contexts=None, **kwargs):
+        if data is None:
+            data = self.contexts.get('data')
+            if data is None:
+                raise TypeError("The 'data' parameter must be a structured array or a buffer!.")
+        if dtype is None:
+            dtype = getattr(data, 'dtype', None)
+            if dtype is None or dtype.names is None:
+                raise TypeError(f'A structured dtype is required for {self}, pass it along with raw buffers.')
+
+        try:
+            self._buffer = memoryview(data).cast('B')
+        except TypeError as e:
+            raise ValueError(f'The data of {self} must be a C-contiguous buffer.') from e
+
+        self.data = data
+        self.dtype = dtype
+        self.schema = tuple(dtype.names)
+        self._slot_index = {key: slot for slot, key in enumerate(self.schema)}
+        self._itemsize = dtype.itemsize
+        # a single record (numpy.void or 0-d array) is indexed by field name directly
+        self._scalar = getattr(data, 'shape', None) == ()
+        self._n_records = len(self._buffer) // self._itemsize if self._itemsize else 0
+
+        cdef Py_ssize_t n = len(self.schema)
+        self._offsets = <Py_ssize_t*> PyMem_Malloc(max(n, 1) * sizeof(Py_ssize_t))
+        self._sizes = <Py_ssize_t*> PyMem_Malloc(max(n, 1) * sizeof(Py_ssize_t))
+        self._codes = <char*> PyMem_Malloc(max(n, 1) * sizeof(char))
+        if not (self._offsets and self._sizes and self._codes):
+            raise MemoryError()
+
+        cdef Py_ssize_t slot
+        cdef bint has_object = False
+        for slot in range(n):
+            field_dtype, offset = dtype.fields[self.schema[slot]][:2]
+            self._offsets[slot] = offset
+            self._sizes[slot] = field_dtype.itemsize
+            if field_dtype.shape != () or field_dtype.byteorder not in NATIVE_BYTEORDER:
+                self._codes[slot] = FIELD_OBJECT
+            elif field_dtype.kind == 'S':
+                self._codes[slot] = FIELD_BYTES
+            else:
+                self._codes[slot] = FIELD_CODES.get((field_dtype.kind, field_dtype.itemsize), FIELD_OBJECT)
+            has_object |= self._codes[slot] == FIELD_OBJECT
+
+        if has_object and not hasattr(data, 'dtype'):
+            raise TypeError(f'Fields of {self} without a native layout can only be read from a structured array, not from a raw buffer.')
+
+        self.c_seek(index)
+
+    def __dealloc__(self):
+        PyMem_Free(self._offsets)
+        PyMem_Free(self._sizes)
+        PyMem_Free(self._codes)
+
+    cdef void c_seek(self, Py_ssize_t index) except *:
+        if index < 0 or index >= self._n_records:
+            raise IndexError(f'Record {index} out of range for {self} of {self._n_records} records.')
+        self._index = index
+        self._base = index * self._itemsize
+
+    cdef Py_ssize_t c_slot_of(self, str key):
+        cdef object slot = self._slot_index.get(key)
+        if slot is None:
+            return -1
+        return slot
+
+    cdef object c_get_slot(self, Py_ssize_t slot):
+        cdef const unsigned char* ptr = &self._buffer[self._base + self._offsets[slot]]
+        cdef double f8
+        cdef float f4
+        cdef int64_t i8
+        cdef int32_t i4
+        cdef int16_t i2
+        cdef int8_t i1
+        cdef uint64_t u8
+        cdef uint32_t u4
+        cdef uint16_t u2
+        cdef uint8_t u1
+        cdef Py_ssize_t size
+        cdef char code = self._codes[slot]
+
+        if code == FIELD_F8:
+            memcpy(&f8, ptr, 8)
+            return f8
+        elif code == FIELD_F4:
+            memcpy(&f4, ptr, 4)
+            return f4
+        elif code == FIELD_I8:
+            memcpy(&i8, ptr, 8)
+            return i8
+        elif code == FIELD_I4:
+            memcpy(&i4, ptr, 4)
+            return i4
+        elif code == FIELD_I2:
+            memcpy(&i2, ptr, 2)
+            return i2
+        elif code == FIELD_I1:
+            memcpy(&i1, ptr, 1)
+            return i1
+        elif code == FIELD_U8:
+            memcpy(&u8, ptr, 8)
+            return u8
+        elif code == FIELD_U4:
+            memcpy(&u4, ptr, 4)
+            return u4
+        elif code == FIELD_U2:
+            memcpy(&u2, ptr, 2)
+            return u2
+        elif code == FIELD_U1:
+            memcpy(&u1, ptr, 1)
+            return u1
+        elif code == FIELD_B1:
+            return ptr[0] != 0
+        elif code == FIELD_BYTES:
+            # numpy strips the trailing null bytes of fixed-width strings
+            size = self._sizes[slot]
+            while size and ptr[size - 1] == 0:
+                size -= 1
+            return PyBytes_FromStringAndSize(<const char*> ptr, size)
+
+        if self._scalar:
+            return self.data[self.schema[slot]]
+        return self.data[self._index][self.schema[slot]]
+
+    cdef object c_get(self, str key):
+        cdef Py_ssize_t slot = self.c_slot_of(key)
+        if slot < 0:
+            raise KeyError(key)
+        return self.c_get_slot(slot)
+
+    # === Python interface conveniences ===
+
+    @property
+    def index(self):
+        return self._index
+
+    def seek(self, Py_ssize_t index):
+        self.c_seek(index)
+
+    def advance(self):
+        if self._index + 1 >= self._n_records:
+            return False
+        self.c_seek(self._index + 1)
+        return True
+
+    def __len__(self):
+        return self._n_records
+
+    def __getitem__(self, str key):
+        return AttrExpression(attr=key, logic_group=self)
+
+    def __getattr__(self, str key):
+        return AttrExpression(attr=key, logic_group=self)
+
+    def __contains__(self, str key):
+        return key in self._slot_index
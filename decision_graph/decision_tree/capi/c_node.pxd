@@ -10,6 +10,14 @@ cdef class NodeEvalPath(list):
 cdef class RootLogicNode(LogicNode):
     cdef readonly bint inherit_contexts
     cdef readonly list _eval_path
+    cdef set _dirty_keys
+    cdef list _eval_listeners
+
+    cdef void c_mark_dirty(self, object keys)
+
+    cdef void c_notify_listeners(self)
+
+    cdef object c_eval_layered(self, dict bindings, object default)
 
     cpdef BreakpointNode get_breakpoint(self)
 
@@ -20,16 +28,27 @@ cdef class ContextLogicExpression(LogicNode):
     @staticmethod
     cdef inline object c_safe_eval(object v)
 
+    @staticmethod
+    cdef inline void c_freeze_operand(object v)
+
+    @staticmethod
+    cdef inline void c_collect_operand(object v, list pending)
+
     @staticmethod
     cdef inline str c_safe_alias(object v)
 
+    @staticmethod
+    cdef frozenset c_operand_dependencies(object left, object right)
+
 
 cdef class AttrExpression(ContextLogicExpression):
     cdef readonly str attr
+    cdef Py_ssize_t _slot
 
 
 cdef class AttrNestedExpression(ContextLogicExpression):
     cdef readonly list attrs
+    cdef Py_ssize_t _slot
 
 
 cdef class GetterExpression(ContextLogicExpression):
@@ -1,5 +1,5 @@
 import enum
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any, final, Generic, TypeVar
 
 from .c_abc import LogicNode, LogicGroup, NodeEdgeCondition, BreakpointNode
@@ -82,6 +82,95 @@ class RootLogicNode(LogicNode):
             The RootLogicNode instance.
         """
 
+    def eval_incremental(self, changed_keys: Iterable[str] = None, default: Any = None) -> Any:
+        """Re-evaluate the decision tree after only some of the input keys changed.
+
+        The path recorded by the previous evaluation is walked from the root, and evaluation
+        restarts at the first node whose ``dependencies`` intersect ``changed_keys`` (or cannot
+        be determined). Decisions taken above that node are reused without evaluating their
+        expressions again. The terminal action node is always re-evaluated, so its action is
+        still triggered.
+
+        The caller is responsible for reporting every changed key, and for calling the root
+        normally after the tree or the bound data objects are replaced. Keys are matched by
+        name, i.e. by the top-level key of ``LogicMapping.data`` or the logic group contexts.
+
+        Keys marked dirty by ``mark_dirty`` (e.g. by an observed ``LogicMapping``) are merged
+        into ``changed_keys`` and consumed.
+
+        Args:
+            changed_keys (Iterable[str] | None): The input keys modified since the last evaluation.
+            default (Any): The default value or action if no branch matches.
+
+        Returns:
+            Any: The same value or action a full ``root()`` evaluation would return.
+        """
+
+    async def aeval(self, default: Any = None, context: dict | None = None) -> Any:
+        """Evaluate the decision tree like ``__call__``, awaiting the expressions doing I/O.
+
+        See ``LogicNode.aeval``. The evaluation path is collected apart and stored in ``eval_path``
+        once the evaluation completes, so that concurrent evaluations of the same root do not
+        interleave their paths; listeners are notified afterwards, as in ``__call__``.
+        """
+
+    def stream(self, source: Iterable[dict | None], batch: int = 64, default: Any = None) -> Iterator[tuple[int, Any]]:
+        """Evaluate the decision tree once per context of a stream.
+
+        Each context of ``source`` is bound for its own evaluation, as in ``__call__(context=...)``;
+        a ``None`` context evaluates against the current data of the groups, e.g. after the source
+        moved a ``LogicRecord`` cursor. The source is pulled ``batch`` contexts at a time, and the
+        bindings of a whole batch are layered over the outer ones in one pass, which is what makes
+        this faster than calling the root in a loop. The evaluation stays lazy: every item the
+        consumer asks for evaluates exactly one context, so the side effects of action nodes happen
+        in step with the consumer and ``eval_path`` reflects the last yielded action. As the source
+        is read up to one batch ahead, a source moving a cursor for ``None`` contexts needs ``batch=1``.
+
+        Closing the returned generator, explicitly or by releasing it, stops the evaluation
+        and closes the source if it has a ``close`` method (a generator or a ``LogicGenerator``).
+
+        Args:
+            source: An iterable of contexts, each a dict mapping logic groups or their names to
+                the data to bind, or None.
+            batch: The number of contexts pulled from the source at a time, must be positive.
+            default: The default action, as in ``__call__``.
+
+        Returns:
+            A generator of ``(index, action)`` pairs, the index counting the contexts of the source.
+
+        Raises:
+            ValueError: If ``batch`` is not positive.
+            TypeError: On iteration, if a context is neither a dict nor None.
+        """
+
+    def add_listener(self, listener: Callable[[RootLogicNode], Any]) -> None:
+        """Register a callable invoked with this root after every evaluation.
+
+        Listeners are called synchronously after ``__call__``, ``eval_recursively`` and
+        ``eval_incremental`` finished, once ``eval_path`` is up to date. They should return fast,
+        e.g. by handing the path over to another thread. Registering the same listener twice is a no-op.
+
+        Args:
+            listener (Callable[[RootLogicNode], Any]): The callable to notify.
+        """
+
+    def remove_listener(self, listener: Callable[[RootLogicNode], Any]) -> None:
+        """Unregister a listener added by ``add_listener``, no-op if not registered."""
+
+    def mark_dirty(self, keys: Iterable[str]) -> None:
+        """Record input keys changed since the last evaluation.
+
+        The pending keys are consumed by the next ``eval_incremental`` call, and discarded by a
+        full evaluation.
+
+        Args:
+            keys (Iterable[str]): The changed input keys.
+        """
+
+    @property
+    def dirty_keys(self) -> frozenset[str]:
+        """The input keys marked dirty and not yet re-evaluated."""
+
     def dry_run(self) -> None:
         """Perform a dry run evaluation of the decision tree without executing actions.
 
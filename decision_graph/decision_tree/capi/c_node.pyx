@@ -1,12 +1,14 @@
 import json
 import operator
-import traceback
+from itertools import islice
 
 from cpython.mem cimport PyMem_Free
+from cpython.object cimport PyObject
+from libc.stdint cimport uintptr_t
 
 from .c_abc cimport LogicNodeFrame, LogicGroupStack, PlaceholderNode, ActionNode, LGM, NO_CONDITION, AUTO_CONDITION, NodeEdgeCondition
-from .c_collection cimport LogicMapping, LogicSequence
-from ..exc import NO_DEFAULT, TooManyChildren, TooFewChildren, EdgeValueError, ContextsNotFound, ExpressEvaluationError
+from .c_collection cimport LogicMapping, LogicSequence, LogicRecord
+from ..exc import NO_DEFAULT, NodeFrozenError, TooManyChildren, TooFewChildren, EdgeValueError, ContextsNotFound, ExpressEvaluationError
 
 
 cdef class NodeEvalPath(list):
@@ -28,6 +30,8 @@ cdef class RootLogicNode(LogicNode):
         self.repr = name if repr is None else repr
         self.inherit_contexts = inherit_contexts
         self._eval_path = []
+        self._dirty_keys = set()
+        self._eval_listeners = []
 
     cdef bint c_entry_check(self):
         return True
@@ -66,6 +70,9 @@ cdef class RootLogicNode(LogicNode):
         LGM.c_ln_exit(self)
 
     cdef void c_append(self, LogicNode child, NodeEdgeCondition condition):
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
+
         if self.subordinates.size:
             raise TooManyChildren()
 
@@ -74,13 +81,29 @@ cdef class RootLogicNode(LogicNode):
 
         LogicNode.c_append(self, child, NO_CONDITION)
 
-    def __call__(self, object default=None):
+    cdef void c_mark_dirty(self, object keys):
+        self._dirty_keys.update(keys)
+
+    cdef void c_notify_listeners(self):
+        cdef object listener
+        for listener in self._eval_listeners.copy():
+            listener(self)
+
+    def __call__(self, object default=None, dict context=None):
+        if context is not None:
+            with self.bind(context):
+                return self(default)
+
         self._eval_path.clear()
+        self._dirty_keys.clear()
         cdef object value = self.c_eval_recursively(self._eval_path, default)[0]
+        if self._eval_listeners:
+            self.c_notify_listeners()
         return value
 
     def eval_recursively(self, list path=None, object default=NO_DEFAULT):
         self._eval_path.clear()
+        self._dirty_keys.clear()
 
         cdef object v
         cdef list p
@@ -89,8 +112,123 @@ cdef class RootLogicNode(LogicNode):
         else:
             v, p = self.c_eval_recursively(path, default)
             self._eval_path.extend(p)
+        if self._eval_listeners:
+            self.c_notify_listeners()
         return v, p
 
+    def eval_incremental(self, object changed_keys=None, object default=None):
+        cdef list path = self._eval_path
+        cdef Py_ssize_t n = len(path)
+        if not n:
+            return self(default)
+
+        cdef set changed = self._dirty_keys
+        self._dirty_keys = set()
+        if changed_keys is not None:
+            changed.update(changed_keys)
+        cdef Py_ssize_t i
+        cdef LogicNode node
+        cdef frozenset dependencies
+
+        # Step 1: Locate the highest node on the last eval path whose inputs changed, or the terminal node
+        for i in range(n):
+            node = <LogicNode> path[i]
+            if i == n - 1 or isinstance(node, ActionNode):
+                break
+            dependencies = node.c_dependencies()
+            if dependencies is None or not dependencies.isdisjoint(changed):
+                break
+
+        # Step 2: The decisions made above it are unaffected, so restart the evaluation from there
+        del path[i:]
+        cdef object value = node.c_eval_recursively(path, default)[0]
+        if self._eval_listeners:
+            self.c_notify_listeners()
+        return value
+
+    async def aeval(self, object default=None, dict context=None):
+        if context is not None:
+            with self.bind(context):
+                return await self.aeval(default)
+
+        # evaluated into a path of its own, concurrent evaluations of this root do not interleave
+        cdef list path = []
+        self._dirty_keys.clear()
+        cdef object value = (await self._aeval_recursively(path, default))[0]
+        self._eval_path.clear()
+        self._eval_path.extend(path)
+        if self._eval_listeners:
+            self.c_notify_listeners()
+        return value
+
+    cdef object c_eval_layered(self, dict bindings, object default):
+        # one full evaluation, as __call__ does, with the bindings prepared by LGM.c_layer, if any
+        cdef object token = None
+        if bindings is not None:
+            token = LGM.c_bind_layered(bindings)
+        try:
+            self._eval_path.clear()
+            self._dirty_keys.clear()
+            value = self.c_eval_recursively(self._eval_path, default)[0]
+            if self._eval_listeners:
+                self.c_notify_listeners()
+            return value
+        finally:
+            if token is not None:
+                LGM.c_unbind(token)
+
+    def stream(self, object source, Py_ssize_t batch=64, object default=None):
+        if batch < 1:
+            raise ValueError(f'The batch size must be positive, got {batch}.')
+        return self._stream(iter(source), batch, default)
+
+    def _stream(self, object iterator, Py_ssize_t batch, object default):
+        cdef Py_ssize_t index = 0
+        cdef list contexts, layered
+        cdef dict base, bindings
+        cdef object context
+        cdef object error
+        try:
+            while True:
+                # the source is pulled once per batch
+                contexts = list(islice(iterator, batch))
+                if not contexts:
+                    return
+
+                # the bindings of the batch are layered in one pass, over the outer bindings looked up once
+                base = LGM._bindings.get()
+                layered = []
+                error = None
+                try:
+                    for context in contexts:
+                        if context is not None and not isinstance(context, dict):
+                            raise TypeError(f'Stream contexts must be dicts or None, got {type(context).__name__}.')
+                        layered.append(None if context is None else LGM.c_layer(base, <dict> context))
+                except Exception as e:
+                    error = e
+
+                # while the evaluation stays lazy, one per item the consumer asks for
+                for bindings in layered:
+                    yield index, self.c_eval_layered(bindings, default)
+                    index += 1
+                if error is not None:
+                    raise error
+        finally:
+            # stopping the consumer stops the source too
+            if hasattr(iterator, 'close'):
+                iterator.close()
+
+    def add_listener(self, object listener):
+        if listener not in self._eval_listeners:
+            self._eval_listeners.append(listener)
+
+    def remove_listener(self, object listener):
+        if listener in self._eval_listeners:
+            self._eval_listeners.remove(listener)
+
+    def mark_dirty(self, object keys):
+        self.c_mark_dirty(keys)
+
     def dry_run(self, bint enforce_dtype=False):
         cdef LogicNode child
         for child in self.descendants:
@@ -99,7 +237,7 @@ cdef class RootLogicNode(LogicNode):
             try:
                 child.c_eval(enforce_dtype)
             except Exception as e:
-                raise ExpressEvaluationError(f"Failed to evaluate {self}, {traceback.format_exc()}") from e
+                raise ExpressEvaluationError(node=child, exception=e) from e
 
     cpdef BreakpointNode get_breakpoint(self):
         for leaf in self.leaves:
@@ -130,6 +268,10 @@ cdef class RootLogicNode(LogicNode):
         def __get__(self) -> NodeEvalPath:
             return NodeEvalPath(self._eval_path)
 
+    property dirty_keys:
+        def __get__(self) -> frozenset:
+            return frozenset(self._dirty_keys)
+
 
 cdef class ContextLogicExpression(LogicNode):
     def __cinit__(self, *, LogicGroup logic_group=None, **kwargs):
@@ -146,12 +288,31 @@ cdef class ContextLogicExpression(LogicNode):
             return (<LogicNode> v).c_eval(False)
         return v
 
+    @staticmethod
+    cdef inline void c_freeze_operand(object v):
+        # operands are not children, they are frozen along with the expression reading them
+        if isinstance(v, LogicNode) and not (<LogicNode> v).frozen:
+            (<LogicNode> v).c_freeze()
+
+    @staticmethod
+    cdef inline void c_collect_operand(object v, list pending):
+        if isinstance(v, LogicNode):
+            (<LogicNode> v).c_collect_pending(pending)
+
     @staticmethod
     cdef inline str c_safe_alias(object v):
         if isinstance(v, LogicNode):
             return v.repr
         return str(v)
 
+    @staticmethod
+    cdef frozenset c_operand_dependencies(object left, object right):
+        cdef frozenset left_dependencies = LogicNode.c_value_dependencies(left)
+        cdef frozenset right_dependencies = LogicNode.c_value_dependencies(right)
+        if left_dependencies is None or right_dependencies is None:
+            return None
+        return left_dependencies | right_dependencies
+
     # === Python Interfaces ===
 
     def __getitem__(self, str key):
@@ -219,15 +380,38 @@ cdef class AttrExpression(ContextLogicExpression):
     def __cinit__(self, *, str attr, **kwargs):
         self.attr = attr
         self.repr = kwargs['repr'] if 'repr' in kwargs else f'{self.logic_group.name}.{attr}'
+        self._slot = -1
 
-    cdef object c_eval(self, bint enforce_dtype):
+    cdef void c_freeze(self):
+        LogicNode.c_freeze(self)
         if isinstance(self.logic_group, LogicMapping):
+            self._slot = (<LogicMapping> self.logic_group).c_slot_of(self.attr)
+        elif isinstance(self.logic_group, LogicRecord):
+            self._slot = (<LogicRecord> self.logic_group).c_slot_of(self.attr)
+
+    cdef object c_eval(self, bint enforce_dtype):
+        cdef object bound = LGM.c_bound(self.logic_group)
+        if bound is not None:
+            return bound[self.attr]
+        elif self._slot >= 0:
+            if isinstance(self.logic_group, LogicRecord):
+                return (<LogicRecord> self.logic_group).c_get_slot(self._slot)
+            return (<LogicMapping> self.logic_group).c_get_slot(self._slot)
+        elif isinstance(self.logic_group, LogicMapping):
             return (<LogicMapping> self.logic_group).c_get(self.attr)
+        elif isinstance(self.logic_group, LogicRecord):
+            return (<LogicRecord> self.logic_group).c_get(self.attr)
         else:
             if self.attr in self.logic_group.contexts:
                 return self.logic_group.contexts[self.attr]
             raise AttributeError(f'Attribute {self.attr} does not exist in {self.logic_group}')
 
+    cdef object c_signature(self):
+        return (self.__class__, self.repr, self.dtype, <uintptr_t> <PyObject*> self.logic_group, self.attr)
+
+    cdef frozenset c_resolve_dependencies(self):
+        return frozenset((self.attr,))
+
     def __getitem__(self, str key):
         return AttrNestedExpression(attrs=[self.attr, key], logic_group=self.logic_group)
 
@@ -239,19 +423,39 @@ cdef class AttrNestedExpression(ContextLogicExpression):
     def __cinit__(self, *, list attrs, **kwargs):
         self.attrs = attrs
         self.repr = kwargs['repr'] if 'repr' in kwargs else f'{self.logic_group.name}.{".".join(attrs)}'
+        self._slot = -1
 
-    cdef object c_eval(self, bint enforce_dtype):
-        cdef object mapping
+    cdef void c_freeze(self):
+        LogicNode.c_freeze(self)
         if isinstance(self.logic_group, LogicMapping):
-            mapping = (<LogicMapping> self.logic_group).data
-        else:
-            mapping = self.logic_group.contexts
+            self._slot = (<LogicMapping> self.logic_group).c_slot_of(self.attrs[0])
+
+    cdef object c_eval(self, bint enforce_dtype):
+        cdef object mapping = LGM.c_bound(self.logic_group)
+        cdef Py_ssize_t i
+        if mapping is None and self._slot >= 0:
+            # the top-level key is resolved to its slot, only the nested keys are looked up
+            mapping = (<LogicMapping> self.logic_group).c_get_slot(self._slot)
+            for i in range(1, len(self.attrs)):
+                mapping = mapping[self.attrs[i]]
+            return mapping
+        elif mapping is None:
+            if isinstance(self.logic_group, LogicMapping):
+                mapping = (<LogicMapping> self.logic_group).data
+            else:
+                mapping = self.logic_group.contexts
 
         cdef str attr
         for attr in self.attrs:
             mapping = mapping[attr]
         return mapping
 
+    cdef object c_signature(self):
+        return (self.__class__, self.repr, self.dtype, <uintptr_t> <PyObject*> self.logic_group, tuple(self.attrs))
+
+    cdef frozenset c_resolve_dependencies(self):
+        return frozenset((self.attrs[0],))
+
     def __getitem__(self, str key):
         return AttrNestedExpression(attrs=self.attrs + [key], logic_group=self.logic_group)
 
@@ -265,7 +469,10 @@ cdef class GetterExpression(ContextLogicExpression):
         self.repr = kwargs['repr'] if 'repr' in kwargs else f'{self.logic_group.name}.{key}'
 
     cdef object c_eval(self, bint enforce_dtype):
-        if isinstance(self.logic_group, LogicMapping):
+        cdef object bound = LGM.c_bound(self.logic_group)
+        if bound is not None:
+            return bound[self.key]
+        elif isinstance(self.logic_group, LogicMapping):
             return (<LogicMapping> self.logic_group).c_get(self.key)
         elif isinstance(self.logic_group, LogicSequence):
             return (<LogicSequence> self.logic_group).c_get(self.key)
@@ -274,6 +481,12 @@ cdef class GetterExpression(ContextLogicExpression):
                 return self.logic_group.contexts[self.key]
             raise AttributeError(f'Attribute {self.key} does not exist in {self.logic_group}')
 
+    cdef object c_signature(self):
+        return (self.__class__, self.repr, self.dtype, <uintptr_t> <PyObject*> self.logic_group, LogicNode.c_value_signature(self.key))
+
+    cdef frozenset c_resolve_dependencies(self):
+        return frozenset((self.key,))
+
     def __getitem__(self, str key):
         return GetterNestedExpression(keys=[self.key, key], logic_group=self.logic_group)
 
@@ -284,19 +497,26 @@ cdef class GetterNestedExpression(ContextLogicExpression):
         self.repr = kwargs['repr'] if 'repr' in kwargs else f'{self.logic_group.name}.{".".join(keys)}'
 
     cdef object c_eval(self, bint enforce_dtype):
-        cdef object nested
-        if isinstance(self.logic_group, LogicMapping):
-            nested = (<LogicMapping> self.logic_group).data
-        elif isinstance(self.logic_group, LogicSequence):
-            return (<LogicSequence> self.logic_group).c_get(self.key)
-        else:
-            nested = self.logic_group.contexts
+        cdef object nested = LGM.c_bound(self.logic_group)
+        if nested is None:
+            if isinstance(self.logic_group, LogicMapping):
+                nested = (<LogicMapping> self.logic_group).data
+            elif isinstance(self.logic_group, LogicSequence):
+                return (<LogicSequence> self.logic_group).c_get(self.key)
+            else:
+                nested = self.logic_group.contexts
 
         cdef object key
         for key in self.keys:
             nested = nested[key]
         return nested
 
+    cdef object c_signature(self):
+        return (self.__class__, self.repr, self.dtype, <uintptr_t> <PyObject*> self.logic_group, tuple([LogicNode.c_value_signature(key) for key in self.keys]))
+
+    cdef frozenset c_resolve_dependencies(self):
+        return frozenset((self.keys[0],))
+
     def __getitem__(self, str key):
         return GetterNestedExpression(keys=self.keys + [key], logic_group=self.logic_group)
 
@@ -365,6 +585,25 @@ cdef class MathExpression(ContextLogicExpression):
             return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)})'
         return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)}, {ContextLogicExpression.c_safe_alias(self.right)})'
 
+    cdef object c_signature(self):
+        return (
+            self.__class__, self.repr, self.dtype, <uintptr_t> <PyObject*> self.logic_group,
+            self.op_name, LogicNode.c_value_signature(self.op_func),
+            LogicNode.c_value_signature(self.left), LogicNode.c_value_signature(self.right)
+        )
+
+    cdef frozenset c_resolve_dependencies(self):
+        return ContextLogicExpression.c_operand_dependencies(self.left, self.right)
+
+    cdef void c_freeze(self):
+        LogicNode.c_freeze(self)
+        ContextLogicExpression.c_freeze_operand(self.left)
+        ContextLogicExpression.c_freeze_operand(self.right)
+
+    cdef void c_collect_pending(self, list pending):
+        ContextLogicExpression.c_collect_operand(self.left, pending)
+        ContextLogicExpression.c_collect_operand(self.right, pending)
+
     cdef object c_eval(self, bint enforce_dtype):
         if self.right is NO_DEFAULT:
             return self.op_func(ContextLogicExpression.c_safe_eval(self.left))
@@ -442,6 +681,25 @@ cdef class ComparisonExpression(ContextLogicExpression):
             return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)})'
         return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)}, {ContextLogicExpression.c_safe_alias(self.right)})'
 
+    cdef object c_signature(self):
+        return (
+            self.__class__, self.repr, self.dtype, <uintptr_t> <PyObject*> self.logic_group,
+            self.op_name, LogicNode.c_value_signature(self.op_func),
+            LogicNode.c_value_signature(self.left), LogicNode.c_value_signature(self.right)
+        )
+
+    cdef frozenset c_resolve_dependencies(self):
+        return ContextLogicExpression.c_operand_dependencies(self.left, self.right)
+
+    cdef void c_freeze(self):
+        LogicNode.c_freeze(self)
+        ContextLogicExpression.c_freeze_operand(self.left)
+        ContextLogicExpression.c_freeze_operand(self.right)
+
+    cdef void c_collect_pending(self, list pending):
+        ContextLogicExpression.c_collect_operand(self.left, pending)
+        ContextLogicExpression.c_collect_operand(self.right, pending)
+
     cdef object c_eval(self, bint enforce_dtype):
         cdef object left = ContextLogicExpression.c_safe_eval(self.left)
         cdef object right = ContextLogicExpression.c_safe_eval(self.right)
@@ -530,6 +788,25 @@ cdef class LogicalExpression(ContextLogicExpression):
             return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)})'
         return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)}, {ContextLogicExpression.c_safe_alias(self.right)})'
 
+    cdef object c_signature(self):
+        return (
+            self.__class__, self.repr, self.dtype, <uintptr_t> <PyObject*> self.logic_group,
+            self.op_name, LogicNode.c_value_signature(self.op_func),
+            LogicNode.c_value_signature(self.left), LogicNode.c_value_signature(self.right)
+        )
+
+    cdef frozenset c_resolve_dependencies(self):
+        return ContextLogicExpression.c_operand_dependencies(self.left, self.right)
+
+    cdef void c_freeze(self):
+        LogicNode.c_freeze(self)
+        ContextLogicExpression.c_freeze_operand(self.left)
+        ContextLogicExpression.c_freeze_operand(self.right)
+
+    cdef void c_collect_pending(self, list pending):
+        ContextLogicExpression.c_collect_operand(self.left, pending)
+        ContextLogicExpression.c_collect_operand(self.right, pending)
+
     cdef object c_eval(self, bint enforce_dtype):
         cdef uint8_t op_enum = self.op_enum
 
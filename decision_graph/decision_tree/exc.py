@@ -1,7 +1,7 @@
 __all__ = [
     'NO_DEFAULT',
     'EmptyBlock', 'BreakBlock',
-    'NodeError', 'TooManyChildren', 'TooFewChildren', 'NodeNotFountError', 'NodeValueError', 'NodeTypeError', 'NodeContextError',
+    'NodeError', 'TooManyChildren', 'TooFewChildren', 'NodeNotFountError', 'NodeValueError', 'NodeTypeError', 'NodeContextError', 'NodeFrozenError',
     'EdgeValueError',
     'ResolutionError', 'ExpressFalse', 'ExpressEvaluationError', 'ContextsNotFound'
 ]
@@ -54,6 +54,11 @@ class NodeContextError(NodeError):
     pass
 
 
+class NodeFrozenError(NodeError):
+    """Raised when trying to modify a frozen LogicNode."""
+    pass
+
+
 class EdgeValueError(NodeError):
     """Raised when a NodeEdgeCondition has an invalid value."""
     pass
@@ -70,8 +75,28 @@ class ExpressFalse(Exception):
 
 
 class ExpressEvaluationError(Exception):
-    """Raised when an error occurs during the evaluation of a LogicExpression."""
-    pass
+    """Raised when an error occurs during the evaluation of a LogicExpression.
+
+    The failing ``node``, the evaluation ``path`` leading to it and the original ``exception`` are attached as attributes.
+    The message is only formatted when the error is rendered, so raising it stays cheap.
+    """
+
+    def __init__(self, *args, node=None, path=None, exception=None):
+        super().__init__(*args)
+        self.node = node
+        self.path = path
+        self.exception = exception
+
+    def __str__(self):
+        if self.node is None:
+            return super().__str__()
+
+        msg = f'Failed to evaluate {self.node!r}'
+        if self.path:
+            msg += f' at {" -> ".join([node.repr for node in self.path])}'
+        if self.exception is not None:
+            msg += f', {self.exception.__class__.__name__}: {self.exception}'
+        return msg
 
 
 class ContextsNotFound(Exception):
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import functools
+import inspect
 import linecache
+import logging
 import operator
 import sys
+import time
 import uuid
+import weakref
 from collections.abc import Callable
 from typing import Any, Self, final
 
@@ -16,9 +23,9 @@ __all__ = ['Singleton',
            'NodeEdgeCondition', 'ConditionElse', 'ConditionAny', 'ConditionAuto', 'BinaryCondition', 'ConditionTrue', 'ConditionFalse',
            'NO_CONDITION', 'ELSE_CONDITION', 'AUTO_CONDITION', 'TRUE_CONDITION', 'FALSE_CONDITION',
            'SkipContextsBlock', 'LogicExpression', 'LogicNode',
-           'LogicGroupManager', 'LGM', 'LogicGroup',
+           'LogicGroupManager', 'LGM', 'LogicGroup', 'EvalContext',
            'ActionNode', 'BreakpointNode', 'PlaceholderNode',
-           'NoAction', 'LongAction', 'ShortAction', 'CancelAction']
+           'NoAction', 'DEFAULT_ACTION', 'LongAction', 'ShortAction', 'CancelAction']
 
 
 class Singleton(type):
@@ -256,6 +263,31 @@ class SkipContextsBlock(object):
             raise self.skip_exception("Expression evaluated to be False, cannot enter the block.")
 
 
+async def _await_pending(pending: list[LogicExpression]) -> dict[int, Any]:
+    # calls each expression once, and awaits the awaitable results concurrently
+    results = {}
+    keys = []
+    try:
+        for expression in pending:
+            key = id(expression)
+            if key in results:
+                continue
+            results[key] = expression.expression()
+            if inspect.isawaitable(results[key]):
+                keys.append(key)
+    except BaseException:
+        # do not leave the coroutines already created un-awaited
+        for key in keys:
+            if inspect.iscoroutine(results[key]):
+                results[key].close()
+        raise
+
+    if keys:
+        for key, value in zip(keys, await asyncio.gather(*[results[key] for key in keys])):
+            results[key] = value
+    return results
+
+
 class LogicExpression(SkipContextsBlock):
     def __init__(self, *, expression: float | int | bool | Exception | Callable[[], Any], dtype: type = None, repr: str = None, uid: uuid.UUID = None):
         super().__init__()
@@ -263,6 +295,7 @@ class LogicExpression(SkipContextsBlock):
         self.dtype = dtype
         self.repr = repr if repr is not None else str(expression)
         self.uid = uuid.uuid4() if uid is None else uid
+        self._log_records: dict[str, list] | None = None
 
     def _entry_check(self) -> Any:
         return bool(self._eval(False))
@@ -274,7 +307,9 @@ class LogicExpression(SkipContextsBlock):
         if isinstance(self.expression, (float, int, bool, str)):
             value = self.expression
         elif callable(self.expression):
-            value = self.expression()
+            value = LGM._awaited_value(self) if LGM._n_awaiting else NO_DEFAULT
+            if value is NO_DEFAULT:
+                value = self.expression()
         elif isinstance(self.expression, Exception):
             raise self.expression
         else:
@@ -285,7 +320,14 @@ class LogicExpression(SkipContextsBlock):
         elif enforce_dtype:
             value = self.dtype(value)
         elif not isinstance(value, self.dtype):
-            LOGGER.warning(f"Evaluated value {value} does not match dtype {self.dtype.__name__}.")
+            LGM.n_dtype_mismatch += 1
+            if LOGGER.isEnabledFor(logging.WARNING):
+                suppressed = LGM._log_permit(self, 'dtype_mismatch')
+                if suppressed >= 0:
+                    LOGGER.warning(
+                        'Evaluated value %s does not match dtype %s.%s',
+                        value, self.dtype.__name__, f' ({suppressed} similar messages suppressed)' if suppressed else ''
+                    )
 
         return value
 
@@ -398,26 +440,54 @@ class LogicGroupManager(metaclass=Singleton):
         # Dictionary to store cached LogicGroup instances
         self._cache = {}
 
-        # Stack cursors: top of stack is at index 0
+        # Stacks: top of stack is the last element, so that push and pop are O(1)
         self._active_groups: list[LogicGroup] = []
         self._active_nodes: list[LogicNode] = []
-        self._breakpoint_nodes: list[BreakpointNode] = []
+        self._active_node_ids: set[int] = set()  # membership of _active_nodes, the LogicExpression overloads __eq__
         self._shelved_state: list[dict] = []
 
+        # Pending breakpoints indexed by the id of their break scope, and the ones awaiting the next entered node.
+        # Both map id(breakpoint) -> breakpoint, in push order.
+        self._breakpoint_nodes: dict[int, dict[int, BreakpointNode]] = {}
+        self._awaiting_breakpoints: dict[int, BreakpointNode] = {}
+
         self.inspection_mode = False
         self.vigilant_mode = False
 
+        self.log_interval = 1.  # minimal seconds between two identical hot-path log messages of the same node
+        self._log_epoch = 0  # the throttle records of the nodes are stale once it moved on
+        self.n_default_fallback = 0
+        self.n_dtype_mismatch = 0
+        self.n_suppressed_logs = 0
+        self.structure_version = 0  # bumped on every edge mutation, used to invalidate cached views of the trees
+
+        # registry of the cached LogicGroups, strong and unbounded by default, see configure_registry
+        self.registry_weak = False
+        self.registry_capacity = 0
+        self.registry_ttl = float('inf')
+        self._registry_clock: dict[tuple, float] | None = None  # (reg_key, name) -> last access, least recent first
+        self.n_registry_evicted = 0
+
+        # data bound to the LogicGroups for the current evaluation, per thread and per asyncio task
+        self._bindings: contextvars.ContextVar[dict | None] = contextvars.ContextVar('bindings', default=None)  # group name -> data
+        self._n_bindings = 0  # bindings entered in any thread, the unbound evaluation skips the lookup when zero
+
+        # values of the callables already awaited by an async evaluation, see LogicNode.aeval
+        self._awaited: contextvars.ContextVar[dict | None] = contextvars.ContextVar('awaited', default=None)  # id of the expression -> value
+        self._n_awaiting = 0  # staged in any thread, the sync evaluation skips the lookup when zero
+
     def __call__(self, name: str, cls: type[LogicGroup], **kwargs) -> LogicGroup:
         reg_key = (cls.__module__, cls.__qualname__)
         registry = self._cache.get(reg_key)
         if registry is None:
             registry = self._cache[reg_key] = {}
 
-        if name in registry:
-            return registry[name]
+        logic_group = self._registry_lookup(reg_key, registry, name)
+        if logic_group is not None:
+            return logic_group
 
         logic_group = cls(name=name, **kwargs)
-        registry[name] = logic_group
+        self._registry_store(reg_key, registry, name, logic_group)
         return logic_group
 
     def __contains__(self, instance: LogicGroup) -> bool:
@@ -427,71 +497,189 @@ class LogicGroupManager(metaclass=Singleton):
         registry = self._cache.get(reg_key)
         if registry is None:
             return False
-        return name in registry
+        entry = registry.get(name)
+        if type(entry) is weakref.ref:
+            return entry() is not None
+        return entry is not None
+
+    def _registry_lookup(self, reg_key: tuple, registry: dict, name: str) -> LogicGroup | None:
+        # returns None if the name is not registered, or its entry has expired (dropped here)
+        entry = registry.get(name)
+        if entry is None:
+            return None
+
+        logic_group = entry() if type(entry) is weakref.ref else entry
+        if logic_group is None:
+            self._registry_drop(reg_key, name)
+            return None
+
+        if self._registry_clock is not None:
+            key = (reg_key, name)
+            now = time.monotonic()
+            if now - self._registry_clock[key] > self.registry_ttl:
+                self._registry_drop(reg_key, name)
+                self.n_registry_evicted += 1
+                return None
+            # move to the most recent end
+            del self._registry_clock[key]
+            self._registry_clock[key] = now
+        return logic_group
+
+    def _registry_store(self, reg_key: tuple, registry: dict, name: str, logic_group: LogicGroup) -> None:
+        if self.registry_weak:
+            registry[name] = weakref.ref(logic_group, functools.partial(self._registry_reap, reg_key, name))
+        else:
+            registry[name] = logic_group
+
+        if self._registry_clock is not None:
+            now = time.monotonic()
+            self._registry_clock[(reg_key, name)] = now
+            self._registry_evict(now)
+
+    def _registry_drop(self, reg_key: tuple, name: str) -> None:
+        registry = self._cache.get(reg_key)
+        if registry is not None:
+            registry.pop(name, None)
+            if not registry:
+                del self._cache[reg_key]
+        if self._registry_clock is not None:
+            self._registry_clock.pop((reg_key, name), None)
+
+    def _registry_evict(self, now: float) -> None:
+        # the least recently used entries are first, evict them while over capacity or idle for too long
+        clock = self._registry_clock
+        while clock:
+            key = next(iter(clock))
+            if not ((self.registry_capacity and len(clock) > self.registry_capacity) or now - clock[key] > self.registry_ttl):
+                break
+            self._registry_drop(*key)
+            self.n_registry_evicted += 1
+
+    def _registry_reap(self, reg_key: tuple, name: str, ref: weakref.ref) -> None:
+        # weakref callback, only drop the entry if it is still the collected reference
+        registry = self._cache.get(reg_key)
+        if registry is not None and registry.get(name) is ref:
+            self._registry_drop(reg_key, name)
+
+    def configure_registry(self, weak: bool = False, capacity: int = 0, ttl: float = float('inf')) -> None:
+        entries = []
+        for reg_key, registry in self._cache.items():
+            for name, entry in registry.items():
+                logic_group = entry() if type(entry) is weakref.ref else entry
+                if logic_group is not None:
+                    entries.append((reg_key, name, logic_group))
+
+        self.registry_weak = weak
+        self.registry_capacity = capacity
+        self.registry_ttl = ttl
+        self._registry_clock = {} if capacity or ttl != float('inf') else None
+
+        # re-register the live entries under the new mode, existing entries count as just accessed
+        self._cache.clear()
+        for reg_key, name, logic_group in entries:
+            registry = self._cache.get(reg_key)
+            if registry is None:
+                registry = self._cache[reg_key] = {}
+            self._registry_store(reg_key, registry, name, logic_group)
+
+    def registry_stats(self) -> dict[str, object]:
+        size = sum(
+            1
+            for registry in self._cache.values()
+            for entry in registry.values()
+            if type(entry) is not weakref.ref or entry() is not None
+        )
+        return {
+            'size': size,
+            'evicted': self.n_registry_evicted,
+            'weak': self.registry_weak,
+            'capacity': self.registry_capacity,
+            'ttl': self.registry_ttl,
+        }
 
     def _lg_enter(self, logic_group: LogicGroup):
         # Set parent if there's an active group
         if self._active_groups:
-            logic_group.parent = self._active_groups[0]
-        self._active_groups.insert(0, logic_group)
+            logic_group.parent = self._active_groups[-1]
+        self._active_groups.append(logic_group)
 
     def _lg_exit(self, logic_group: LogicGroup = None):
         if not self._active_groups:
             raise RuntimeError("No active LogicGroup to exit.")
 
-        current = self._active_groups[0]
+        current = self._active_groups[-1]
         if logic_group is not None and current is not logic_group:
             raise AssertionError("The LogicGroup is not currently active.")
         # If logic_group is None, we exit the top one (current)
 
         # Activate pending breakpoints tied to this group
-        for node in self._breakpoint_nodes:
-            if node.break_from is current:
-                node.await_connection = True
+        breakpoint_nodes = self._breakpoint_nodes.pop(id(current), None)
+        if breakpoint_nodes:
+            for breakpoint_node in breakpoint_nodes.values():
+                breakpoint_node.await_connection = True
+            self._awaiting_breakpoints.update(breakpoint_nodes)
 
-        self._active_groups.pop(0)
+        self._active_groups.pop()
 
     def _ln_enter(self, logic_node: LogicNode):
         if isinstance(logic_node, ActionNode):
             LOGGER.error('Enter the with code block of an ActionNode rejected. Check if this is intentional?')
             return
 
-        # Connect and remove all awaiting breakpoint nodes
-        for breakpoint_node in self._breakpoint_nodes[:]:
-            if breakpoint_node.await_connection:
+        # Connect and remove all awaiting breakpoint nodes, the most recent first
+        if self._awaiting_breakpoints:
+            for breakpoint_node in reversed(self._awaiting_breakpoints.values()):
                 breakpoint_node._connect(logic_node)
-                self._breakpoint_nodes.remove(breakpoint_node)
-
-        # If no active node, push directly
-        if not self._active_nodes:
-            self._active_nodes.insert(0, logic_node)
-            return
+            self._awaiting_breakpoints.clear()
 
-        # Otherwise, get current active node (top = index 0)
-        active_node = self._active_nodes[0]
-        placeholder = active_node._get_placeholder()
-        active_node._replace(placeholder, logic_node)
-        self._active_nodes.insert(0, logic_node)
+        # If there is an active node (top = last), the entered node replaces its placeholder
+        if self._active_nodes:
+            active_node = self._active_nodes[-1]
+            placeholder = active_node._get_placeholder()
+            active_node._replace(placeholder, logic_node)
+        self._ln_push(logic_node)
 
     def _ln_exit(self, logic_node: LogicNode):
-        if not self._active_nodes or self._active_nodes[0] is not logic_node:
+        if not self._active_nodes or self._active_nodes[-1] is not logic_node:
             raise AssertionError("The LogicNode is not currently active.")
-        self._active_nodes.pop(0)
+        self._active_nodes.pop()
+        self._active_node_ids.discard(id(logic_node))
+
+    def _ln_push(self, logic_node: LogicNode):
+        self._active_nodes.append(logic_node)
+        self._active_node_ids.add(id(logic_node))
+
+    def _bp_push(self, breakpoint_node: BreakpointNode):
+        self._breakpoint_nodes.setdefault(id(breakpoint_node.break_from), {})[id(breakpoint_node)] = breakpoint_node
+
+    def _bp_remove(self, breakpoint_node: BreakpointNode):
+        # No-op if the breakpoint is not pending
+        if self._awaiting_breakpoints.pop(id(breakpoint_node), None) is not None:
+            return
+        scope_key = id(breakpoint_node.break_from)
+        breakpoint_nodes = self._breakpoint_nodes.get(scope_key)
+        if breakpoint_nodes is not None and breakpoint_nodes.pop(id(breakpoint_node), None) is not None and not breakpoint_nodes:
+            del self._breakpoint_nodes[scope_key]
 
     def shelve(self):
+        # The stacks are replaced by fresh ones below, so they are shelved as they are, without copying.
         shelved = {
-            'active_groups': self._active_groups.copy(),
-            'active_nodes': self._active_nodes.copy(),
-            'breakpoint_nodes': self._breakpoint_nodes.copy(),
+            'active_groups': self._active_groups,
+            'active_nodes': self._active_nodes,
+            'active_node_ids': self._active_node_ids,
+            'breakpoint_nodes': self._breakpoint_nodes,
+            'awaiting_breakpoints': self._awaiting_breakpoints,
             'inspection_mode': self.inspection_mode,
             'vigilant_mode': self.vigilant_mode,
         }
-        self._shelved_state.insert(0, shelved)
+        self._shelved_state.append(shelved)
 
         # Reset to clean state
         self._active_groups = []
         self._active_nodes = []
-        self._breakpoint_nodes = []
+        self._active_node_ids = set()
+        self._breakpoint_nodes = {}
+        self._awaiting_breakpoints = {}
 
         return shelved
 
@@ -499,27 +687,135 @@ class LogicGroupManager(metaclass=Singleton):
         if not self._shelved_state:
             raise RuntimeError("No shelved state to unshelve.")
 
-        state = self._shelved_state.pop(0)
+        state = self._shelved_state.pop()
 
         self._active_groups = state['active_groups']
         self._active_nodes = state['active_nodes']
+        self._active_node_ids = state['active_node_ids']
         self._breakpoint_nodes = state['breakpoint_nodes']
+        self._awaiting_breakpoints = state['awaiting_breakpoints']
         self.inspection_mode = state['inspection_mode']
         self.vigilant_mode = state['vigilant_mode']
 
+    def _log_permit(self, expression: LogicExpression, kind: str) -> int:
+        # returns -1 if the message should be suppressed, otherwise the number of messages suppressed since the last one
+        # the records live on the expression, they are released along with it
+        now = time.monotonic()
+        if expression._log_records is None:
+            expression._log_records = {}
+        record = expression._log_records.get(kind)
+
+        if record is None or record[0] != self._log_epoch:
+            expression._log_records[kind] = [self._log_epoch, now, 0]
+            return 0
+
+        if now - record[1] < self.log_interval:
+            record[2] += 1
+            self.n_suppressed_logs += 1
+            return -1
+
+        suppressed = record[2]
+        record[1] = now
+        record[2] = 0
+        return suppressed
+
+    def _layer(self, base: dict | None, context: dict) -> dict:
+        # Nested bindings are layered, the inner one overrides the data of the same group
+        bindings = {} if base is None else base.copy()
+
+        for key, data in context.items():
+            if isinstance(key, LogicGroup):
+                key = key.name
+            elif not isinstance(key, str):
+                raise TypeError(f'Context must be keyed by LogicGroup or its name, got {key!r}.')
+            bindings[key] = data
+        return bindings
+
+    def _bind(self, context: dict) -> contextvars.Token:
+        return self._bind_layered(self._layer(self._bindings.get(), context))
+
+    def _bind_layered(self, bindings: dict) -> contextvars.Token:
+        # binds bindings already layered over the current ones by _layer
+        token = self._bindings.set(bindings)
+        self._n_bindings += 1
+        return token
+
+    def _unbind(self, token: contextvars.Token) -> None:
+        self._bindings.reset(token)
+        self._n_bindings -= 1
+
+    def _bound(self, logic_group: LogicGroup) -> Any:
+        # returns the data bound to the logic group for the current evaluation, None if not bound
+        if not self._n_bindings:
+            return None
+        bindings = self._bindings.get()
+        if bindings is None:
+            return None
+        return bindings.get(logic_group.name)
+
+    def _stage_awaited(self, awaited: dict) -> contextvars.Token:
+        token = self._awaited.set(awaited)
+        self._n_awaiting += 1
+        return token
+
+    def _unstage_awaited(self, token: contextvars.Token) -> None:
+        self._awaited.reset(token)
+        self._n_awaiting -= 1
+
+    def _awaited_value(self, expression: LogicExpression) -> Any:
+        # returns the value awaited for the expression by the current async evaluation, NO_DEFAULT if none
+        awaited = self._awaited.get()
+        if awaited is None:
+            return NO_DEFAULT
+        return awaited.get(id(expression), NO_DEFAULT)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'default_fallback': self.n_default_fallback,
+            'dtype_mismatch': self.n_dtype_mismatch,
+            'suppressed_logs': self.n_suppressed_logs,
+        }
+
+    def reset_stats(self) -> None:
+        self._log_epoch += 1
+        self.n_default_fallback = 0
+        self.n_dtype_mismatch = 0
+        self.n_suppressed_logs = 0
+
     def clear(self):
         self._cache.clear()
+        if self._registry_clock is not None:
+            self._registry_clock.clear()
+        self._log_epoch += 1
         self._active_groups.clear()
         self._active_nodes.clear()
+        self._active_node_ids.clear()
         self._breakpoint_nodes.clear()
+        self._awaiting_breakpoints.clear()
 
     @property
     def active_group(self) -> LogicGroup | None:
-        return self._active_groups[0] if self._active_groups else None
+        return self._active_groups[-1] if self._active_groups else None
 
     @property
     def active_node(self) -> LogicNode | None:
-        return self._active_nodes[0] if self._active_nodes else None
+        return self._active_nodes[-1] if self._active_nodes else None
+
+
+class EvalContext(object):
+    def __init__(self, bindings: dict):
+        self.bindings = bindings
+        self._tokens: list[contextvars.Token] = []
+
+    def __enter__(self) -> Self:
+        self._tokens.append(LGM._bind(self.bindings))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        LGM._unbind(self._tokens.pop())
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}>({", ".join(map(str, self.bindings))})'
 
 
 LGM = LogicGroupManager()
@@ -541,7 +837,7 @@ class LogicGroup(object):
         if not LGM._active_nodes:
             return
 
-        active_node = LGM._active_nodes[0]  # top of stack
+        active_node = LGM._active_nodes[-1]  # top of stack
 
         # Step 2.1: Locate placeholder and replace with breakpoint
         placeholder = active_node._get_placeholder()
@@ -549,13 +845,13 @@ class LogicGroup(object):
         breakpoint_node.break_from = self
         active_node._replace(placeholder, breakpoint_node)
 
-        # Step 2.2: Push to global breakpoint stack
-        LGM._breakpoint_nodes.insert(0, breakpoint_node)
+        # Step 2.2: Index the breakpoint under its break scope
+        LGM._bp_push(breakpoint_node)
 
     def _break_active(self) -> None:
         if not LGM._active_groups:
             raise RuntimeError("No active LogicGroup to break from.")
-        active_group = LGM._active_groups[0]
+        active_group = LGM._active_groups[-1]
         if active_group is not self:
             raise IndexError('Not breaking from the top active LogicGroup.')
         raise self.Break()
@@ -570,7 +866,7 @@ class LogicGroup(object):
 
         # Step 2: Unwind the group stack from top until we hit `self`
         # We iterate from the top (end of list) downward
-        for group in LGM._active_groups[:]:
+        for group in reversed(LGM._active_groups):
             group._break_active()
             if group is self:
                 break
@@ -626,8 +922,16 @@ class LogicNode(LogicExpression):
         self.condition_to_parent = NO_CONDITION
         self.parent = None
         self.children = {}
-        self.labels = [_.name for _ in LGM._active_groups]
+        self.labels = [_.name for _ in reversed(LGM._active_groups)]
         self.autogen = False
+        self._dependencies = None
+        self._dependencies_resolved = False
+        # id of child -> insertion serial, its index in subordinates (top at index 0) is len(subordinates) - 1 - serial
+        self._slots: dict[int, int] = {}
+        self._placeholders: list[PlaceholderNode] = []  # in push order, the last one is the current placeholder
+        self.frozen = False
+        self._dispatch: tuple[tuple[Any, LogicNode], ...] | None = None  # (condition value, child) in matching order, only when frozen
+        self._fallback: LogicNode | None = None  # the unconditional or else child, only when frozen
 
     def _infer_condition(self, child: LogicNode) -> NodeEdgeCondition:
         size = len(self.subordinates)
@@ -676,10 +980,9 @@ class LogicNode(LogicExpression):
             self._append(placeholder, TRUE_CONDITION)
             return placeholder
 
-        # Case 2: Traverse the stack to find existing placeholder
-        for node in self.subordinates:
-            if isinstance(node, PlaceholderNode):
-                return node
+        # Case 2: The most recently registered placeholder
+        if self._placeholders:
+            return self._placeholders[-1]
 
         # Case 3: No existing placeholder, create a new one with AUTO_CONDITION.
         placeholder = PlaceholderNode(auto_connect=False)
@@ -688,6 +991,12 @@ class LogicNode(LogicExpression):
         return placeholder
 
     def _append(self, child: LogicNode, condition: NodeEdgeCondition) -> None:
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
+
+        if isinstance(child, ActionNode) and child.shared:
+            raise NodeValueError(f'{child} is shared, it can not be attached to a tree.')
+
         if condition is None:
             raise ValueError("LogicNode must have an valid edge condition.")
 
@@ -698,11 +1007,21 @@ class LogicNode(LogicExpression):
             raise KeyError(f"Edge {condition} already registered.")
 
         self.children[condition] = child
+        self._slots[id(child)] = len(self.subordinates)
         self.subordinates.insert(0, child)
+        if isinstance(child, PlaceholderNode):
+            self._placeholders.append(child)
         child.parent = self
         child.condition_to_parent = condition
+        LGM.structure_version += 1
 
     def _overwrite(self, new_node: LogicNode, condition: NodeEdgeCondition) -> None:
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
+
+        if isinstance(new_node, ActionNode) and new_node.shared:
+            raise NodeValueError(f'{new_node} is shared, it can not be attached to a tree.')
+
         if condition is None:
             raise ValueError("LogicNode must have an valid edge condition.")
 
@@ -717,17 +1036,31 @@ class LogicNode(LogicExpression):
         new_node.parent = self
         new_node.condition_to_parent = condition
 
-        self.subordinates[self.subordinates.index(original_node)] = new_node
+        index = self._locate_child(original_node)
+        if index < 0:
+            raise LookupError(f'Failed to locate {original_node} from subordinates, buffer corruption detected.')
+
+        self._reslot(index, original_node, new_node)
         original_node.parent = None
         original_node.condition_to_parent = NO_CONDITION
+        LGM.structure_version += 1
 
     def _replace(self, original_node: LogicNode, new_node: LogicNode) -> None:
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
+
+        if isinstance(new_node, ActionNode) and new_node.shared:
+            raise NodeValueError(f'{new_node} is shared, it can not be attached to a tree.')
+
         # The __eq__ of LogicExpression is overloaded, so we must check identity here.
-        for node in LGM._active_nodes:
-            if node is original_node:
-                raise RuntimeError('Must not replace active node. Existing first required.')
+        if id(original_node) in LGM._active_node_ids:
+            raise RuntimeError('Must not replace active node. Existing first required.')
+
+        index = self._locate_child(original_node)
+        if index < 0:
+            raise NodeNotFountError(f'Failed to locate {original_node} from subordinates.')
 
-        self.subordinates[self.subordinates.index(original_node)] = new_node
+        self._reslot(index, original_node, new_node)
 
         self.children[original_node.condition_to_parent] = new_node
         new_node.parent = self
@@ -735,6 +1068,31 @@ class LogicNode(LogicExpression):
 
         original_node.parent = None
         original_node.condition_to_parent = NO_CONDITION
+        LGM.structure_version += 1
+
+    def _freeze(self) -> None:
+        # Step 1: Finalize the remaining placeholders, as exiting the with block does, and drop the construction states
+        if self._placeholders:
+            self._consolidate_placeholder()
+        self._placeholders = None
+
+        # Step 2: Precompute the dispatch table, in the order the children are matched by _eval_recursively
+        dispatch = []
+        fallback = else_branch = None
+        for child in self.subordinates:
+            condition = child.condition_to_parent
+            if condition is NO_CONDITION:
+                # matches any value, the children registered before it are never reached
+                fallback = child
+                break
+            elif condition is ELSE_CONDITION:
+                else_branch = child
+            else:
+                dispatch.append((condition.value, child))
+
+        self._dispatch = tuple(dispatch)
+        self._fallback = else_branch if fallback is None else fallback
+        self.frozen = True
 
     def _validate(self):
         if len(self.subordinates) != len(self.children):
@@ -743,36 +1101,143 @@ class LogicNode(LogicExpression):
         for condition, child in self.children.items():
             if child.condition_to_parent is not condition:
                 raise EdgeValueError('Child node condition does not match registered condition.')
-            if node not in self.subordinates:
+            index = self._locate_child(child)
+            if index < 0 or self.subordinates[index] is not child:
                 raise ValueError(f"LogicNode {child} not found in stack")
 
+    def _locate_child(self, child: LogicNode) -> int:
+        # index of the child in subordinates, -1 if not found
+        serial = self._slots.get(id(child))
+        if serial is None:
+            return -1
+        return len(self.subordinates) - 1 - serial
+
+    def _reslot(self, index: int, original_node: LogicNode, new_node: LogicNode) -> None:
+        # Swap the node at the index, keeping the slot index and the placeholder list in sync
+        self.subordinates[index] = new_node
+        self._slots[id(new_node)] = self._slots.pop(id(original_node))
+
+        if isinstance(original_node, PlaceholderNode):
+            # The LogicExpression overloads __eq__, so list.remove can not be used. Usually the last one.
+            for i in range(len(self._placeholders) - 1, -1, -1):
+                if self._placeholders[i] is original_node:
+                    del self._placeholders[i]
+                    break
+        if isinstance(new_node, PlaceholderNode):
+            self._placeholders.append(new_node)
+
     def _eval_recursively(self, path: list | None = None, default: Any = NO_DEFAULT) -> tuple[Any, list]:
         if path is None:
             path = [self]
         else:
             path.append(self)
 
-        value = self._eval(False)
+        if LGM.vigilant_mode:
+            try:
+                value = self._eval(False)
+            except Exception as e:
+                raise ExpressEvaluationError(node=self, path=path.copy(), exception=e) from e
+        else:
+            value = self._eval(False)
+
         if self.is_leaf:
             return value, path
 
         else_branch = None
-        for child in self.subordinates:
-            condition = child.condition_to_parent
-            if condition is ELSE_CONDITION:
-                else_branch = child
-            elif condition is NO_CONDITION or value == condition.value:
-                return child._eval_recursively(path, default)
+        if self.frozen:
+            for condition_value, child in self._dispatch:
+                if value == condition_value:
+                    return child._eval_recursively(path, default)
+            else_branch = self._fallback
+        else:
+            for child in self.subordinates:
+                condition = child.condition_to_parent
+                if condition is ELSE_CONDITION:
+                    else_branch = child
+                elif condition is NO_CONDITION or value == condition.value:
+                    return child._eval_recursively(path, default)
 
         if else_branch is not None:
             return else_branch._eval_recursively(path, default)
+        return self._no_match(value, path, default)
 
+    def _no_match(self, value: Any, path: list, default: Any) -> tuple[Any, list]:
         if default is NO_DEFAULT:
             raise ValueError(f"No matching condition found for value {value} at '{self.repr}'.")
 
-        LOGGER.warning(f"No matching condition found for value {value} at '{self.repr}', using default {default}.")
+        LGM.n_default_fallback += 1
+        if LOGGER.isEnabledFor(logging.WARNING):
+            suppressed = LGM._log_permit(self, 'default_fallback')
+            if suppressed >= 0:
+                LOGGER.warning(
+                    "No matching condition found for value %s at '%s', using default %s.%s",
+                    value, self.repr, default, f' ({suppressed} similar messages suppressed)' if suppressed else ''
+                )
         return default, path
 
+    def _select(self, value: Any) -> LogicNode | None:
+        # the child _eval_recursively descends into for the value, None if no condition matches
+        if self.frozen:
+            for condition_value, child in self._dispatch:
+                if value == condition_value:
+                    return child
+            return self._fallback
+
+        else_branch = None
+        for child in self.subordinates:
+            condition = child.condition_to_parent
+            if condition is ELSE_CONDITION:
+                else_branch = child
+            elif condition is NO_CONDITION or value == condition.value:
+                return child
+        return else_branch
+
+    def _collect_pending(self, pending: list) -> None:
+        # the expressions called when this node is evaluated, called ahead by the async evaluation
+        if callable(self.expression):
+            pending.append(self)
+
+    async def _aeval_recursively(self, path: list, default: Any) -> tuple[Any, list]:
+        node = self
+        while True:
+            if isinstance(node, ActionNode):
+                return node._eval_recursively(path, default)
+
+            path.append(node)
+            if isinstance(node, BreakpointNode):
+                # as BreakpointNode._eval_recursively, descend into the linked node
+                if not node.subordinates:
+                    if LGM.vigilant_mode:
+                        raise NodeValueError(f'{node} not connected.')
+                    return node.expression, path
+                node = node.subordinates[0]
+                continue
+
+            try:
+                pending = []
+                node._collect_pending(pending)
+                if pending:
+                    # the independent calls of the node are awaited together, then read back by _eval
+                    token = LGM._stage_awaited(await _await_pending(pending))
+                    try:
+                        value = node._eval(False)
+                    finally:
+                        LGM._unstage_awaited(token)
+                else:
+                    value = node._eval(False)
+            except Exception as e:
+                if LGM.vigilant_mode:
+                    raise ExpressEvaluationError(node=node, path=path.copy(), exception=e) from e
+                raise
+
+            if node.is_leaf:
+                return value, path
+
+            child = node._select(value)
+            if child is None:
+                return node._no_match(value, path, default)
+            node = child
+
     def _auto_fill(self) -> None:
         size = len(self.children)
         no_action = NoAction(auto_connect=False, autogen=True)
@@ -835,17 +1300,75 @@ class LogicNode(LogicExpression):
 
     def _consolidate_placeholder(self) -> int:
         placeholder_count = 0
-        i = 0
-        while i < len(self.subordinates):
-            node = self.subordinates[i]
-            if isinstance(node, PlaceholderNode):
-                self._replace(node, NoAction(auto_connect=False, autogen=True))
-                placeholder_count += 1
-                # no increment: replacement maintains list length; continue checking same index
-            else:
-                i += 1
+        # the most recent placeholder first, in the order of the subordinates stack
+        for node in reversed(self._placeholders.copy()):
+            self._replace(node, NoAction(auto_connect=False, autogen=True))
+            placeholder_count += 1
         return placeholder_count
 
+    def _signature(self) -> Any:
+        return self.__class__, self.repr, self.dtype, self.autogen, LogicNode._value_signature(self.expression)
+
+    def _deduplicate(self, registry: dict) -> tuple[LogicNode, int]:
+        merged = 0
+        edges = []
+
+        # Step 1: Post-order, so that every child is already interned when fingerprinting this node
+        for i, child in enumerate(self.subordinates):
+            shared, n = child._deduplicate(registry)
+            merged += n
+            if shared is not child and self.frozen:
+                # the edges of a frozen node are never redirected, it keeps referencing its own child
+                shared = child
+            elif shared is not child:
+                # shared node always carries the same condition_to_parent, as the condition is part of the fingerprint
+                # the parent pointer of the shared node is left untouched, it stays with the first registered parent
+                self.children[child.condition_to_parent] = shared
+                self._reslot(i, child, shared)
+                merged += 1
+                LGM.structure_version += 1
+            edges.append(id(shared))
+
+        # Step 2: subclasses defined outside this package may carry extra states, never merge them
+        if not self.__class__.__module__.startswith(__package__):
+            return self, merged
+
+        # Step 3: Intern this node, children are referenced by the address of their canonical node
+        # the labels are part of the key, so that nodes of different logic groups are never merged
+        key = (self.condition_to_parent, self._signature(), tuple(self.labels), tuple(edges))
+        shared = registry.get(key)
+        if shared is None:
+            registry[key] = self
+            return self, merged
+        return shared, merged
+
+    @staticmethod
+    def _value_signature(value: Any) -> Any:
+        if isinstance(value, LogicNode):
+            return value._signature()
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            return type(value), value
+        # callables and other opaque objects are only equivalent to themselves
+        return id(value)
+
+    def _get_dependencies(self) -> frozenset | None:
+        if not self._dependencies_resolved:
+            self._dependencies = self._resolve_dependencies()
+            self._dependencies_resolved = True
+        return self._dependencies
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        return LogicNode._value_dependencies(self.expression)
+
+    @staticmethod
+    def _value_dependencies(value: Any) -> frozenset | None:
+        if isinstance(value, LogicNode):
+            return value._get_dependencies()
+        if isinstance(value, (bool, int, float, str)) or value is None or value is NO_DEFAULT:
+            return frozenset()
+        # the inputs of callables and other opaque objects can not be determined statically
+        return None
+
     def _entry_check(self) -> bool:
         if LGM.inspection_mode:
             return True
@@ -869,9 +1392,13 @@ class LogicNode(LogicExpression):
         self._append(other, AUTO_CONDITION)
         return other  # Allow chaining
 
-    def __call__(self, default: Any = None) -> Any:
+    def __call__(self, default: Any = None, context: dict | None = None) -> Any:
+        if context is not None:
+            with self.bind(context):
+                return self(default)
+
         if default is None:
-            default = NoAction(auto_connect=False, autogen=True)
+            default = DEFAULT_ACTION
         inspection_mode = LGM.inspection_mode
         if inspection_mode:
             LOGGER.info('LGM inspection mode temporarily disabled to evaluate correctly.')
@@ -883,12 +1410,34 @@ class LogicNode(LogicExpression):
         finally:
             LGM.inspection_mode = inspection_mode
 
+    async def aeval(self, default: Any = None, context: dict | None = None) -> Any:
+        if context is not None:
+            with self.bind(context):
+                return await self.aeval(default)
+
+        if default is None:
+            default = DEFAULT_ACTION
+        inspection_mode = LGM.inspection_mode
+        if inspection_mode:
+            LOGGER.info('LGM inspection mode temporarily disabled to evaluate correctly.')
+            LGM.inspection_mode = False
+        try:
+            value, _ = await self._aeval_recursively([], default)
+            return value
+        finally:
+            LGM.inspection_mode = inspection_mode
+
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__}>({self.repr!r})'
 
     def __hash__(self) -> int:
         return id(self)
 
+    def bind(self, context: dict | None = None, **groups) -> EvalContext:
+        if context is None:
+            return EvalContext(groups)
+        return EvalContext({**context, **groups})
+
     def append(self, child: LogicNode, condition: NodeEdgeCondition = AUTO_CONDITION) -> None:
         self._append(child, condition)
 
@@ -901,6 +1450,25 @@ class LogicNode(LogicExpression):
     def eval_recursively(self, path: list | None = None, default: Any = NO_DEFAULT) -> tuple[Any, list]:
         return self._eval_recursively(path, default)
 
+    def freeze(self) -> LogicNode:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            # shared nodes of a deduplicated tree are visited once
+            if node.frozen:
+                continue
+            if id(node) in LGM._active_node_ids:
+                raise RuntimeError('Must not freeze active node. Existing first required.')
+            node._freeze()
+            stack.extend(node.children.values())
+        return self
+
+    def deduplicate(self, registry: dict | None = None) -> int:
+        if registry is None:
+            registry = {}
+        _, merged = self._deduplicate(registry)
+        return merged
+
     def list_labels(self) -> dict[str, list[LogicNode]]:
         labels = {}
 
@@ -925,6 +1493,10 @@ class LogicNode(LogicExpression):
     def is_leaf(self) -> bool:
         return not self.children
 
+    @property
+    def dependencies(self) -> frozenset | None:
+        return self._get_dependencies()
+
     @property
     def child_stack(self):
         yield from self.subordinates
@@ -960,16 +1532,19 @@ class BreakpointNode(LogicNode):
         if self.subordinates:
             raise TooManyChildren(f'{self.__class__.__name__} must not have more than one child node.')
         self.await_connection = False
-        try:
-            LGM._breakpoint_nodes.remove(self)
-        except NodeNotFountError as _:
-            pass
+        LGM._bp_remove(self)
         self._append(PlaceholderNode(auto_connect=False), NO_CONDITION)
-        LGM._active_nodes.insert(0, self)
+        LGM._ln_push(self)
 
     def _on_exit(self) -> None:
         LGM._ln_exit(self)
 
+    def _freeze(self) -> None:
+        # An unconnected breakpoint stays unconnected, it is no longer managed by LGM.
+        self.await_connection = False
+        LGM._bp_remove(self)
+        super()._freeze()
+
     def _eval(self, enforce_dtype: bool) -> Any:
         if not self.subordinates:
             if LGM.vigilant_mode:
@@ -992,6 +1567,14 @@ class BreakpointNode(LogicNode):
         linked_to = self.subordinates[0]
         return linked_to._eval_recursively(path, default)
 
+    def _deduplicate(self, registry: dict) -> tuple[LogicNode, int]:
+        # Breakpoints only maintain a virtual link, the linked node is interned with its actual parent.
+        return self, 0
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        # Evaluation is delegated to the linked node, which tracks its own dependencies.
+        return frozenset()
+
     def __repr__(self) -> str:
         if self.subordinates:
             return f'<{self.__class__.__name__} connected>(break_from={self.break_from})'
@@ -1028,12 +1611,15 @@ class ActionNode(LogicNode):
             repr: str | None = None,
             uid: uuid.UUID = None,
             auto_connect: bool = True,
+            shared: bool = False,
             **kwargs
     ):
         # Do not capture logic group labels — action nodes are leaves
         super().__init__(expression=expression, dtype=dtype, repr=repr, uid=uid)
 
         self.action = action
+        # a shared action is a detached singleton returned by many evaluations, it never gets a parent
+        self.shared = shared
 
         if auto_connect:
             self._auto_connect()
@@ -1044,7 +1630,7 @@ class ActionNode(LogicNode):
                 raise NodeValueError(f'Cannot set ActionNode {self} as root node.')
             return
 
-        active_node = LGM._active_nodes[0]  # top of stack
+        active_node = LGM._active_nodes[-1]  # top of stack
         placeholder = active_node._get_placeholder()
         active_node._replace(placeholder, self)
 
@@ -1052,6 +1638,18 @@ class ActionNode(LogicNode):
         if self.action is not None:
             self.action()
 
+    def _signature(self) -> Any:
+        return (
+            self.__class__, self.repr, self.dtype, self.autogen,
+            LogicNode._value_signature(self.expression),
+            LogicNode._value_signature(self.action),
+            getattr(self, 'sig', None)
+        )
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        # Action nodes are leaves and always re-evaluated, so that their actions are triggered.
+        return frozenset()
+
     def _append(self, child: LogicNode, condition: NodeEdgeCondition) -> None:
         raise TooManyChildren('Action node must not have any child node.')
 
@@ -1087,6 +1685,9 @@ class PlaceholderNode(ActionNode):
             return self
         return self.action
 
+    def _signature(self) -> Any:
+        return id(self)
+
 
 class NoAction(ActionNode):
     def __init__(self, sig: int = 0, repr='NoAction', autogen: bool = False, **kwargs):
@@ -1101,6 +1702,10 @@ class NoAction(ActionNode):
         return f'<{self.__class__.__name__}>(sig={self.sig})'
 
 
+# The shared fallback of evaluations without an explicit default, so that calls never allocate a NoAction.
+DEFAULT_ACTION = NoAction(auto_connect=False, autogen=True, shared=True)
+
+
 class LongAction(ActionNode):
     def __init__(self, *, sig: int = 1, repr='LongAction', **kwargs):
         super().__init__(repr=repr, **kwargs)
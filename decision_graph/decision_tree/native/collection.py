@@ -1,11 +1,61 @@
-from collections.abc import Mapping, Sequence, Generator
+import struct
+import sys
+from collections.abc import Mapping, MutableMapping, Sequence, Generator, Iterable
 
 from . import LOGGER
 from .abc import LogicGroup
+from ..exc import NO_DEFAULT
+
+
+class SlotMapping(MutableMapping):
+    """The data of a LogicMapping with a schema, the declared keys are stored in slots and the others in a dict."""
+    __slots__ = ('_slot_index', '_values', '_extra')
+
+    def __init__(self, slot_index: dict, values: list, extra: dict):
+        self._slot_index = slot_index
+        self._values = values
+        self._extra = extra
+
+    def __getitem__(self, key):
+        slot = self._slot_index.get(key)
+        if slot is None:
+            return self._extra[key]
+        value = self._values[slot]
+        if value is NO_DEFAULT:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        slot = self._slot_index.get(key)
+        if slot is None:
+            self._extra[key] = value
+        else:
+            self._values[slot] = value
+
+    def __delitem__(self, key):
+        slot = self._slot_index.get(key)
+        if slot is None:
+            del self._extra[key]
+        elif self._values[slot] is NO_DEFAULT:
+            raise KeyError(key)
+        else:
+            self._values[slot] = NO_DEFAULT
+
+    def __iter__(self):
+        for key, slot in self._slot_index.items():
+            if self._values[slot] is not NO_DEFAULT:
+                yield key
+        yield from self._extra
+
+    def __len__(self):
+        return sum(value is not NO_DEFAULT for value in self._values) + len(self._extra)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({dict(self)!r})'
 
 
 class LogicMapping(LogicGroup):
-    def __init__(self, *, name: str, data: dict | None = None, parent: LogicGroup | None = None, contexts: dict | None = None, **kwargs):
+    def __init__(self, *, name: str, data: dict | None = None, parent: LogicGroup | None = None, contexts: dict | None = None, schema: Iterable[str] | None = None, **kwargs):
         super().__init__(name=name, parent=parent, contexts=contexts, **kwargs)
         if data is None:
             ctx_data = self.contexts.setdefault('data', {})
@@ -18,10 +68,52 @@ class LogicMapping(LogicGroup):
                 raise TypeError("The 'data' parameter must be a Mapping!")
         else:
             self.data = data
+        self._subscriptions = []
+
+        # With a schema, the values of the declared keys are stored in slots, and data becomes a view over them
+        self.schema: tuple[str, ...] | None = None
+        self._slot_index: dict[str, int] | None = None
+        self._values: list | None = None
+        if schema is not None:
+            self.schema = tuple(schema)
+            self._slot_index = {key: slot for slot, key in enumerate(self.schema)}
+            if len(self._slot_index) != len(self.schema):
+                raise ValueError(f'Duplicated keys in the schema of {self}.')
+            self._values = [self.data.get(key, NO_DEFAULT) for key in self.schema]
+            extra = {key: value for key, value in self.data.items() if key not in self._slot_index}
+            self.data = SlotMapping(self._slot_index, self._values, extra)
+            if data is None:
+                self.contexts['data'] = self.data
 
     def _get(self, key: str):
         return self.data[key]
 
+    def _slot_of(self, key: str) -> int:
+        # -1 if the key is not declared in the schema
+        if self._slot_index is None:
+            return -1
+        return self._slot_index.get(key, -1)
+
+    def _get_slot(self, slot: int):
+        # the slots are the only copy of the declared values, data is a view over them
+        value = self._values[slot]
+        if value is NO_DEFAULT:
+            raise KeyError(self.schema[slot])
+        return value
+
+    def _notify(self, keys) -> None:
+        # Iterate over a copy, callbacks are allowed to (un)subscribe
+        for subscription in self._subscriptions.copy():
+            root, callback, auto_eval, previous = subscription
+            root._mark_dirty(keys)
+            if not auto_eval:
+                continue
+
+            value = root.eval_incremental()
+            subscription[3] = value
+            if callback is not None and value is not previous:
+                callback(root, value, previous)
+
     def __bool__(self) -> bool:
         return bool(self.data)
 
@@ -39,11 +131,52 @@ class LogicMapping(LogicGroup):
     def __contains__(self, key: str) -> bool:
         return key in self.data
 
+    def __setitem__(self, key: str, value) -> None:
+        self.data[key] = value
+        if self._subscriptions:
+            self._notify((key,))
+
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        if self._subscriptions:
+            self._notify((key,))
+
     def update(self, *args, **kwargs) -> None:
-        self.data.update(*args, **kwargs)
+        if not self._subscriptions:
+            self.data.update(*args, **kwargs)
+            return
+
+        updates = dict(*args, **kwargs)
+        self.data.update(updates)
+        self._notify(updates.keys())
 
     def clear(self) -> None:
+        keys = tuple(self.data)
         self.data.clear()
+        if self._subscriptions:
+            self._notify(keys)
+
+    def set_row(self, values: Iterable) -> None:
+        if self.schema is None:
+            raise ValueError(f'{self} has no schema, set_row requires one.')
+
+        row = list(values)
+        if len(row) != len(self.schema):
+            raise ValueError(f'Expected {len(self.schema)} values for the schema of {self}, got {len(row)}.')
+
+        self._values[:] = row
+        if self._subscriptions:
+            self._notify(self.schema)
+
+    def subscribe(self, root, callback=None, auto_eval: bool = True) -> None:
+        self.unsubscribe(root)
+        self._subscriptions.append([root, callback, auto_eval, None])
+
+    def unsubscribe(self, root) -> None:
+        for subscription in self._subscriptions:
+            if subscription[0] is root:
+                self._subscriptions.remove(subscription)
+                return
 
 
 class LogicSequence(LogicGroup):
@@ -101,6 +234,119 @@ class LogicSequence(LogicGroup):
         return bool(self.data)
 
 
+# struct formats of the fields a LogicRecord reads from the buffer, other fields are read through the wrapped array
+FIELD_FORMATS = {
+    ('f', 8): 'd', ('f', 4): 'f',
+    ('i', 8): 'q', ('i', 4): 'i', ('i', 2): 'h', ('i', 1): 'b',
+    ('u', 8): 'Q', ('u', 4): 'I', ('u', 2): 'H', ('u', 1): 'B',
+    ('b', 1): '?',
+}
+NATIVE_BYTEORDER = ('=', '|', '<' if sys.byteorder == 'little' else '>')
+
+
+class LogicRecord(LogicGroup):
+    def __init__(self, *, name: str = None, data=None, dtype=None, index: int = 0, parent: LogicGroup | None = None, contexts: dict | None = None, **kwargs):
+        super().__init__(name=name, parent=parent, contexts=contexts, **kwargs)
+        if data is None:
+            data = self.contexts.get('data')
+            if data is None:
+                raise TypeError("The 'data' parameter must be a structured array or a buffer!")
+        if dtype is None:
+            dtype = getattr(data, 'dtype', None)
+            if dtype is None or dtype.names is None:
+                raise TypeError(f'A structured dtype is required for {self}, pass it along with raw buffers.')
+
+        try:
+            self._buffer = memoryview(data).cast('B')
+        except TypeError as e:
+            raise ValueError(f'The data of {self} must be a C-contiguous buffer.') from e
+
+        self.data = data
+        self.dtype = dtype
+        self.schema = tuple(dtype.names)
+        self._slot_index = {key: slot for slot, key in enumerate(self.schema)}
+        self._itemsize = dtype.itemsize
+        # a single record (numpy.void or 0-d array) is indexed by field name directly
+        self._scalar = getattr(data, 'shape', None) == ()
+        self._n_records = len(self._buffer) // self._itemsize if self._itemsize else 0
+
+        # (struct, offset) of each field, None for the fields read through the wrapped array
+        self._fields = []
+        for key in self.schema:
+            field_dtype, offset = dtype.fields[key][:2]
+            if field_dtype.shape != () or field_dtype.byteorder not in NATIVE_BYTEORDER:
+                fmt = None
+            elif field_dtype.kind == 'S':
+                fmt = f'{field_dtype.itemsize}s'
+            else:
+                fmt = FIELD_FORMATS.get((field_dtype.kind, field_dtype.itemsize))
+            self._fields.append(None if fmt is None else (struct.Struct(f'={fmt}'), offset))
+
+        if None in self._fields and not hasattr(data, 'dtype'):
+            raise TypeError(f'Fields of {self} without a native layout can only be read from a structured array, not from a raw buffer.')
+
+        self._index = 0
+        self._base = 0
+        self._seek(index)
+
+    def _seek(self, index: int) -> None:
+        if index < 0 or index >= self._n_records:
+            raise IndexError(f'Record {index} out of range for {self} of {self._n_records} records.')
+        self._index = index
+        self._base = index * self._itemsize
+
+    def _slot_of(self, key: str) -> int:
+        return self._slot_index.get(key, -1)
+
+    def _get_slot(self, slot: int):
+        field = self._fields[slot]
+        if field is None:
+            row = self.data if self._scalar else self.data[self._index]
+            return row[self.schema[slot]]
+
+        layout, offset = field
+        value, = layout.unpack_from(self._buffer, self._base + offset)
+        if isinstance(value, bytes):
+            # numpy strips the trailing null bytes of fixed-width strings
+            return value.rstrip(b'\x00')
+        return value
+
+    def _get(self, key: str):
+        slot = self._slot_of(key)
+        if slot < 0:
+            raise KeyError(key)
+        return self._get_slot(slot)
+
+    # === Python interface conveniences ===
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def seek(self, index: int) -> None:
+        self._seek(index)
+
+    def advance(self) -> bool:
+        if self._index + 1 >= self._n_records:
+            return False
+        self._seek(self._index + 1)
+        return True
+
+    def __len__(self) -> int:
+        return self._n_records
+
+    def __getitem__(self, key: str):
+        from .node import AttrExpression
+        return AttrExpression(attr=key, logic_group=self)
+
+    def __getattr__(self, key: str):
+        from .node import AttrExpression
+        return AttrExpression(attr=key, logic_group=self)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_index
+
+
 class LogicGenerator(LogicGroup):
     def __init__(self, *, name: str, data: Generator | None = None, parent: LogicGroup | None = None, contexts: dict | None = None, **kwargs):
         super().__init__(name=name, parent=parent, contexts=contexts, **kwargs)
@@ -3,13 +3,13 @@ from __future__ import annotations
 import enum
 import json
 import operator
-import traceback
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
 from typing import Any
 
 from .abc import LGM, LogicNode, LogicGroup, NO_CONDITION, AUTO_CONDITION, NodeEdgeCondition, PlaceholderNode, BreakpointNode, ActionNode
-from .collection import LogicMapping
-from ..exc import NO_DEFAULT, TooManyChildren, TooFewChildren, EdgeValueError, ContextsNotFound, ExpressEvaluationError
+from .collection import LogicMapping, LogicRecord
+from ..exc import NO_DEFAULT, NodeFrozenError, TooManyChildren, TooFewChildren, EdgeValueError, ContextsNotFound, ExpressEvaluationError
 
 UNARY_OP_FUNC = Callable[[Any], Any]
 BINARY_OP_FUNC = Callable[[Any, Any], Any]
@@ -31,6 +31,8 @@ class RootLogicNode(LogicNode):
         super().__init__(expression=expression, dtype=dtype, repr=name or repr, **kwargs)
         self.inherit_contexts = inherit_contexts
         self.eval_path: list = []
+        self._dirty_keys: set = set()
+        self._eval_listeners: list = []
 
     def _entry_check(self) -> bool:
         return True
@@ -53,21 +55,38 @@ class RootLogicNode(LogicNode):
         LGM._ln_exit(self)
 
     def _append(self, child: LogicNode, condition: NodeEdgeCondition) -> None:
+        if self.frozen:
+            raise NodeFrozenError(f'{self} is frozen, its children can not be modified.')
         if self.subordinates:
             raise TooManyChildren()
         if condition is not AUTO_CONDITION and condition is not NO_CONDITION:
             raise EdgeValueError()
         super()._append(child, NO_CONDITION)
 
-    def __call__(self, default=None):
+    def _mark_dirty(self, keys) -> None:
+        self._dirty_keys.update(keys)
+
+    def _notify_listeners(self) -> None:
+        for listener in self._eval_listeners.copy():
+            listener(self)
+
+    def __call__(self, default=None, context: dict | None = None):
+        if context is not None:
+            with self.bind(context):
+                return self(default)
+
         # clear cached eval path and evaluate, returning only the value
         self.eval_path.clear()
+        self._dirty_keys.clear()
         value = self._eval_recursively(self.eval_path, default)[0]
+        if self._eval_listeners:
+            self._notify_listeners()
         return value
 
     def eval_recursively(self, path: list | None = None, default: Any = NO_DEFAULT):
         # keep a cached eval_path similar to the C implementation
         self.eval_path.clear()
+        self._dirty_keys.clear()
 
         if path is None:
             v, p = self._eval_recursively(self.eval_path, default)
@@ -75,8 +94,112 @@ class RootLogicNode(LogicNode):
             v, p = self._eval_recursively(path, default)
             # accumulate path into the root's cached eval_path
             self.eval_path.extend(p)
+        if self._eval_listeners:
+            self._notify_listeners()
         return v, p
 
+    def eval_incremental(self, changed_keys=None, default=None):
+        path = self.eval_path
+        if not path:
+            return self(default)
+
+        changed, self._dirty_keys = self._dirty_keys, set()
+        if changed_keys is not None:
+            changed.update(changed_keys)
+
+        # Step 1: Locate the highest node on the last eval path whose inputs changed, or the terminal node
+        n = len(path)
+        for i, node in enumerate(path):
+            if i == n - 1 or isinstance(node, ActionNode):
+                break
+            dependencies = node._get_dependencies()
+            if dependencies is None or not dependencies.isdisjoint(changed):
+                break
+
+        # Step 2: The decisions made above it are unaffected, so restart the evaluation from there
+        del path[i:]
+        value = node._eval_recursively(path, default)[0]
+        if self._eval_listeners:
+            self._notify_listeners()
+        return value
+
+    async def aeval(self, default=None, context: dict | None = None):
+        if context is not None:
+            with self.bind(context):
+                return await self.aeval(default)
+
+        # evaluated into a path of its own, concurrent evaluations of this root do not interleave
+        path = []
+        self._dirty_keys.clear()
+        value = (await self._aeval_recursively(path, default))[0]
+        self.eval_path.clear()
+        self.eval_path.extend(path)
+        if self._eval_listeners:
+            self._notify_listeners()
+        return value
+
+    def _eval_layered(self, bindings: dict | None, default) -> Any:
+        # one full evaluation, as __call__ does, with the bindings prepared by LGM._layer, if any
+        token = None if bindings is None else LGM._bind_layered(bindings)
+        try:
+            self.eval_path.clear()
+            self._dirty_keys.clear()
+            value = self._eval_recursively(self.eval_path, default)[0]
+            if self._eval_listeners:
+                self._notify_listeners()
+            return value
+        finally:
+            if token is not None:
+                LGM._unbind(token)
+
+    def stream(self, source: Iterable[dict | None], batch: int = 64, default=None) -> Iterator[tuple[int, Any]]:
+        if batch < 1:
+            raise ValueError(f'The batch size must be positive, got {batch}.')
+        return self._stream(iter(source), batch, default)
+
+    def _stream(self, iterator: Iterator[dict | None], batch: int, default) -> Iterator[tuple[int, Any]]:
+        index = 0
+        try:
+            while True:
+                # the source is pulled once per batch
+                contexts = list(islice(iterator, batch))
+                if not contexts:
+                    return
+
+                # the bindings of the batch are layered in one pass, over the outer bindings looked up once
+                base = LGM._bindings.get()
+                layered = []
+                error = None
+                try:
+                    for context in contexts:
+                        if context is not None and not isinstance(context, dict):
+                            raise TypeError(f'Stream contexts must be dicts or None, got {type(context).__name__}.')
+                        layered.append(None if context is None else LGM._layer(base, context))
+                except Exception as e:
+                    error = e
+
+                # while the evaluation stays lazy, one per item the consumer asks for
+                for bindings in layered:
+                    yield index, self._eval_layered(bindings, default)
+                    index += 1
+                if error is not None:
+                    raise error
+        finally:
+            # stopping the consumer stops the source too
+            if hasattr(iterator, 'close'):
+                iterator.close()
+
+    def add_listener(self, listener) -> None:
+        if listener not in self._eval_listeners:
+            self._eval_listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        if listener in self._eval_listeners:
+            self._eval_listeners.remove(listener)
+
+    def mark_dirty(self, keys) -> None:
+        self._mark_dirty(keys)
+
     def dry_run(self, enforce_dtype: bool = False):
         for child in self.descendants:
             if isinstance(child, ActionNode):
@@ -84,7 +207,7 @@ class RootLogicNode(LogicNode):
             try:
                 child._eval(enforce_dtype)
             except Exception as e:
-                raise ExpressEvaluationError(f"Failed to evaluate {self}, {traceback.format_exc()}") from e
+                raise ExpressEvaluationError(node=child, exception=e) from e
 
     def get_breakpoint(self) -> BreakpointNode | None:
         for leaf in self.leaves:
@@ -110,6 +233,10 @@ class RootLogicNode(LogicNode):
             return self.subordinates[0]
         raise TooFewChildren()
 
+    @property
+    def dirty_keys(self) -> frozenset:
+        return frozenset(self._dirty_keys)
+
 
 class ContextLogicExpression(LogicNode):
     def __init__(
@@ -137,12 +264,31 @@ class ContextLogicExpression(LogicNode):
             return v._eval(False)
         return v
 
+    @staticmethod
+    def _freeze_operand(v: Any) -> None:
+        # operands are not children, they are frozen along with the expression reading them
+        if isinstance(v, LogicNode) and not v.frozen:
+            v._freeze()
+
+    @staticmethod
+    def _collect_operand(v: Any, pending: list) -> None:
+        if isinstance(v, LogicNode):
+            v._collect_pending(pending)
+
     @staticmethod
     def _safe_alias(v: Any) -> str:
         if isinstance(v, LogicNode):
             return v.repr
         return str(v)
 
+    @staticmethod
+    def _operand_dependencies(left: Any, right: Any) -> frozenset | None:
+        left_dependencies = LogicNode._value_dependencies(left)
+        right_dependencies = LogicNode._value_dependencies(right)
+        if left_dependencies is None or right_dependencies is None:
+            return None
+        return left_dependencies | right_dependencies
+
     # --- Attribute access ---
     def __getitem__(self, key: str) -> AttrExpression:
         return AttrExpression(attr=key, logic_group=self.logic_group)
@@ -218,13 +364,33 @@ class AttrExpression(ContextLogicExpression):
             expression=self.eval if expression is None else expression,
             logic_group=logic_group,
             dtype=dtype,
-            repr=f'{self.logic_group.name}.{attr}' if repr is None else repr
+            repr=repr or '<unresolved>'
         )
+        if repr is None:
+            # the logic group is only resolved by the base class
+            self.repr = f'{self.logic_group.name}.{attr}'
 
         self.attr = attr
+        self._slot = -1
+
+    def _signature(self) -> Any:
+        return self.__class__, self.repr, self.dtype, id(self.logic_group), self.attr
+
+    def _freeze(self) -> None:
+        super()._freeze()
+        if isinstance(self.logic_group, (LogicMapping, LogicRecord)):
+            self._slot = self.logic_group._slot_of(self.attr)
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        return frozenset((self.attr,))
 
     def _eval(self, enforce_dtype: bool) -> Any:
-        if isinstance(self.logic_group, LogicMapping):
+        bound = LGM._bound(self.logic_group)
+        if bound is not None:
+            return bound[self.attr]
+        elif self._slot >= 0:
+            return self.logic_group._get_slot(self._slot)
+        elif isinstance(self.logic_group, (LogicMapping, LogicRecord)):
             return self.logic_group._get(self.attr)
         else:
             if self.attr in self.logic_group.contexts:
@@ -254,16 +420,39 @@ class AttrNestedExpression(ContextLogicExpression):
             expression=self.eval if expression is None else expression,
             logic_group=logic_group,
             dtype=dtype,
-            repr=f'{self.logic_group.name}.{".".join(attrs)}' if repr is None else repr
+            repr=repr or '<unresolved>'
         )
+        if repr is None:
+            # the logic group is only resolved by the base class
+            self.repr = f'{self.logic_group.name}.{".".join(attrs)}'
 
         self.attrs = attrs
+        self._slot = -1
 
-    def _eval(self, enforce_dtype: bool) -> Any:
+    def _signature(self) -> Any:
+        return self.__class__, self.repr, self.dtype, id(self.logic_group), tuple(self.attrs)
+
+    def _freeze(self) -> None:
+        super()._freeze()
         if isinstance(self.logic_group, LogicMapping):
-            mapping = self.logic_group.data
-        else:
-            mapping = self.logic_group.contexts
+            self._slot = self.logic_group._slot_of(self.attrs[0])
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        return frozenset((self.attrs[0],))
+
+    def _eval(self, enforce_dtype: bool) -> Any:
+        mapping = LGM._bound(self.logic_group)
+        if mapping is None and self._slot >= 0:
+            # the top-level key is resolved to its slot, only the nested keys are looked up
+            mapping = self.logic_group._get_slot(self._slot)
+            for attr in self.attrs[1:]:
+                mapping = mapping[attr]
+            return mapping
+        elif mapping is None:
+            if isinstance(self.logic_group, LogicMapping):
+                mapping = self.logic_group.data
+            else:
+                mapping = self.logic_group.contexts
 
         for attr in self.attrs:
             mapping = mapping[attr]
@@ -393,6 +582,25 @@ class MathExpression(ContextLogicExpression):
             return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)})'
         return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)}, {ContextLogicExpression.c_safe_alias(self.right)})'
 
+    def _signature(self) -> Any:
+        return (
+            self.__class__, self.repr, self.dtype, id(self.logic_group),
+            self.op_name, LogicNode._value_signature(self.op_func),
+            LogicNode._value_signature(self.left), LogicNode._value_signature(self.right)
+        )
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        return self._operand_dependencies(self.left, self.right)
+
+    def _freeze(self) -> None:
+        super()._freeze()
+        self._freeze_operand(self.left)
+        self._freeze_operand(self.right)
+
+    def _collect_pending(self, pending: list) -> None:
+        self._collect_operand(self.left, pending)
+        self._collect_operand(self.right, pending)
+
     def _eval(self, enforce_dtype: bool) -> Any:
         left_val = self._safe_eval(self.left)
         if self.right is NO_DEFAULT:
@@ -453,6 +661,25 @@ class ComparisonExpression(ContextLogicExpression):
             return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)})'
         return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)}, {ContextLogicExpression.c_safe_alias(self.right)})'
 
+    def _signature(self) -> Any:
+        return (
+            self.__class__, self.repr, self.dtype, id(self.logic_group),
+            self.op_name, LogicNode._value_signature(self.op_func),
+            LogicNode._value_signature(self.left), LogicNode._value_signature(self.right)
+        )
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        return self._operand_dependencies(self.left, self.right)
+
+    def _freeze(self) -> None:
+        super()._freeze()
+        self._freeze_operand(self.left)
+        self._freeze_operand(self.right)
+
+    def _collect_pending(self, pending: list) -> None:
+        self._collect_operand(self.left, pending)
+        self._collect_operand(self.right, pending)
+
     def _eval(self, enforce_dtype: bool) -> bool:
         left_val = self._safe_eval(self.left)
         if self.right is NO_DEFAULT:
@@ -513,6 +740,25 @@ class LogicalExpression(ContextLogicExpression):
             return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)})'
         return f'{self.op_repr}({ContextLogicExpression.c_safe_alias(self.left)}, {ContextLogicExpression.c_safe_alias(self.right)})'
 
+    def _signature(self) -> Any:
+        return (
+            self.__class__, self.repr, self.dtype, id(self.logic_group),
+            self.op_name, LogicNode._value_signature(self.op_func),
+            LogicNode._value_signature(self.left), LogicNode._value_signature(self.right)
+        )
+
+    def _resolve_dependencies(self) -> frozenset | None:
+        return self._operand_dependencies(self.left, self.right)
+
+    def _freeze(self) -> None:
+        super()._freeze()
+        self._freeze_operand(self.left)
+        self._freeze_operand(self.right)
+
+    def _collect_pending(self, pending: list) -> None:
+        self._collect_operand(self.left, pending)
+        self._collect_operand(self.right, pending)
+
     def _eval(self, enforce_dtype: bool) -> bool:
         left_val = self._safe_eval(self.left)
         if self.right is NO_DEFAULT:
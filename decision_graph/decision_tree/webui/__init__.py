@@ -12,7 +12,8 @@ def show(root: LogicNode, with_eval: bool = True, **kwargs):
     _app = DecisionTreeWebUi(
         host=kwargs.get('host', "127.0.0.1"),
         port=kwargs.get('port', 5000),
-        debug=kwargs.get('debug', False)
+        debug=kwargs.get('debug', False),
+        max_initial_nodes=kwargs.get('max_initial_nodes', 5000)
     )
     _app.show(
         node=root,
@@ -24,7 +25,8 @@ def watch(root: RootLogicNode, interval: float = .5, block: bool = False, **kwar
     _app = DecisionTreeWebUi(
         host=kwargs.get('host', "127.0.0.1"),
         port=kwargs.get('port', 5000),
-        debug=kwargs.get('debug', False)
+        debug=kwargs.get('debug', False),
+        max_initial_nodes=kwargs.get('max_initial_nodes', 5000)
     )
     _app.watch(
         node=root,
@@ -45,3 +47,5 @@ def set_logger(logger: logging.Logger):
     global LOGGER
     LOGGER = logger.getChild('WebUI')
     app.LOGGER = LOGGER
+    if 'server' in globals():
+        server.LOGGER = LOGGER
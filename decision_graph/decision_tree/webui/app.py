@@ -5,84 +5,324 @@ import queue
 import socket
 import threading
 import time
+import zlib
 from typing import Any
 
 from . import LOGGER
-from .. import LogicNode, ActionNode, BreakpointNode, TRUE_CONDITION, FALSE_CONDITION, ELSE_CONDITION, NO_CONDITION, RootLogicNode
+from .. import LGM, LogicNode, ActionNode, BreakpointNode, TRUE_CONDITION, FALSE_CONDITION, ELSE_CONDITION, NO_CONDITION, RootLogicNode
+
+
+class EvalPathBroadcaster(object):
+    """Publishes activation diffs of a RootLogicNode evaluation path to bounded per-client queues."""
+
+    def __init__(self, node: RootLogicNode, maxsize: int = 64):
+        """
+        Initializes the broadcaster. Call ``publish`` after each evaluation, e.g. as a listener of the root node.
+
+        Args:
+            node (RootLogicNode): The root node to watch.
+            maxsize (int): The capacity of each client queue. A client falling behind gets its queue
+                replaced by a single full snapshot instead of blocking the evaluation.
+        """
+        self.node = node
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._clients: list[queue.Queue] = []
+        self._uid_cache: dict[int, tuple[LogicNode, str]] = {}
+        self._uid_version = LGM.structure_version
+        self._last_path: list[LogicNode] = list(node.eval_path)
+        self._last_activated: set[str] = set(self._node_ids(self._last_path))
+
+    def _node_ids(self, path: list[LogicNode]) -> list[str]:
+        # uuid stringification is cached until the tree structure changes, the cached node guards against recycled ids
+        if self._uid_version != LGM.structure_version:
+            self._uid_cache.clear()
+            self._uid_version = LGM.structure_version
+        uid_cache = self._uid_cache
+        ids = []
+        for n in path:
+            entry = uid_cache.get(id(n))
+            if entry is None or entry[0] is not n:
+                entry = uid_cache[id(n)] = (n, str(n.uid))
+            ids.append(entry[1])
+        return ids
+
+    def _snapshot(self) -> str:
+        return json.dumps({'added': list(self._last_activated), 'removed': [], 'reset': True})
+
+    def _put(self, q: queue.Queue, message: str):
+        try:
+            q.put_nowait(message)
+        except queue.Full:
+            # The client is lagging, drop its backlog and let it resync from a full snapshot
+            while True:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
+            q.put_nowait(self._snapshot())
+
+    def publish(self, node: RootLogicNode = None):
+        """Compare the evaluation path against the last published one and fan out the diff, if any."""
+        if node is None:
+            node = self.node
+        path = list(node.eval_path)
+
+        # the comparison, the diff and the update are one step, so that concurrent publishers never diff a stale path
+        with self._lock:
+            last_path = self._last_path
+            if len(path) == len(last_path) and all(a is b for a, b in zip(path, last_path)):
+                return
+            activated = set(self._node_ids(path))
+            added = list(activated - self._last_activated)
+            removed = list(self._last_activated - activated)
+            self._last_path = path
+            self._last_activated = activated
+            if not (added or removed) or not self._clients:
+                return
+            message = json.dumps({'added': added, 'removed': removed})
+            for q in self._clients:
+                self._put(q, message)
+
+    def register(self) -> queue.Queue:
+        """Register a new client, its queue starts with a full snapshot of the current activation."""
+        q = queue.Queue(maxsize=self.maxsize)
+        with self._lock:
+            q.put_nowait(self._snapshot())
+            self._clients.append(q)
+        return q
+
+    def unregister(self, q: queue.Queue):
+        with self._lock:
+            if q in self._clients:
+                self._clients.remove(q)
+
+    @property
+    def n_clients(self) -> int:
+        return len(self._clients)
+
+    @property
+    def activated(self) -> list[str]:
+        """The ids of the nodes on the last published evaluation path."""
+        with self._lock:
+            return list(self._last_activated)
 
 
 class DecisionTreeWebUi(object):
-    """Class to manage the Flask web UI for visualizing LogicNode trees."""
+    """Class to manage the web UI for visualizing LogicNode trees."""
     _builtin_node_type = [
         'LogicNode', 'RootLogicNode', 'BreakpointNode',
         'ActionNode', 'NoAction', 'LongAction', 'ShortAction', 'CancelAction', 'ClearAction',
     ]
 
-    def __init__(self, host: str, port: int, debug: bool):
+    _layout_formats = ('json', 'columnar')
+    # Content-Encoding -> zlib wbits
+    _content_encodings = {'gzip': 31, 'deflate': 15}
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            debug: bool,
+            max_initial_nodes: int = 5000,
+            min_compress_size: int = 1024,
+            backend: str = 'auto'
+    ):
         """
         Initializes the web UI manager.
 
         Args:
-            host (str): The host address for the Flask server.
-            port (int): The port for the Flask server.
+            host (str): The host address for the web server.
+            port (int): The port for the web server.
             debug (bool): Whether to run Flask in debug mode.
+            max_initial_nodes (int): Upper bound of nodes embedded in the page. Larger trees are cut at the deepest
+                level fitting in this budget, the rest is loaded on demand from ``/api/subtree/<node_id>``.
+            min_compress_size (int): Responses smaller than this many bytes are sent uncompressed.
+            backend (str): ``'flask'``, ``'stdlib'`` or ``'auto'``. The stdlib backend serves the same routes with
+                ``http.server``, so that Flask is not required. ``'auto'`` uses Flask when it is installed.
         """
-        from flask import Flask
+        if backend not in ('auto', 'flask', 'stdlib'):
+            raise ValueError(f"Invalid backend {backend}, expect 'auto', 'flask' or 'stdlib'.")
+
+        Flask = None
+        if backend != 'stdlib':
+            try:
+                from flask import Flask
+            except ImportError:
+                if backend == 'flask':
+                    raise
+                LOGGER.info("Flask is not installed, serving the web UI with the stdlib http.server fallback.")
 
         self.host = host
         self.port = port
         self.debug = debug
-        self.app = Flask(__name__, template_folder='templates', static_folder='static')
+        self.max_initial_nodes = max_initial_nodes
+        self.min_compress_size = min_compress_size
+        self.app = None if Flask is None else Flask(__name__, template_folder='templates', static_folder='static')
+        self.server = None
         self.current_tree_data: dict[str, Any] | None = None
         self.current_tree_id: str | None = None
+        self.current_active_ids: list[str] | None = None
         self.node: LogicNode | None = None
+        self.tree_root: LogicNode | None = None
         self.with_eval = False
         self.with_watch = False
+        self.broadcaster: EvalPathBroadcaster | None = None
+        self.watch_interval = 0.5
+        # tree id -> layout entry of the current structure version, see ``_tree_entry``
+        self._tree_cache: dict[str, dict[str, Any]] = {}
 
-        self._setup_routes()
+        if self.app is not None:
+            self._setup_routes()
 
     def _setup_routes(self):
-        """Configures the Flask routes for the application."""
-        from flask import render_template, jsonify
+        """Configures the Flask routes for the application, the handlers are shared with the stdlib backend."""
+        from flask import render_template, request, Response, stream_with_context
+
+        def respond(result: tuple[int, bytes, dict[str, str]]):
+            status, body, headers = result
+            return Response(body, status=status, headers=headers)
 
         @self.app.route('/')
         def index():
-            if self.current_tree_data is None:
-                return render_template(
-                    'index.html',
-                    initial_tree_data={},
-                    tree_id="empty",
-                    with_eval=self.with_eval,
-                    with_watch=False
-                )
-            else:
-                return render_template(
-                    'index.html',
-                    initial_tree_data=self.current_tree_data,
-                    tree_id=self.current_tree_id,
-                    with_eval=self.with_eval,
-                    with_watch=self.with_watch
-                )
+            return render_template('index.html', **self._index_context())
 
         @self.app.route('/api/tree_data')
         def get_tree_data():
-            if self.current_tree_data is None:
-                return jsonify({"error": "No tree data available"}), 404
-            return jsonify({"tree_data": self.current_tree_data, "tree_id": self.current_tree_id})
+            return respond(self._api_tree_data(request.args.get('format', 'json'), request.headers.get('Accept-Encoding', '')))
+
+        @self.app.route('/api/subtree/<node_id>')
+        def get_subtree(node_id: str):
+            depth = request.args.get('depth', default=1, type=int)
+            return respond(self._api_subtree(node_id, request.args.get('format', 'json'), depth))
 
         @self.app.route('/api/active_nodes')
         def get_active_nodes():
-            # Returns the current set of active node IDs as JSON
-            if self.node is not None:
+            return respond(self._api_active_nodes())
+
+        @self.app.route('/watch')
+        def sse_watch():
+            if self.broadcaster is None:
+                return respond(self._json_result({"error": "Not watching any tree"}, 404))
+            return Response(stream_with_context(self._watch_stream()), mimetype='text/event-stream')
+
+        @self.app.after_request
+        def compress_response(response):
+            # Static files and SSE streams are passed through, /api/tree_data compresses on its own.
+            if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+                return response
+            _, body, headers = self._compress(response.status_code, response.get_data(), {}, request.headers.get('Accept-Encoding', ''))
+            if 'Content-Encoding' in headers:
+                response.set_data(body)
+                response.headers['Content-Encoding'] = headers['Content-Encoding']
+                response.vary.add('Accept-Encoding')
+            return response
+
+    @classmethod
+    def _json_result(cls, obj: Any, status: int = 200) -> tuple[int, bytes, dict[str, str]]:
+        return status, json.dumps(obj).encode('utf-8'), {'Content-Type': 'application/json'}
+
+    def _index_context(self) -> dict[str, Any]:
+        """The variables of the ``index.html`` template."""
+        if self.tree_root is None:
+            return dict(initial_tree_json='{}', active_ids=None, tree_id="empty", with_eval=self.with_eval, with_watch=False)
+        return dict(
+            initial_tree_json=self._load_tree(self.tree_root).decode('utf-8'),
+            active_ids=self._active_ids(),
+            tree_id=self.current_tree_id,
+            with_eval=self.with_eval,
+            with_watch=self.with_watch
+        )
+
+    def _api_tree_data(self, layout_format: str, accept_encoding: str = '') -> tuple[int, bytes, dict[str, str]]:
+        if self.tree_root is None:
+            return self._json_result({"error": "No tree data available"}, 404)
+        if layout_format not in self._layout_formats:
+            return self._json_result({"error": f"Unknown format {layout_format}"}, 400)
+
+        # The cached layout bytes are spliced in as-is, only the activation is encoded per request.
+        entry = self._tree_entry(self.tree_root)
+        head = b''.join((
+            b'{"tree_data":', self._load_tree(self.tree_root, layout_format),
+            b',"tree_id":', json.dumps(self.current_tree_id).encode('utf-8'),
+        ))
+        tail = b''.join((b',"active_ids":', json.dumps(self._active_ids()).encode('utf-8'), b'}'))
+
+        encoding = self._accepted_encoding(accept_encoding)
+        if encoding is None or len(head) + len(tail) < self.min_compress_size:
+            return 200, head + tail, {'Content-Type': 'application/json'}
+
+        # The compressor state after the cached head is kept, each request only compresses the short tail.
+        key = (layout_format, encoding)
+        state = entry['compressed'].get(key)
+        if state is None:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, self._content_encodings[encoding])
+            state = entry['compressed'][key] = (compressor.compress(head) + compressor.flush(zlib.Z_SYNC_FLUSH), compressor)
+        compressed_head, compressor = state
+        compressor = compressor.copy()
+        body = compressed_head + compressor.compress(tail) + compressor.flush()
+        return 200, body, {'Content-Type': 'application/json', 'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'}
+
+    def _api_subtree(self, node_id: str, layout_format: str, depth: int | None = 1) -> tuple[int, bytes, dict[str, str]]:
+        if self.tree_root is None:
+            return self._json_result({"error": "No tree data available"}, 404)
+        if layout_format not in self._layout_formats:
+            return self._json_result({"error": f"Unknown format {layout_format}"}, 400)
+        node = self._tree_entry(self.tree_root)['index'].get(node_id)
+        if node is None:
+            return self._json_result({"error": f"Node {node_id} not found"}, 404)
+        tree_data = self._convert_tree_to_d3_format(node, max_depth=max(1 if depth is None else depth, 0))
+        payload = self._encode_columnar(tree_data) if layout_format == 'columnar' else self._encode_tree(tree_data)
+        return 200, b''.join((b'{"tree_data":', payload, b'}')), {'Content-Type': 'application/json'}
+
+    def _api_active_nodes(self) -> tuple[int, bytes, dict[str, str]]:
+        # Returns the current set of active node IDs as JSON
+        if self.node is not None:
+            try:
+                if isinstance(self.node, RootLogicNode):
+                    active_ids = [str(n.uid) for n in self.node.eval_path]
+                else:
+                    active_ids = [str(n.uid) for n in self.node.eval_recursively()[1]]
+                return self._json_result({'active_ids': active_ids})
+            except Exception:
+                LOGGER.error("Error getting active nodes", exc_info=True)
+        return self._json_result({'active_ids': []})
+
+    def _watch_stream(self):
+        """Yields the SSE messages of a new watch client, until the consumer closes the generator."""
+        broadcaster = self.broadcaster
+        q = broadcaster.register()
+        try:
+            while True:
                 try:
-                    if isinstance(self.node, RootLogicNode):
-                        active_ids = [str(n.uid) for n in self.node.eval_path]
-                    else:
-                        active_ids = [str(n.uid) for n in self.node.eval_recursively()[1]]
-                    return jsonify({'active_ids': active_ids})
-                except Exception:
-                    LOGGER.error("Error getting active nodes", exc_info=True)
-            return jsonify({'active_ids': []})
+                    diff = q.get(timeout=self.watch_interval)
+                except queue.Empty:
+                    # SSE comment, ignored by the client, lets the server notice closed connections
+                    yield ": keep-alive\n\n"
+                    continue
+                LOGGER.debug("Watching %s", diff)
+                yield f"data: {diff}\n\n"
+        finally:
+            broadcaster.unregister(q)
+
+    def _compress(self, status: int, body: bytes, headers: dict[str, str], accept_encoding: str) -> tuple[int, bytes, dict[str, str]]:
+        encoding = self._accepted_encoding(accept_encoding)
+        if encoding is None or len(body) < self.min_compress_size:
+            return status, body, headers
+        compressor = zlib.compressobj(6, zlib.DEFLATED, self._content_encodings[encoding])
+        return status, compressor.compress(body) + compressor.flush(), {**headers, 'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'}
+
+    @classmethod
+    def _condition_type(cls, condition) -> str:
+        if condition == TRUE_CONDITION:
+            return "true"
+        elif condition == FALSE_CONDITION:
+            return "false"
+        elif condition == ELSE_CONDITION:
+            return "else"
+        elif condition == NO_CONDITION:
+            return "unconditional"
+        return "other"
 
     @classmethod
     def _convert_node_to_dict(
@@ -90,49 +330,76 @@ class DecisionTreeWebUi(object):
             node: LogicNode,
             visited_nodes: dict[str, dict[str, Any]],
             virtual_parent_links: list[dict[str, Any]],
-            activated_node_ids: set = None
+            activated_node_ids: set = None,
+            max_depth: int = None
     ) -> dict[str, Any]:
-        """Recursively converts a LogicNode tree into a dictionary format suitable for JSON/D3."""
-        node_id = str(node.uid)
-        if node_id in visited_nodes:
-            return {"id": node_id, "is_reference": True}
-
-        node_type = node.__class__.__name__
-        if node_type not in cls._builtin_node_type:
-            if isinstance(node, ActionNode):
-                node_type = "ActionNode"
-            else:
-                node_type = "LogicNode"
-
-        # Determine if node is activated (only if activated_node_ids is provided)
-        is_activated = activated_node_ids is None or node_id in activated_node_ids
-
-        node_obj: dict[str, Any] = {
-            "id": node_id,
-            "name": node.repr,
-            "repr": repr(node),
-            "type": node_type,
-            "labels": node.labels,
-            "autogen": node.autogen,
-            "_children": [],
-            "activated": is_activated
-        }
-
-        visited_nodes[node_id] = node_obj
+        """
+        Converts a LogicNode tree into a dictionary format suitable for JSON/D3.
+        The tree is walked depth-first with an explicit stack, so deep trees are not bounded by the recursion limit.
+        Nodes at ``max_depth`` are emitted without their children and flagged with ``has_more``.
+        """
+        root_obj = None
+        # Stack entries are (node, depth, parent_obj, condition_to_child, condition_type), pushed in reversed order
+        # so that children are visited in the same pre-order as their registration.
+        stack = [(node, 0, None, None, None)]
+
+        while stack:
+            node, depth, parent_obj, condition_to_child, condition_type = stack.pop()
+            node_id = str(node.uid)
+
+            if node_id in visited_nodes:
+                # A deduplicated subtree shared by several parents, it is drawn once and linked from the others.
+                virtual_parent_links.append(
+                    {
+                        "source": parent_obj["id"],
+                        "target": node_id,
+                        "type": "shared_child"
+                    }
+                )
+                continue
 
-        # Process children
-        if node_type == 'BreakpointNode':
-            # For BreakpointNode, should not scan its only child, but just add to virtual_parent_links
-            node: BreakpointNode
-            child_node = node.linked_to
-            if child_node is not None:
-                condition_type = "unconditional"
+            node_type = node.__class__.__name__
+            if node_type not in cls._builtin_node_type:
+                if isinstance(node, ActionNode):
+                    node_type = "ActionNode"
+                else:
+                    node_type = "LogicNode"
+
+            # Determine if node is activated (only if activated_node_ids is provided)
+            is_activated = activated_node_ids is None or node_id in activated_node_ids
+
+            node_obj: dict[str, Any] = {
+                "id": node_id,
+                "name": node.repr,
+                "repr": repr(node),
+                "type": node_type,
+                "labels": node.labels,
+                "autogen": node.autogen,
+                "_children": [],
+                "activated": is_activated
+            }
+
+            visited_nodes[node_id] = node_obj
+
+            if parent_obj is None:
+                root_obj = node_obj
+            else:
+                node_obj['condition_to_child'] = condition_to_child
+                node_obj['condition_type'] = condition_type
+                parent_obj["_children"].append(node_obj)
+
+            # Process children
+            if node_type == 'BreakpointNode':
+                # For BreakpointNode, should not scan its only child, but just add to virtual_parent_links
+                node: BreakpointNode
+                child_node = node.linked_to
+                if child_node is None:
+                    continue
                 if child_node.parent is node:
-                    child_dict = cls._convert_node_to_dict(child_node, visited_nodes, virtual_parent_links, activated_node_ids)
-                    child_with_condition = child_dict.copy()
-                    child_with_condition['condition_to_child'] = "unconditional"
-                    child_with_condition['condition_type'] = condition_type
-                    node_obj["_children"].append(child_with_condition)
+                    if depth == max_depth:
+                        node_obj["has_more"] = True
+                        continue
+                    stack.append((child_node, depth + 1, node_obj, "unconditional", "unconditional"))
                 else:
                     virtual_parent_links.append(
                         {
@@ -141,39 +408,226 @@ class DecisionTreeWebUi(object):
                             "type": "virtual_parent"
                         }
                     )
-        else:
-            for condition, child_node in node.children.items():
-                if condition == TRUE_CONDITION:
-                    condition_type = "true"
-                elif condition == FALSE_CONDITION:
-                    condition_type = "false"
-                elif condition == ELSE_CONDITION:
-                    condition_type = "else"
-                elif condition == NO_CONDITION:
-                    condition_type = "unconditional"
-                else:
-                    condition_type = "other"
-
-                child_dict = cls._convert_node_to_dict(child_node, visited_nodes, virtual_parent_links, activated_node_ids)
-                child_with_condition = child_dict.copy()
-                child_with_condition['condition_to_child'] = f'<{str(condition)}>' if condition is not None else "<Unknown>"
-                child_with_condition['condition_type'] = condition_type
-                node_obj["_children"].append(child_with_condition)
-        return node_obj
+            elif depth == max_depth:
+                if node.children:
+                    node_obj["has_more"] = True
+            else:
+                for condition, child_node in reversed(node.children.items()):
+                    stack.append(
+                        (
+                            child_node,
+                            depth + 1,
+                            node_obj,
+                            f'<{str(condition)}>' if condition is not None else "<Unknown>",
+                            cls._condition_type(condition)
+                        )
+                    )
+        return root_obj
 
     @classmethod
-    def _convert_tree_to_d3_format(cls, root_node: LogicNode, activated_node_ids: set = None) -> dict[str, Any]:
+    def _convert_tree_to_d3_format(cls, root_node: LogicNode, activated_node_ids: set = None, max_depth: int = None) -> dict[str, Any]:
         """Converts the LogicNode tree into a D3 hierarchical format."""
         visited_nodes = {}
         virtual_parent_links = []
 
-        root_dict = cls._convert_node_to_dict(root_node, visited_nodes, virtual_parent_links, activated_node_ids)
+        root_dict = cls._convert_node_to_dict(root_node, visited_nodes, virtual_parent_links, activated_node_ids, max_depth)
 
         return {
             "root": root_dict,
             "virtual_links": virtual_parent_links
         }
 
+    @classmethod
+    def _encode_tree(cls, tree_data: dict[str, Any]) -> bytes:
+        """
+        Encodes a D3 layout into compact JSON bytes.
+        Nodes are encoded one at a time with an explicit stack, as ``json.dumps`` recurses once per nesting level.
+        """
+        encode = json.JSONEncoder(separators=(',', ':')).encode
+        chunks = ['{"root":']
+        # Stack items are either node dicts to encode, or literal JSON fragments closing/separating them.
+        stack = [tree_data["root"]]
+
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                chunks.append(item)
+                continue
+            children = item["_children"]
+            fields = encode({key: value for key, value in item.items() if key != "_children"})
+            chunks.append(fields[:-1])
+            chunks.append(',"_children":[')
+            stack.append(']}')
+            for i in range(len(children) - 1, -1, -1):
+                stack.append(children[i])
+                if i:
+                    stack.append(',')
+
+        chunks.append(',"virtual_links":')
+        chunks.append(encode(tree_data["virtual_links"]))
+        chunks.append('}')
+        return ''.join(chunks).encode('utf-8')
+
+    @classmethod
+    def _encode_columnar(cls, tree_data: dict[str, Any]) -> bytes:
+        """
+        Encodes a D3 layout into a compact columnar JSON document.
+        Nodes are numbered in pre-order and stored as parallel arrays. Parents and link endpoints are referenced by
+        number, the repeated node types, labels, edge conditions and link types are interned into tables.
+        Link endpoints outside the layout are appended to ``ids`` after the nodes.
+        """
+        ids, parent, name, repr_, type_, labels, autogen, condition = [], [], [], [], [], [], [], []
+        inactive, has_more = [], []
+        number: dict[str, int] = {}
+        types: dict[str, int] = {}
+        label_sets: dict[tuple, int] = {}
+        conditions: dict[tuple[str, str], int] = {}
+        link_types: dict[str, int] = {}
+
+        def intern(table: dict, value) -> int:
+            i = table.get(value)
+            if i is None:
+                i = table[value] = len(table)
+            return i
+
+        stack = [(tree_data["root"], -1)]
+        while stack:
+            node_obj, parent_number = stack.pop()
+            i = number[node_obj["id"]] = len(ids)
+            ids.append(node_obj["id"])
+            parent.append(parent_number)
+            name.append(node_obj["name"])
+            repr_.append(node_obj["repr"])
+            type_.append(intern(types, node_obj["type"]))
+            labels.append(intern(label_sets, tuple(node_obj["labels"] or ())))
+            autogen.append(1 if node_obj["autogen"] else 0)
+            if "condition_to_child" in node_obj:
+                condition.append(intern(conditions, (node_obj["condition_to_child"], node_obj["condition_type"])))
+            else:
+                condition.append(-1)
+            if not node_obj["activated"]:
+                inactive.append(i)
+            if node_obj.get("has_more"):
+                has_more.append(i)
+            for child_obj in reversed(node_obj["_children"]):
+                stack.append((child_obj, i))
+
+        links = {"source": [], "target": [], "type": []}
+        for link in tree_data["virtual_links"]:
+            for end in ("source", "target"):
+                node_id = link[end]
+                i = number.get(node_id)
+                if i is None:
+                    i = number[node_id] = len(ids)
+                    ids.append(node_id)
+                links[end].append(i)
+            links["type"].append(intern(link_types, link["type"]))
+
+        document = {
+            "format": "columnar",
+            "ids": ids,
+            "parent": parent,
+            "name": name,
+            "repr": repr_,
+            "type": type_,
+            "labels": labels,
+            "autogen": autogen,
+            "condition": condition,
+            "inactive": inactive,
+            "has_more": has_more,
+            "links": links,
+            "types": list(types),
+            "label_sets": [list(label_set) for label_set in label_sets],
+            "conditions": [list(c) for c in conditions],
+            "link_types": list(link_types),
+        }
+        return json.dumps(document, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def _index_tree(cls, root_node: LogicNode) -> tuple[dict[str, LogicNode], list[int]]:
+        """Indexes the nodes of a tree by id, breadth-first. Also returns the number of nodes on each level."""
+        index = {str(root_node.uid): root_node}
+        level_sizes = []
+        level = [root_node]
+
+        while level:
+            level_sizes.append(len(level))
+            next_level = []
+            for node in level:
+                if isinstance(node, BreakpointNode):
+                    child_node = node.linked_to
+                    children = () if child_node is None or child_node.parent is not node else (child_node,)
+                else:
+                    children = node.children.values()
+                for child_node in children:
+                    child_id = str(child_node.uid)
+                    if child_id not in index:
+                        index[child_id] = child_node
+                        next_level.append(child_node)
+            level = next_level
+        return index, level_sizes
+
+    def _tree_entry(self, node: LogicNode) -> dict[str, Any]:
+        """
+        Returns the cached layout entry of the tree, without activation.
+        The entry is only rebuilt when ``LGM.structure_version`` changed since it was created.
+        Trees larger than ``max_initial_nodes`` are cut at the deepest level fitting in the budget.
+        """
+        tree_id = str(node.uid)
+        version = LGM.structure_version
+        entry = self._tree_cache.get(tree_id)
+        if entry is None or entry['version'] != version:
+            index, level_sizes = self._index_tree(node)
+            max_depth = None
+            if len(index) > self.max_initial_nodes:
+                max_depth, n_nodes = 0, level_sizes[0]
+                while n_nodes + level_sizes[max_depth + 1] <= self.max_initial_nodes:
+                    max_depth += 1
+                    n_nodes += level_sizes[max_depth]
+            entry = self._tree_cache[tree_id] = {
+                'version': version,
+                'index': index,
+                'max_depth': max_depth,
+                'tree_data': self._convert_tree_to_d3_format(node, max_depth=max_depth),
+                'encoded': {},  # layout format -> bytes
+                'compressed': {},  # (layout format, content encoding) -> (compressed head, compressor state)
+            }
+        self.current_tree_data = entry['tree_data']
+        self.current_tree_id = tree_id
+        return entry
+
+    def _load_tree(self, node: LogicNode, layout_format: str = 'json') -> bytes:
+        """Returns the pre-encoded D3 layout of the tree, each format is encoded once per structure version."""
+        entry = self._tree_entry(node)
+        payload = entry['encoded'].get(layout_format)
+        if payload is None:
+            encoder = self._encode_columnar if layout_format == 'columnar' else self._encode_tree
+            payload = entry['encoded'][layout_format] = encoder(entry['tree_data'])
+        return payload
+
+    def _accepted_encoding(self, accept_encoding: str) -> str | None:
+        """Picks the first supported content encoding with a non-zero quality in an ``Accept-Encoding`` header."""
+        accepted = {}
+        for part in accept_encoding.split(','):
+            coding, _, params = part.partition(';')
+            quality = 1.
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.
+            accepted[coding.strip().lower()] = quality
+        for encoding in self._content_encodings:
+            if accepted.get(encoding, 0.) > 0:
+                return encoding
+        return None
+
+    def _active_ids(self) -> list[str] | None:
+        if self.broadcaster is not None:
+            return self.broadcaster.activated
+        return self.current_active_ids
+
     def _port_is_free(self, port: int) -> bool:
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -215,88 +669,73 @@ class DecisionTreeWebUi(object):
         browser_thread.start()
 
     def show(self, node: LogicNode, with_eval: bool = True):
-        """Starts the Flask web UI to visualize a LogicNode tree."""
+        """Starts the web UI to visualize a LogicNode tree."""
         if not isinstance(node, LogicNode):
             raise TypeError("The 'node' argument must be an instance of LogicNode or its subclass.")
 
         LOGGER.info(f"Preparing to visualize LogicNode tree starting at {node}")
 
-        activated_node_ids = None if not with_eval \
-            else {str(n.uid) for n in node.eval_path} if isinstance(node, RootLogicNode) \
-            else {str(n.uid) for n in node.eval_recursively()[1]}
+        self.current_active_ids = None if not with_eval \
+            else [str(n.uid) for n in node.eval_path] if isinstance(node, RootLogicNode) \
+            else [str(n.uid) for n in node.eval_recursively()[1]]
         self.with_eval = with_eval
-        self.current_tree_data = self._convert_tree_to_d3_format(node, activated_node_ids)
-        self.current_tree_id = str(node.uid)
+        self.tree_root = node
+        self._load_tree(node)
         self.with_watch = False
 
         port_to_use = self._auto_port()
         url = f"http://{self.host}:{port_to_use}"
         self._open_browser(url)
-        LOGGER.info(f"Starting Flask server on {url} (with_eval={with_eval})")
-        self.app.run(host=self.host, port=port_to_use, debug=self.debug, use_reloader=False, threaded=True)
+        LOGGER.info(f"Starting web UI server on {url} (with_eval={with_eval})")
+        self._serve(port_to_use, block=True)
 
     def watch(self, node: RootLogicNode, interval: float = 0.5, block: bool = False):
         """
         Starts a watch server that streams activation diffs via SSE.
-        Each client connection gets its own worker and queue, so multiple tabs/windows do not interfere.
-        If block is False, runs Flask in a background thread and returns immediately.
+        The evaluations of the root node publish path changes to a single broadcaster, which fans them out to a
+        bounded queue per client connection, so multiple tabs/windows do not interfere. No work is done between
+        evaluations, ``interval`` bounds how long a client stream blocks before sending a keep-alive, so that
+        disconnected clients are noticed.
+        The tree layout is encoded once per structure version, page loads only add the current activation to it.
+        If block is False, runs the server in a background thread and returns immediately.
         """
-        from flask import Response, stream_with_context
-        last_activated = set(str(n.uid) for n in node.eval_path)
-        self.current_tree_data = self._convert_tree_to_d3_format(node, last_activated)
-        self.current_tree_id = str(node.uid)
+        if self.broadcaster is not None:
+            # a previously watched root stops publishing to the replaced broadcaster
+            self.broadcaster.node.remove_listener(self.broadcaster.publish)
+        broadcaster = EvalPathBroadcaster(node)
+        node.add_listener(broadcaster.publish)
+        self.tree_root = node
+        self._load_tree(node)
         self.with_eval = True
         self.with_watch = True
         self.node = node
-
-        @self.app.route('/watch')
-        def sse_watch():
-            q = queue.Queue()
-            stop_event = threading.Event()
-
-            def worker():
-                nonlocal last_activated
-                while not stop_event.is_set():
-                    activated_now = set(str(n.uid) for n in node.eval_path)
-                    added = list(activated_now - last_activated)
-                    removed = list(last_activated - activated_now)
-                    if added or removed:
-                        q.put(json.dumps({'added': added, 'removed': removed}))
-                        last_activated = activated_now
-                    time.sleep(interval)
-
-            t = threading.Thread(target=worker)
-            t.daemon = True
-            t.start()
-
-            def event_stream():
-                try:
-                    while True:
-                        try:
-                            diff = q.get(timeout=interval)
-                        except queue.Empty:
-                            continue
-                        LOGGER.info(f"Watching {diff}")
-                        yield f"data: {diff}\n\n"
-                except GeneratorExit:
-                    stop_event.set()
-
-            return Response(stream_with_context(event_stream()), mimetype='text/event-stream')
+        self.broadcaster = broadcaster
+        self.watch_interval = interval
 
         port_to_use = self._auto_port()
         url = f"http://{self.host}:{port_to_use}"
         self._open_browser(url)
         LOGGER.info(f"Starting SSE watch server on port {port_to_use}")
-        if block:
-            self.app.run(host=self.host, port=port_to_use, debug=self.debug, use_reloader=False, threaded=True)
+        return self._serve(port_to_use, block=block)
+
+    def _serve(self, port: int, block: bool = True) -> threading.Thread | None:
+        """Runs the web server, with Flask when available, otherwise with the stdlib fallback server."""
+        if self.app is not None:
+            def run():
+                self.app.run(host=self.host, port=port, debug=self.debug, use_reloader=False, threaded=True)
         else:
-            def run_flask():
-                self.app.run(host=self.host, port=port_to_use, debug=self.debug, use_reloader=False, threaded=True)
+            from .server import WebUiHTTPServer
+            self.server = WebUiHTTPServer(self, (self.host, port))
+            run = self.server.serve_forever
+
+        if block:
+            run()
+            return None
 
-            flask_thread = threading.Thread(target=run_flask)
-            flask_thread.daemon = True
-            flask_thread.start()
-            return flask_thread
+        server_thread = threading.Thread(target=run)
+        server_thread.daemon = True
+        server_thread.start()
+        return server_thread
 
     @classmethod
     def to_html(cls, node: LogicNode, file_name: str, with_eval: bool = True):
@@ -0,0 +1,155 @@
+import functools
+import json
+import mimetypes
+import pathlib
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from . import LOGGER
+
+MODULE_DIR = pathlib.Path(__file__).parent
+STATIC_DIR = MODULE_DIR / 'static'
+TEMPLATE_DIR = MODULE_DIR / 'templates'
+
+_TEMPLATE_EXPRESSION = re.compile(r'{{\s*(.*?)\s*}}')
+_URL_FOR_STATIC = re.compile(r"url_for\('static', filename='([^']+)'\)")
+
+
+# the escaping of markupsafe, which Jinja autoescaping and the ``e`` filter use
+_HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', "'": '&#39;', '"': '&#34;'})
+# the escaping of the Jinja ``tojson`` filter, safe to embed in html
+_JSON_ESCAPES = str.maketrans({'<': '\\u003c', '>': '\\u003e', '&': '\\u0026', "'": '\\u0027'})
+
+
+@functools.cache
+def _index_template() -> str:
+    with open(TEMPLATE_DIR / 'index.html', 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@functools.cache
+def _jinja_environment():
+    # None if Jinja is not installed
+    try:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+    except ImportError:
+        return None
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(['html']))
+    env.globals['url_for'] = lambda endpoint, filename: f'/{endpoint}/{filename}'
+    return env
+
+
+def _render_index_stdlib(context: dict[str, Any]) -> str:
+    """Renders ``index.html`` by substituting the few expressions the template uses, as Jinja would render them."""
+    values = {
+        'tree_id': str(context['tree_id']).translate(_HTML_ESCAPES),
+        'initial_tree_json | e': context['initial_tree_json'].translate(_HTML_ESCAPES),
+        'active_ids | tojson | e': json.dumps(context['active_ids'], sort_keys=True).translate(_JSON_ESCAPES),
+        "'true' if with_eval else 'false'": 'true' if context['with_eval'] else 'false',
+        "'true' if with_watch else 'false'": 'true' if context['with_watch'] else 'false',
+    }
+
+    def substitute(match: re.Match) -> str:
+        expression = match.group(1)
+        url = _URL_FOR_STATIC.fullmatch(expression)
+        if url is not None:
+            return f'/static/{url.group(1)}'
+        if expression not in values:
+            raise KeyError(f'Template expression {expression!r} of index.html has no rendering without Jinja.')
+        return values[expression]
+
+    return _TEMPLATE_EXPRESSION.sub(substitute, _index_template())
+
+
+def render_index(context: dict[str, Any]) -> str:
+    """Renders ``index.html`` with Jinja when it is installed, otherwise with ``_render_index_stdlib``."""
+    env = _jinja_environment()
+    if env is None:
+        return _render_index_stdlib(context)
+    return env.get_template('index.html').render(**context)
+
+
+class WebUiRequestHandler(BaseHTTPRequestHandler):
+    """Serves the routes of ``DecisionTreeWebUi`` with the standard library only."""
+    server: 'WebUiHTTPServer'
+
+    def do_GET(self):
+        ui = self.server.ui
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        path = unquote(url.path)
+        accept_encoding = self.headers.get('Accept-Encoding', '')
+        layout_format = query.get('format', ['json'])[0]
+
+        if path == '/':
+            body = render_index(ui._index_context()).encode('utf-8')
+            self._send(*ui._compress(200, body, {'Content-Type': 'text/html; charset=utf-8'}, accept_encoding))
+        elif path == '/api/tree_data':
+            self._send(*ui._api_tree_data(layout_format, accept_encoding))
+        elif path.startswith('/api/subtree/'):
+            try:
+                depth = int(query.get('depth', ['1'])[0])
+            except ValueError:
+                depth = 1
+            result = ui._api_subtree(path[len('/api/subtree/'):], layout_format, depth)
+            self._send(*ui._compress(*result, accept_encoding))
+        elif path == '/api/active_nodes':
+            self._send(*ui._api_active_nodes())
+        elif path == '/watch':
+            self._stream_watch()
+        elif path.startswith('/static/'):
+            self._send_static(path[len('/static/'):])
+        else:
+            self._send(*ui._json_result({"error": f"{path} not found"}, 404))
+
+    def _send(self, status: int, body: bytes, headers: dict[str, str]):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_static(self, name: str):
+        static_dir = STATIC_DIR.resolve()
+        file_path = (static_dir / name).resolve()
+        if file_path.parent != static_dir or not file_path.is_file():
+            self._send(*self.server.ui._json_result({"error": f"{name} not found"}, 404))
+            return
+        content_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+        self._send(200, file_path.read_bytes(), {'Content-Type': content_type})
+
+    def _stream_watch(self):
+        ui = self.server.ui
+        if ui.broadcaster is None:
+            self._send(*ui._json_result({"error": "Not watching any tree"}, 404))
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        stream = ui._watch_stream()
+        try:
+            for message in stream:
+                self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            stream.close()
+
+    def log_message(self, format: str, *args):
+        LOGGER.debug("%s - " + format, self.address_string(), *args)
+
+
+class WebUiHTTPServer(ThreadingHTTPServer):
+    """Flask-free fallback server of the web UI, each connection is handled in its own daemon thread."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, ui, server_address: tuple[str, int]):
+        self.ui = ui
+        super().__init__(server_address, WebUiRequestHandler)
@@ -3,6 +3,8 @@ let GLOBAL_TREE_DATA = null;
 let GLOBAL_SELECTED_GROUP = "*";
 let GLOBAL_VIRTUAL_LINK_DEFS = [];
 let LAST_ACTIVE_IDS = [];
+let HAS_ACTIVATION = false;
+const SUBTREE_DEPTH = 2;
 
 const ANIM_SLOW = 500;
 const ANIM_FAST = 120;
@@ -21,6 +23,12 @@ let nodeInfoCurrentNodeId = null;
 function visualizeTree(treeData) {
     GLOBAL_TREE_DATA = treeData;
     GLOBAL_VIRTUAL_LINK_DEFS = treeData.virtual_links || [];
+    if (Array.isArray(treeData.active_ids)) {
+        // The cached layout is served without activation, which is shipped as a separate list of ids.
+        markActivated(treeData.root, new Set(treeData.active_ids.map(String)));
+        LAST_ACTIVE_IDS = treeData.active_ids.slice();
+        HAS_ACTIVATION = true;
+    }
     if (typeof initTheme === 'function') initTheme();
 
     const allGroups = new Set();
@@ -333,7 +341,7 @@ function updateVisualization(root, g, virtualLinkDefs, nodeMap, animate = true)
 
     const nodeSelection = g.selectAll("g.node").data(nodes, d => d.data.id);
     const nodeEnter = nodeSelection.enter().append("g")
-        .attr("class", d => `node ${d.data.type}`)
+        .attr("class", d => `node ${d.data.type}${d.data.has_more ? " has-more" : ""}`)
         .attr("data-id", d => d.data.id)
         .attr("transform", d => `translate(${d.x0},${d.y0})`)
         .on("click", toggleChildren)
@@ -425,7 +433,7 @@ function updateVisualization(root, g, virtualLinkDefs, nodeMap, animate = true)
         .attr("fill", "none")
         .attr("stroke", d => d.type === "virtual_parent" ? "red" : "gray")
         .attr("stroke-width", 1)
-        .attr("stroke-dasharray", d => d.type === "virtual_parent" ? "5,5" : null)
+        .attr("stroke-dasharray", d => d.type === "virtual_parent" ? "5,5" : d.type === "shared_child" ? "2,3" : null)
         .attr("opacity", 0);
 
     const linkUpdate = linkSelection.merge(linkEnter);
@@ -515,10 +523,17 @@ function toggleChildren(event, d) {
     } else if (d._children) {
         d.children = d._children;
         d._children = null;
+    } else if (d.data.has_more) {
+        loadSubtree(d);
+        return;
     } else {
         return;
     }
 
+    redrawTree();
+}
+
+function redrawTree() {
     const container = d3.select("#tree-container");
     const g = container.select("svg").select("g.dg-viewport").select("g.dg-content");
     const nodeMap = new Map();
@@ -527,6 +542,90 @@ function toggleChildren(event, d) {
     updateVisualization(GLOBAL_TREE_ROOT, g, virtualLinkDefs, nodeMap, true);
 }
 
+function findDataNode(root, id) {
+    const stack = [root];
+    while (stack.length) {
+        const node = stack.pop();
+        if (!node) continue;
+        if (node.id === id) return node;
+        if (node._children && Array.isArray(node._children)) stack.push(...node._children);
+    }
+    return null;
+}
+
+function decodeColumnar(data) {
+    // Rebuilds the nested layout from the parallel arrays, nodes are numbered in pre-order.
+    const n = data.parent.length;
+    const nodes = new Array(n);
+    const inactive = new Set(data.inactive || []);
+    const hasMore = new Set(data.has_more || []);
+    for (let i = 0; i < n; i++) {
+        const node = {
+            id: data.ids[i],
+            name: data.name[i],
+            repr: data.repr[i],
+            type: data.types[data.type[i]],
+            labels: data.label_sets[data.labels[i]],
+            autogen: data.autogen[i] === 1,
+            _children: [],
+            activated: !inactive.has(i)
+        };
+        const c = data.condition[i];
+        if (c >= 0) {
+            node.condition_to_child = data.conditions[c][0];
+            node.condition_type = data.conditions[c][1];
+        }
+        if (hasMore.has(i)) node.has_more = true;
+        nodes[i] = node;
+        if (data.parent[i] >= 0) nodes[data.parent[i]]._children.push(node);
+    }
+    const links = data.links || {source: [], target: [], type: []};
+    const virtualLinks = links.source.map((source, k) => ({
+        source: data.ids[source], target: data.ids[links.target[k]], type: data.link_types[links.type[k]]
+    }));
+    return {root: nodes[0], virtual_links: virtualLinks};
+}
+
+function loadSubtree(d) {
+    // Huge trees are served cut at a bounded depth, the children of a cut node are fetched on demand.
+    fetch(`/api/subtree/${encodeURIComponent(d.data.id)}?depth=${SUBTREE_DEPTH}&format=columnar`)
+        .then(response => response.json())
+        .then(data => {
+            if (!data || !data.tree_data) return;
+            if (data.tree_data.format === 'columnar') data.tree_data = decodeColumnar(data.tree_data);
+            const loaded = data.tree_data.root;
+            if (HAS_ACTIVATION) markActivated(loaded, new Set(LAST_ACTIVE_IDS));
+
+            // Graft into the source data as well, so that re-rendering (e.g. switching groups) keeps the subtree.
+            const source = GLOBAL_TREE_DATA ? findDataNode(GLOBAL_TREE_DATA.root, d.data.id) : null;
+            [source, d.data].forEach(n => {
+                if (!n) return;
+                n._children = loaded._children;
+                delete n.has_more;
+            });
+            (data.tree_data.virtual_links || []).forEach(link => GLOBAL_VIRTUAL_LINK_DEFS.push(link));
+
+            const children = loaded._children.map(childData => {
+                const child = d3.hierarchy(childData, n => (n._children && n._children.length) ? n._children : null);
+                child.each(n => {
+                    n.depth += d.depth + 1;
+                    n.x0 = d.x;
+                    n.y0 = d.y;
+                });
+                child.parent = d;
+                return child;
+            });
+            d.children = children.length ? children : null;
+
+            d3.select(`g.node[data-id='${d.data.id}']`).classed("has-more", false);
+            updateTreeLayout(GLOBAL_TREE_ROOT);
+            redrawTree();
+        })
+        .catch(err => {
+            console.warn('Failed to load subtree:', err);
+        });
+}
+
 function showNodeInfo(event, d) {
     const info = d.data;
     d3.select("#info-id").text(info.id || "N/A");
@@ -794,25 +893,57 @@ function pollActiveNodes() {
         });
 }
 
-function setActiveIds(ids) {
-    if (!Array.isArray(ids)) return;
-    const idSet = new Set(ids.map(String));
+function subscribeActiveNodes() {
+    // The server pushes activation diffs on every evaluation that changed the path.
+    let stale = false;
+    const source = new EventSource('/watch');
+    source.onmessage = function (event) {
+        const watchToggle = document.getElementById('watch-toggle');
+        if (watchToggle && !watchToggle.checked) {
+            stale = true;
+            return;
+        }
+        const diff = JSON.parse(event.data);
+        if (diff.reset) {
+            setActiveIds(diff.added);
+            return;
+        }
+        applyActivationDiff(diff);
+        LAST_ACTIVE_IDS = LAST_ACTIVE_IDS.filter(id => !diff.removed.includes(id)).concat(diff.added);
+    };
 
-    // Update the underlying GLOBAL_TREE_DATA structure (if present)
-    function recurseUpdate(node) {
-        if (!node || !node.id) return;
+    document.addEventListener('change', function (e) {
+        if (e.target && e.target.id === 'watch-toggle' && e.target.checked && stale) {
+            stale = false;
+            pollActiveNodes();
+        }
+    });
+}
+
+function markActivated(root, idSet) {
+    // Walk with an explicit stack, deep trees would overflow the call stack.
+    const stack = [root];
+    while (stack.length) {
+        const node = stack.pop();
+        if (!node || !node.id) continue;
         if (idSet.has(String(node.id))) {
             // mark as active: remove explicit false flag
             if (node.hasOwnProperty('activated')) delete node.activated;
         } else {
             node.activated = false;
         }
-        if (node._children && Array.isArray(node._children)) node._children.forEach(recurseUpdate);
-        if (node.children && Array.isArray(node.children)) node.children.forEach(recurseUpdate);
+        if (node._children && Array.isArray(node._children)) stack.push(...node._children);
+        if (node.children && Array.isArray(node.children)) stack.push(...node.children);
     }
+}
 
+function setActiveIds(ids) {
+    if (!Array.isArray(ids)) return;
+    const idSet = new Set(ids.map(String));
+
+    // Update the underlying GLOBAL_TREE_DATA structure (if present)
     if (GLOBAL_TREE_DATA && GLOBAL_TREE_DATA.root) {
-        recurseUpdate(GLOBAL_TREE_DATA.root);
+        markActivated(GLOBAL_TREE_DATA.root, idSet);
     }
 
     // Update currently rendered nodes' bound data (d.data) so UI reflects change
@@ -935,7 +1066,11 @@ if (typeof window.with_watch !== 'undefined' && window.with_watch) {
         }
     });
 
-    setInterval(pollActiveNodes, 500);
+    if (typeof EventSource !== 'undefined') {
+        subscribeActiveNodes();
+    } else {
+        setInterval(pollActiveNodes, 500);
+    }
 }
 
 document.addEventListener('DOMContentLoaded', function () {
@@ -17,9 +17,9 @@ from .base import *
 from .pending_request import *
 
 __all__ = [
-    'SignalLogicGroup', 'InstantConfirmationLogicGroup',
+    'interned_action', 'SignalLogicGroup', 'InstantConfirmationLogicGroup',
 
-    'RequestType', 'RequestStatus', 'PendingRequest',
+    'RequestType', 'RequestStatus', 'TradingClock', 'TRADING_CLOCK', 'TimerWheel', 'TIMER_WHEEL', 'RequestState', 'PendingRequest',
     'RequestRegistered', 'RequestDenied', 'RequestConfirmed',
     'DelayedConfirmationLogicGroup'
 ]
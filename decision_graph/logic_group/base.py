@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import functools
 from typing import Literal, Any, overload, final
 
 from . import LOGGER
-from ..decision_tree import USING_CAPI, AttrExpression, LogicGroup, ActionNode, LGM, LongAction, ShortAction, NoAction
+from ..decision_tree import USING_CAPI, AttrExpression, LogicGroup, ActionNode, LGM, LongAction, ShortAction, NoAction, DEFAULT_ACTION
 
 LOGGER = LOGGER.getChild('base')
 
-__all__ = ['SignalLogicGroup', 'InstantConfirmationLogicGroup']
+__all__ = ['interned_action', 'SignalLogicGroup', 'InstantConfirmationLogicGroup']
+
+
+@functools.cache
+def interned_action(action_type: type[ActionNode], sig: int) -> ActionNode:
+    """
+    The shared, detached action of the type and signal, so that confirmation results allocate nothing once warmed up.
+    The returned node is shared by every caller, it is created with ``shared=True`` so that it can not be attached to a tree.
+    """
+    if action_type is NoAction and not sig:
+        return DEFAULT_ACTION
+
+    # Built outside the active groups of the first caller, so that the shared node does not carry their labels.
+    LGM.shelve()
+    try:
+        return action_type(sig=sig, auto_connect=False, shared=True)
+    finally:
+        LGM.unshelve()
 
 
 class SignalLogicGroup(LogicGroup):
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import datetime
 import enum
+import math
 import threading
 import time
 import uuid
@@ -10,13 +12,13 @@ from typing import Literal, Any
 from algo_engine.profile import PROFILE
 
 from . import LOGGER
-from .base import SignalLogicGroup
+from .base import SignalLogicGroup, interned_action
 from ..decision_tree import ActionNode, LogicGroup, NodeValueError, LongAction, ShortAction, LGM, NoAction
 
 LOGGER = LOGGER.getChild('Request')
 
 __all__ = [
-    'RequestType', 'RequestStatus', 'PendingRequest',
+    'RequestType', 'RequestStatus', 'TradingClock', 'TRADING_CLOCK', 'TimerWheel', 'TIMER_WHEEL', 'RequestState', 'PendingRequest',
     'RequestRegistered', 'RequestDenied', 'RequestConfirmed',
     'DelayedConfirmationLogicGroup'
 ]
@@ -34,6 +36,301 @@ class RequestStatus(enum.StrEnum):
     locked = enum.auto()
 
 
+class TradingClock(object):
+    """
+    Memoized trading-time cursor over the session calendar of the profile.
+
+    Within a session day, trading time is a piecewise linear function of the wall time, given by the session start,
+    end and breaks of the profile. The trading intervals of each day are computed once and cached, so converting a
+    timestamp into a trading-clock offset of its day is a few comparisons. Spans across days fall back to the profile.
+    """
+
+    def __init__(self, profile=None):
+        self.profile = PROFILE if profile is None else profile
+
+        # date -> (timestamp of midnight, trading intervals in seconds from midnight)
+        self._days: dict[datetime.date, tuple[float, tuple[tuple[float, float], ...]]] = {}
+        self._profile_id = None
+
+    def _intervals(self, date: datetime.date) -> tuple[tuple[float, float], ...]:
+        profile = self.profile
+        if not profile.trade_calendar(date, date):
+            return ()
+
+        def seconds(t: datetime.time) -> float:
+            return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
+
+        start = 0. if profile.session_start is None else seconds(profile.session_start)
+        end = 86400. if profile.session_end is None or profile.session_end == datetime.time.max else seconds(profile.session_end)
+        # A night session wraps around midnight
+        sessions = [(start, end)] if start <= end else [(0., end), (start, 86400.)]
+
+        for break_start, break_end in sorted((seconds(a), seconds(b)) for a, b in profile.session_break or ()):
+            sessions = [
+                piece
+                for session_start, session_end in sessions
+                for piece in ((session_start, min(session_end, break_start)), (max(session_start, break_end), session_end))
+                if piece[0] < piece[1]
+            ]
+        return tuple(sessions)
+
+    def offset(self, timestamp: float) -> tuple[datetime.date, float]:
+        """The session day of the timestamp, and the trading time elapsed on that day up to the timestamp."""
+        if self._profile_id != self.profile.profile_id:
+            # the profile is overridden in place, e.g. by ``override_profile``
+            self._days.clear()
+            self._profile_id = self.profile.profile_id
+
+        ts = datetime.datetime.fromtimestamp(timestamp, tz=self.profile.time_zone)
+        date = ts.date()
+        day = self._days.get(date)
+        if day is None:
+            midnight = datetime.datetime.combine(date, datetime.time.min, tzinfo=ts.tzinfo).timestamp()
+            day = self._days[date] = (midnight, self._intervals(date))
+
+        midnight, intervals = day
+        seconds = timestamp - midnight
+        elapsed = 0.
+        for start, end in intervals:
+            if seconds <= start:
+                break
+            elapsed += min(seconds, end) - start
+        return date, elapsed
+
+    def elapsed(self, since: tuple[datetime.date, float], since_ts: float, timestamp: float) -> float:
+        """Trading time from ``since``, the offset of ``since_ts``, to the timestamp. A subtraction within a day."""
+        if timestamp <= since_ts:
+            return 0.
+        date, offset = self.offset(timestamp)
+        if date == since[0]:
+            return offset - since[1]
+        return self.profile.trade_time_between(since_ts, timestamp).total_seconds()
+
+    def clear(self):
+        self._days.clear()
+
+
+TRADING_CLOCK = TradingClock()
+
+
+class TimerWheel(object):
+    """
+    Hierarchical timer wheel expiring active PendingRequests.
+
+    Deadlines are in the unit of the ``timestamp`` context of the logic groups, quantized into ticks of ``resolution``.
+    A wheel follows a single time base: every request has its own wheel by default, a wheel shared across groups (e.g.
+    ``TIMER_WHEEL``) must only be fed the timestamps of one clock, and rejects those behind the ones already seen.
+    Level 0 holds ``slots`` buckets of one tick, every upper level holds ``slots`` buckets spanning a full rotation of
+    the level below, and deadlines beyond the top level are parked in an overflow bucket. Scheduling and cancelling
+    are O(1), advancing by one tick expires a single bucket and cascades the upper buckets when a level wraps.
+    """
+
+    def __init__(self, resolution: float = 1., slots: int = 64, levels: int = 4):
+        if resolution <= 0:
+            raise ValueError('Resolution must be positive!')
+        if slots < 2 or levels < 1:
+            raise ValueError('TimerWheel requires at least 2 slots and 1 level!')
+
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.n_expired = 0
+        self.lock = threading.Lock()
+
+        # bucket: uid -> (deadline tick, request)
+        self._wheels: list[list[dict[uuid.UUID, tuple[int, PendingRequest]]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._overflow: dict[uuid.UUID, tuple[int, PendingRequest]] = {}
+        self._location: dict[uuid.UUID, dict] = {}
+        self._tick: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._location)
+
+    def _place(self, uid: uuid.UUID, deadline_tick: int, request: PendingRequest):
+        delta = deadline_tick - self._tick
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots:
+                bucket = self._wheels[level][(deadline_tick // span) % self.slots]
+                break
+            span *= self.slots
+        else:
+            bucket = self._overflow
+        bucket[uid] = (deadline_tick, request)
+        self._location[uid] = bucket
+
+    def _discard(self, uid: uuid.UUID):
+        bucket = self._location.pop(uid, None)
+        if bucket is not None:
+            bucket.pop(uid, None)
+
+    def _drain(self, bucket: dict, tick: int, due: list[PendingRequest]):
+        entries = list(bucket.items())
+        bucket.clear()
+        for uid, (deadline_tick, request) in entries:
+            if deadline_tick <= tick:
+                del self._location[uid]
+                due.append(request)
+            else:
+                self._place(uid, deadline_tick, request)
+
+    def _step(self, tick: int, due: list[PendingRequest]):
+        # Cascade the wrapped levels top-down, so that entries moved down this tick are drained in the same tick.
+        wrapped = []
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.slots
+            if tick % span:
+                break
+            wrapped.append((level, span))
+        else:
+            if not tick % (span * self.slots):
+                self._drain(self._overflow, tick, due)
+
+        for level, span in reversed(wrapped):
+            self._drain(self._wheels[level][(tick // span) % self.slots], tick, due)
+
+        bucket = self._wheels[0][tick % self.slots]
+        for uid, (_, request) in bucket.items():
+            del self._location[uid]
+            due.append(request)
+        bucket.clear()
+
+    def schedule(self, request: PendingRequest, timestamp: float, timeout: float):
+        """
+        (Re)schedule the expiry of the request, ``timeout`` after ``timestamp``. Infinite timeouts are not scheduled.
+
+        Raises:
+            ValueError: If the timestamp is behind the wheel while it tracks other requests, i.e. from another time base.
+        """
+        tick = math.floor(timestamp / self.resolution)
+        with self.lock:
+            self._discard(request.uid)
+            if timeout == inf:
+                return
+            if self._tick is None or not self._location:
+                # an empty wheel follows the time base of the next request, e.g. a backtest replayed after live trading
+                self._tick = tick
+            elif tick < self._tick:
+                raise ValueError(f'Timestamp {timestamp} of {request.name} is behind the timer wheel, requests on another time base need their own wheel.')
+            deadline_tick = max(math.ceil((timestamp + timeout) / self.resolution), self._tick + 1)
+            self._place(request.uid, deadline_tick, request)
+
+    def cancel(self, request: PendingRequest):
+        with self.lock:
+            self._discard(request.uid)
+
+    def advance(self, timestamp: float) -> list[PendingRequest]:
+        """
+        Move the wheel forward to the timestamp and expire the due requests.
+
+        Returns:
+            list[PendingRequest]: The requests deactivated by this call.
+        """
+        tick = math.floor(timestamp / self.resolution)
+        due = []
+
+        with self.lock:
+            if self._tick is None or tick <= self._tick:
+                if self._tick is None:
+                    self._tick = tick
+                return due
+
+            if tick - self._tick > self.slots:
+                # Sparse jump, e.g. replaying across a session break, re-placing the live entries beats stepping.
+                entries = [(uid, bucket[uid]) for uid, bucket in self._location.items()]
+                for level in self._wheels:
+                    for bucket in level:
+                        bucket.clear()
+                self._overflow.clear()
+                self._location.clear()
+                self._tick = tick
+                for uid, (deadline_tick, request) in entries:
+                    if deadline_tick <= tick:
+                        due.append(request)
+                    else:
+                        self._place(uid, deadline_tick, request)
+            else:
+                while self._tick < tick:
+                    self._tick += 1
+                    self._step(self._tick, due)
+
+        # Expiring is done outside the wheel lock, as a request not yet timed out in trading time reschedules itself.
+        expired = []
+        for request in due:
+            try:
+                if request.expire(timestamp):
+                    expired.append(request)
+            except Exception:
+                # The failure belongs to that request, not to the caller advancing the shared wheel. It stays tracked.
+                LOGGER.exception(f'Failed to expire {request.name}, retrying on the next tick.')
+                self.schedule(request, timestamp, self.resolution)
+        self.n_expired += len(expired)
+        return expired
+
+    def clear(self):
+        with self.lock:
+            for level in self._wheels:
+                for bucket in level:
+                    bucket.clear()
+            self._overflow.clear()
+            self._location.clear()
+            self._tick = None
+
+    @property
+    def n_live(self) -> int:
+        """Number of active requests with a scheduled expiry."""
+        return len(self._location)
+
+
+# A wheel to share across the requests of one time base, passed as ``timer=TIMER_WHEEL``; advanced once, it expires them all.
+TIMER_WHEEL = TimerWheel()
+
+
+class RequestState(object):
+    """
+    Immutable snapshot of the state of a ``PendingRequest``.
+
+    A transition never mutates a snapshot, it builds the next one and swaps it in with a compare-and-swap, so readers
+    always see a consistent state without locking. Fields can also be read by key, e.g. ``state['rstatus']``.
+    """
+    __slots__ = (
+        'sig', 'rtype', 'rstatus', 'activated_ts', 'activated_offset',
+        'activated_by', 'deactivated_by', 'confirmed_by', 'timeout'
+    )
+
+    def __init__(
+            self,
+            sig: int = 0,
+            rtype: RequestType = RequestType.generic,
+            rstatus: RequestStatus = RequestStatus.idle,
+            activated_ts: float = 0,
+            activated_offset: tuple[datetime.date, float] = None,
+            activated_by: RequestRegistered = None,
+            deactivated_by: RequestDenied = None,
+            confirmed_by: RequestConfirmed = None,
+            timeout: float = inf
+    ):
+        self.sig = sig
+        self.rtype = rtype
+        self.rstatus = rstatus
+        self.activated_ts = activated_ts
+        self.activated_offset = activated_offset
+        self.activated_by = activated_by
+        self.deactivated_by = deactivated_by
+        self.confirmed_by = confirmed_by
+        self.timeout = timeout
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}>({self.rstatus}, sig={self.sig}, rtype={self.rtype})'
+
+
 class PendingRequest(object):
     def __init__(
             self,
@@ -44,22 +341,28 @@ class PendingRequest(object):
         self.uid = uid or uuid.uuid4()
         self.name = name or f'PendingRequest.{self.uid}'
         self.logic_group = kwargs.get('logic_group', LGM.active_group)
-
-        self.state = {
-            'sig': kwargs.get('sig', 0),
-            'rtype': kwargs.get('rtype', RequestType.generic),
-            'rstatus': kwargs.get('rstatus', RequestStatus.idle),
-            'activated_ts': kwargs.get('activated_ts', 0),
-            'activated_by': kwargs.get('activated_by'),
-            'deactivated_by': kwargs.get('deactivated_by'),
-            'confirmed_by': kwargs.get('confirmed_by'),
-            'timeout': kwargs.get('timeout', inf),
-        }
+        # the wheel expiring this request once activated, its own by default, set to None to only check the timeout on confirmation
+        self.timer: TimerWheel | None = kwargs['timer'] if 'timer' in kwargs else TimerWheel()
+        self.clock: TradingClock = kwargs.get('clock', TRADING_CLOCK)
+
+        self._state = RequestState(
+            sig=kwargs.get('sig', 0),
+            rtype=kwargs.get('rtype', RequestType.generic),
+            rstatus=kwargs.get('rstatus', RequestStatus.idle),
+            activated_ts=kwargs.get('activated_ts', 0),
+            activated_by=kwargs.get('activated_by'),
+            deactivated_by=kwargs.get('deactivated_by'),
+            confirmed_by=kwargs.get('confirmed_by'),
+            timeout=kwargs.get('timeout', inf),
+        )
 
         self.register_node = {}
         self.confirmation_node = {}
         self.denial_node = {}
-        self.lock = threading.Lock()
+        # the deactivation recorded when the request times out, bound like the denials of the tree
+        self.expiry_node = RequestDenied(req=self, auto_connect=False, repr='<Pending Request Expired>')
+        # guards the compare-and-swap of the state snapshot only, never held across a transition
+        self._cas_lock = threading.Lock()
 
     def bind(self, node_id: uuid.UUID, logic_node: RequestRegistered | RequestDenied | RequestConfirmed):
         if isinstance(logic_node, RequestRegistered):
@@ -72,8 +375,16 @@ class PendingRequest(object):
             raise TypeError('PendingRequest can only be bound to RequestRegistered, RequestConfirmed, or RequestDenied nodes!')
         return logic_node
 
+    def compare_and_swap(self, expected: RequestState, state: RequestState) -> bool:
+        """Install the state if the current one is still ``expected``, returns False if another transition came first."""
+        with self._cas_lock:
+            if self._state is not expected:
+                return False
+            self._state = state
+            return True
+
     def activate(self, node_id: uuid.UUID):
-        if self.rstatus == RequestStatus.active:
+        if self._state.rstatus == RequestStatus.active:
             return
 
         if node_id not in self.register_node:
@@ -84,132 +395,166 @@ class PendingRequest(object):
         if not reg_node.sig:
             raise NodeValueError('Signal Must not be zero.')
 
-        if not self.lock.acquire(blocking=False):
-            raise NodeValueError('Cannot activate a locked PendingRequest!')
-
-        self.state['sig'] = reg_node.sig
-        self.state['rtype'] = reg_node.rtype
-        self.state['rstatus'] = RequestStatus.active
-        self.state['activated_ts'] = self.logic_group.contexts.get('timestamp', time.time())
-        self.state['activated_by'] = reg_node
-        self.state['deactivated_by'] = None
-        self.state['confirmed_by'] = None
-        self.state['timeout'] = reg_node.timeout
+        activated_ts = self.logic_group.contexts.get('timestamp', time.time())
+        state = RequestState(
+            sig=reg_node.sig,
+            rtype=reg_node.rtype,
+            rstatus=RequestStatus.active,
+            activated_ts=activated_ts,
+            activated_offset=self.clock.offset(activated_ts),
+            activated_by=reg_node,
+            timeout=reg_node.timeout
+        )
 
-        self.lock.release()
+        while True:
+            current = self._state
+            # activated concurrently, the first activation wins
+            if current.rstatus == RequestStatus.active:
+                return
+            if self.compare_and_swap(current, state):
+                break
+
+        if self.timer is not None:
+            # scheduled first, the activation is committed and must be tracked whatever advancing the wheel runs into
+            try:
+                self.timer.schedule(self, activated_ts, reg_node.timeout)
+            except ValueError:
+                # an activation the wheel can not track is undone, rather than left active until confirmed
+                self.compare_and_swap(state, RequestState(timeout=0))
+                raise
+            self.timer.advance(activated_ts)
 
     def deactivate(self, node_id: uuid.UUID):
-        if self.rstatus == RequestStatus.idle:
+        if self._state.rstatus == RequestStatus.idle:
             return
 
         if node_id not in self.denial_node:
             raise NodeValueError('The provided node_id is not bound with this PendingRequest!')
 
-        node = self.denial_node[node_id]
-
-        if not self.lock.acquire(blocking=False):
-            raise NodeValueError('Cannot deactivate a locked PendingRequest!')
-
-        self.state['sig'] = 0
-        self.state['rtype'] = RequestType.generic
-        self.state['rstatus'] = RequestStatus.idle
-        self.state['activated_ts'] = 0
-        self.state['activated_by'] = None
-        self.state['deactivated_by'] = node
-        self.state['confirmed_by'] = None
-        self.state['timeout'] = 0
-
-        self.lock.release()
+        self._reset_state(deactivated_by=self.denial_node[node_id])
 
     def confirm(self, node_id: uuid.UUID) -> ShortAction | NoAction | LongAction:
-        if self.rstatus != RequestStatus.active:
+        current = self._state
+        if current.rstatus != RequestStatus.active:
             raise NodeValueError('Cannot confirm a inactive PendingRequest!')
 
         if node_id not in self.confirmation_node:
             raise NodeValueError('The provided node_id is not bound with this PendingRequest!')
 
         node = self.confirmation_node[node_id]
-
-        if not self.lock.acquire(blocking=False):
-            raise NodeValueError('Cannot confirm a locked PendingRequest!')
-
-        # Step 1: Lock the request
-        self.state['rstatus'] = RequestStatus.locked
-        prelaunch_check = True
-
-        # Step 2: Check timeout
         current_ts = self.logic_group.contexts.get('timestamp', time.time())
-        activated_ts = self.state['activated_ts']
-        timeout = self.state['timeout']
-        elapsed_time = PROFILE.trading_time_between(activated_ts, current_ts)
-        if elapsed_time >= timeout:
-            prelaunch_check = False
-
-        # Step 3: Check signal match
-        if prelaunch_check and node.sig != self.sig:
-            prelaunch_check = False
-
-        # Step 4: Finalize confirmation or denial
-        if prelaunch_check:
-            if node.sig > 0:
-                action = LongAction(sig=node.sig, auto_connect=False)
-            elif node.sig < 0:
-                action = ShortAction(sig=node.sig, auto_connect=False)
-            else:
-                action = NoAction(auto_connect=False)
-        else:
-            action = NoAction(auto_connect=False)
-
-        # Step 5: Reset the request state
-        self.state['sig'] = 0
-        self.state['rtype'] = RequestType.generic
-        self.state['rstatus'] = RequestStatus.idle
-        self.state['activated_ts'] = 0
-        self.state['activated_by'] = None
-        self.state['deactivated_by'] = None
-        self.state['confirmed_by'] = node
-        self.state['timeout'] = 0
-
-        # Step 6: Release the lock and return the action
-        self.lock.release()
-        return action
+        state = RequestState(confirmed_by=node, timeout=0)
+
+        while True:
+            # the prelaunch check: not timed out, and the signal matches
+            prelaunch_check = self.elapsed(current_ts, current) < current.timeout and node.sig == current.sig
+
+            if self.compare_and_swap(current, state):
+                break
+
+            # Another transition came first: a request consumed concurrently confirms nothing.
+            current = self._state
+            if current.rstatus != RequestStatus.active:
+                return interned_action(NoAction, 0)
+
+        if self.timer is not None:
+            self.timer.cancel(self)
+
+        if prelaunch_check and node.sig > 0:
+            return interned_action(LongAction, node.sig)
+        elif prelaunch_check and node.sig < 0:
+            return interned_action(ShortAction, node.sig)
+        return interned_action(NoAction, 0)
+
+    def expire(self, timestamp: float = None) -> bool:
+        """
+        Deactivate the request if it has timed out at the timestamp, called by the timer wheel. The deactivation is
+        recorded as ``deactivated_by`` the ``expiry_node`` of the request.
+        The wheel schedules on the timestamp context, which is an upper bound of the trading time. A request not yet
+        timed out in trading time (e.g. across a session break) is rescheduled with its remaining timeout instead.
+
+        Returns:
+            bool: True if the request was deactivated.
+        """
+        if timestamp is None:
+            timestamp = self.logic_group.contexts.get('timestamp', time.time())
+
+        while True:
+            current = self._state
+            if current.rstatus != RequestStatus.active:
+                return False
+
+            remaining = current.timeout - self.elapsed(timestamp, current)
+            if remaining > 0:
+                if self.timer is not None and self._state is current:
+                    self.timer.schedule(self, timestamp, remaining)
+                return False
+
+            if self.compare_and_swap(current, RequestState(deactivated_by=self.expiry_node, timeout=0)):
+                return True
+
+    def reset(self):
+        self._reset_state()
+
+    def elapsed(self, timestamp: float, state: RequestState = None) -> float:
+        """Trading time elapsed from the activation of the state, the current one by default, to the timestamp."""
+        if state is None:
+            state = self._state
+        activated_offset = state.activated_offset
+        if activated_offset is None:
+            activated_offset = self.clock.offset(state.activated_ts)
+        return self.clock.elapsed(activated_offset, state.activated_ts, timestamp)
+
+    def _reset_state(self, deactivated_by: RequestDenied = None, confirmed_by: RequestConfirmed = None):
+        state = RequestState(deactivated_by=deactivated_by, confirmed_by=confirmed_by, timeout=0)
+        while True:
+            current = self._state
+            if self.compare_and_swap(current, state):
+                break
+
+        if self.timer is not None and current.rstatus != RequestStatus.idle:
+            self.timer.cancel(self)
 
     def __bool__(self):
         if not self.sig:
             return False
         return True
 
+    @property
+    def state(self) -> RequestState:
+        return self._state
+
     @property
     def sig(self) -> int:
-        return self.state['sig']
+        return self._state.sig
 
     @property
     def rtype(self) -> RequestType:
-        return self.state['rtype']
+        return self._state.rtype
 
     @property
     def rstatus(self) -> RequestStatus:
-        return self.state['rstatus']
+        return self._state.rstatus
 
     @property
     def activated_ts(self) -> float:
-        return self.state['activated_ts']
+        return self._state.activated_ts
 
     @property
     def activated_by(self) -> RequestRegistered:
-        return self.state['activated_by']
+        return self._state.activated_by
 
     @property
     def deactivated_by(self) -> RequestDenied:
-        return self.state['deactivated_by']
+        return self._state.deactivated_by
 
     @property
     def confirmed_by(self) -> RequestConfirmed:
-        return self.state['confirmed_by']
+        return self._state.confirmed_by
 
     @property
     def timeout(self) -> float:
-        return self.state['timeout']
+        return self._state.timeout
 
 
 class RequestRegistered(ActionNode):
@@ -241,10 +586,10 @@ class RequestRegistered(ActionNode):
             expression=expression,
             dtype=dtype,
             repr=repr or f'<Pending Request Registered {sig=}>',
+            uid=uid,
             auto_connect=auto_connect
         )
 
-        instance.uid = uid
         instance.sig = sig
         instance.req = req
         instance.rtype = rtype
@@ -279,10 +624,10 @@ class RequestDenied(ActionNode):
             expression=expression,
             dtype=dtype,
             repr=repr or '<Pending Request Denied>',
+            uid=uid,
             auto_connect=auto_connect
         )
 
-        instance.uid = uid
         instance.req = req
         return req.bind(uid, instance)
 
@@ -314,10 +659,10 @@ class RequestConfirmed(ActionNode):
             expression=expression,
             dtype=dtype,
             repr=repr or f'<Pending Request Confirmed {sig=}>',
+            uid=uid,
             auto_connect=auto_connect
         )
 
-        instance.uid = uid
         instance.sig = sig
         instance.req = req
         return req.bind(uid, instance)
@@ -374,6 +719,17 @@ class DelayedConfirmationLogicGroup(SignalLogicGroup):
         self.req.reset()
         super().reset()
 
+    def expire(self, timestamp: float = None) -> list[PendingRequest]:
+        """
+        Advance the timer wheel of the pending request to the timestamp, which defaults to the timestamp context.
+        All the requests sharing the wheel are expired by this call, returns the ones deactivated.
+        """
+        if self.req.timer is None:
+            return [self.req] if self.req.expire(timestamp) else []
+        if timestamp is None:
+            timestamp = self.contexts.get('timestamp', time.time())
+        return self.req.timer.advance(timestamp)
+
     @property
     def signal(self):
         return self.parent.signal
@@ -0,0 +1,49 @@
+# Measures what ``LogicNode.__call__`` allocates per evaluation.
+# Without an explicit default, the call falls back to the shared DEFAULT_ACTION, so no NoAction node is constructed;
+# the last case passes a fresh NoAction per call, which is what every call used to allocate.
+
+import timeit
+import tracemalloc
+
+from decision_graph.decision_tree import LogicNode, LongAction, NoAction, DEFAULT_ACTION, TRUE_CONDITION, LGM
+
+REPEAT = 100_000
+
+
+def build(value) -> LogicNode:
+    node = LogicNode(expression=value, repr='value')
+    node.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    return node
+
+
+def peak_allocation(call) -> int:
+    """Returns the peak of the memory allocated by one call, in bytes."""
+    call()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        call()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    # fallbacks are expected here, do not rate-limit the benchmark on logging
+    LGM.log_interval = float('inf')
+    matched, fallback = build(True), build(2)
+    assert fallback() is DEFAULT_ACTION
+
+    cases = {
+        'matched branch': matched,
+        'shared default': fallback,
+        'fresh NoAction default': lambda: fallback(NoAction(auto_connect=False, autogen=True)),
+    }
+    for label, call in cases.items():
+        elapsed = min(timeit.repeat(call, number=REPEAT, repeat=3)) / REPEAT
+        print(f'{label:<24} {elapsed * 1e6:8.3f} us/call, peak allocation {peak_allocation(call):6d} bytes/call')
+
+
+if __name__ == '__main__':
+    main()
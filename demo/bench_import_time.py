@@ -0,0 +1,35 @@
+# Measures the import time of decision_graph.decision_tree with ``python -X importtime``.
+# The web UI is imported lazily, it should only show up in the second measurement.
+
+import re
+import subprocess
+import sys
+
+REPEAT = 5
+STATEMENTS = {
+    'decision_tree': 'import decision_graph.decision_tree',
+    'decision_tree + webui': 'import decision_graph.decision_tree as dt; dt.webui',
+}
+
+
+def measure(statement: str) -> dict[str, int]:
+    """Returns the cumulative import time in microseconds of every module imported by the statement."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], capture_output=True, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line)
+        if match is not None:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+def main():
+    for label, statement in STATEMENTS.items():
+        runs = [measure(statement) for _ in range(REPEAT)]
+        total = min(run['decision_graph'] for run in runs)
+        webui = min(max((t for m, t in run.items() if m.startswith('decision_graph.decision_tree.webui')), default=0) for run in runs)
+        print(f'{label:<24} decision_graph: {total / 1000:8.2f} ms, webui: {webui / 1000:8.2f} ms (best of {REPEAT})')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,14 @@
+import asyncio
+import contextlib
 import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from decision_graph.decision_tree.capi import c_node, c_abc, c_collection, LGM
-from decision_graph.decision_tree.exc import TooManyChildren, TooFewChildren
+from decision_graph.decision_tree.exc import TooManyChildren, TooFewChildren, ExpressEvaluationError
 
 
 class TestRootLogicNode(unittest.TestCase):
@@ -282,5 +290,591 @@ class TestLogicalExpressionOperator(unittest.TestCase):
         self.assertFalse(func(True, False))
 
 
+
+class TestDeduplicate(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2, "b": 0, "c": 0, "d": 1, "e": 1}
+
+    def build(self):
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    with m.d > 0:
+                        with m.b > 2:
+                            c_abc.LongAction()
+                        with m.c > 2:
+                            c_abc.ShortAction()
+                    with m.e > 0:
+                        with m.b > 2:
+                            c_abc.LongAction()
+                        with m.c > 2:
+                            c_abc.ShortAction()
+        return root
+
+    def test_merge_identical_subtrees(self):
+        root = self.build()
+        before = len(list(root.descendants))
+        self.assertEqual(root.deduplicate(), 7)
+        self.assertEqual(len(list(root.descendants)), before)
+        self.assertEqual(len(set(map(id, root.descendants))), 8)
+
+    def test_evaluation_unchanged(self):
+        root = self.build()
+        expected = []
+        for c, e in ((3, 1), (0, 1), (3, 0), (0, 0)):
+            self.data.update(c=c, e=e)
+            expected.append(root().repr)
+        root.deduplicate()
+        for (c, e), repr_ in zip(((3, 1), (0, 1), (3, 0), (0, 0)), expected):
+            self.data.update(c=c, e=e)
+            self.assertEqual(root().repr, repr_)
+
+    def test_idempotent(self):
+        root = self.build()
+        root.deduplicate()
+        self.assertEqual(root.deduplicate(), 0)
+
+    def test_different_operands_not_merged(self):
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    with m.b > 2:
+                        c_abc.LongAction()
+                    with m.b > 3:
+                        c_abc.LongAction()
+        # only the action leaves are merged, the comparison nodes differ in their right operand
+        self.assertEqual(root.deduplicate(), 2)
+        self.assertIsNot(root.child.children[c_abc.TRUE_CONDITION], root.child.children[c_abc.FALSE_CONDITION])
+
+    def test_merge_rules(self):
+        class TaggedAction(c_abc.LongAction):
+            pass
+
+        def pair(build):
+            root = c_abc.LogicNode(expression=False, dtype=bool, repr="root")
+            for condition in (c_abc.TRUE_CONDITION, c_abc.FALSE_CONDITION):
+                branch = c_abc.LogicNode(expression=True, dtype=bool, repr=f"branch {condition}")
+                branch.append(build(), c_abc.TRUE_CONDITION)
+                root.append(branch, condition)
+            return root.deduplicate()
+
+        self.assertEqual(pair(lambda: c_abc.LongAction(auto_connect=False)), 1)
+        # subclasses defined outside the package are never merged
+        self.assertEqual(pair(lambda: TaggedAction(auto_connect=False)), 0)
+        # nor are nodes of different logic groups
+        groups = iter((c_abc.LogicGroup(name="g1"), c_abc.LogicGroup(name="g2")))
+
+        def labelled():
+            with next(groups):
+                return c_abc.LongAction(auto_connect=False)
+
+        self.assertEqual(pair(labelled), 0)
+
+
+
+class TestEvalIncremental(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2, "b": 3, "c": 0, "d": 1}
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    with m.b + m.c > 2:
+                        c_abc.LongAction()
+                    with m["d"] > 0:
+                        c_abc.ShortAction()
+        self.root = root
+        self.m = m
+
+    def test_dependencies(self):
+        self.assertEqual((self.m.b + self.m.c > 2).dependencies, frozenset({"b", "c"}))
+        self.assertEqual(self.m.x.y.dependencies, frozenset({"x"}))
+        self.assertEqual(self.root.dependencies, frozenset())
+        self.assertIsNone(c_abc.LogicNode(expression=lambda: True).dependencies)
+
+    def test_restart_from_changed_node(self):
+        self.assertIsInstance(self.root(), c_abc.LongAction)
+        path = list(self.root.eval_path)
+
+        # unrelated keys only re-evaluate the action leaf
+        self.assertIsInstance(self.root.eval_incremental(["x"]), c_abc.LongAction)
+        self.assertTrue(all(a is b for a, b in zip(path, self.root.eval_path)))
+
+        self.data.update(b=0, c=0)
+        self.assertIsInstance(self.root.eval_incremental(["b"]), c_abc.NoAction)
+        self.assertEqual(len(self.root.eval_path), 4)
+        self.assertIs(self.root.eval_path[1], path[1])
+
+        # the highest changed node decides the branch again
+        self.data.update(a=0)
+        self.assertIsInstance(self.root.eval_incremental(["a"]), c_abc.ShortAction)
+
+    def test_matches_full_evaluation(self):
+        self.root()
+        for a, b, d in ((2, 0, 1), (0, 0, 1), (2, 3, 0), (2, 0, 0), (2, 3, 1)):
+            self.data.update(a=a, b=b, d=d)
+            incremental = self.root.eval_incremental(["a", "b", "d"])
+            self.assertIs(incremental, self.root())
+
+
+
+class TestObservableMapping(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2, "b": 3}
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    with m.b > 2:
+                        c_abc.LongAction()
+                    c_abc.ShortAction()
+        self.root = root
+        self.m = m
+        self.events = []
+
+    def on_change(self, root, value, previous):
+        self.events.append((root, value, previous))
+
+    def test_callback_on_action_change(self):
+        self.m.subscribe(self.root, self.on_change)
+        self.m["b"] = 0
+        self.assertEqual(len(self.events), 1)
+        self.assertIsInstance(self.events[0][1], c_abc.NoAction)
+        self.assertIsNone(self.events[0][2])
+
+        # same action selected, no callback
+        self.m["b"] = -1
+        self.assertEqual(len(self.events), 1)
+
+        self.m.update(a=0)
+        self.assertEqual(len(self.events), 2)
+        self.assertIsInstance(self.events[1][1], c_abc.ShortAction)
+        self.assertIs(self.events[1][2], self.events[0][1])
+        self.assertEqual(self.root.dirty_keys, frozenset())
+
+    def test_mark_dirty_only(self):
+        self.m.subscribe(self.root, self.on_change, auto_eval=False)
+        self.root()
+        self.m.update({"a": 0, "b": 0})
+        self.assertEqual(self.root.dirty_keys, frozenset({"a", "b"}))
+        self.assertEqual(self.events, [])
+        self.assertIsInstance(self.root.eval_incremental(), c_abc.ShortAction)
+        self.assertEqual(self.root.dirty_keys, frozenset())
+
+    def test_unsubscribe(self):
+        self.m.subscribe(self.root, self.on_change)
+        self.m.unsubscribe(self.root)
+        self.m["b"] = 0
+        self.assertEqual(self.events, [])
+        self.assertEqual(self.root.dirty_keys, frozenset())
+        self.assertEqual(self.data["b"], 0)
+
+
+
+class TestMappingSchema(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data={"a": 2, "b": {"x": 5}}, schema=("a", "b")) as m:
+                with (m.a > 1) & (m.b.x > 4) & (m.c == 0):
+                    self.long = c_abc.LongAction()
+                    self.short = c_abc.ShortAction()
+        self.root = root.freeze()
+        self.m = m
+        m["c"] = 0
+
+    def test_frozen_reads_follow_writes(self):
+        self.assertEqual(self.m.schema, ("a", "b"))
+        self.assertIs(self.root(), self.long)
+        self.m["a"] = 0
+        self.assertIs(self.root(), self.short)
+        self.m.update(a=3)
+        self.assertIs(self.root(), self.long)
+        self.m.set_row([3, {"x": 0}])
+        self.assertIs(self.root(), self.short)
+        self.assertEqual(self.m.data, {"a": 3, "b": {"x": 0}, "c": 0})
+
+    def test_frozen_reads_follow_direct_writes(self):
+        # data is a view over the slots, writes bypassing the mapping are seen by the frozen tree
+        self.assertIsInstance(self.m.data, c_collection.SlotMapping)
+        self.m.data["a"] = 0
+        self.assertIs(self.root(), self.short)
+        self.m.data.update(a=5)
+        self.assertIs(self.root(), self.long)
+        del self.m.data["a"]
+        with self.assertRaises(KeyError):
+            self.root()
+        self.assertEqual(dict(self.m.data), {"b": {"x": 5}, "c": 0})
+        self.assertNotIn("a", self.m.data)
+        self.assertEqual(len(self.m.data), 2)
+
+    def test_missing_declared_key(self):
+        del self.m["a"]
+        with self.assertRaises(KeyError):
+            self.root()
+        self.m.clear()
+        with self.assertRaises(KeyError):
+            self.root()
+
+    def test_set_row_validation(self):
+        with self.assertRaises(ValueError):
+            self.m.set_row([1])
+        with self.assertRaises(ValueError):
+            c_collection.LogicMapping(name="plain", data={}).set_row([])
+        with self.assertRaises(ValueError):
+            c_collection.LogicMapping(name="duplicated", data={}, schema=("a", "a"))
+
+
+@unittest.skipUnless(np is not None, "numpy is required for structured arrays")
+class TestLogicRecord(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.quotes = np.zeros(3, dtype=[("price", "<f8"), ("qty", "<i4"), ("halted", "?"), ("sym", "S4"), ("seq", ">i8")])
+        self.quotes["price"] = [10.5, 9.5, 11.0]
+        self.quotes["qty"] = [100, 200, 0]
+        self.quotes["halted"] = [False, False, True]
+        self.quotes["sym"] = [b"ab", b"abcd", b"x"]
+        self.quotes["seq"] = [1, 2, 3]
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicRecord(name="q", data=self.quotes) as q:
+                with (q.price > 10) & (q.qty > 0):
+                    self.long = c_abc.LongAction()
+                    self.short = c_abc.ShortAction()
+        self.root = root
+        self.q = q
+
+    def test_fields_follow_cursor(self):
+        self.assertEqual(len(self.q), 3)
+        self.assertIn("sym", self.q)
+        self.assertNotIn("missing", self.q)
+        for i in range(3):
+            self.q.seek(i)
+            self.assertEqual(self.q.index, i)
+            self.assertEqual([self.q[key].eval() for key in self.q.schema], list(self.quotes[i].item()))
+
+    def test_cursor_rebinds_tree(self):
+        for root in (self.root, self.root.freeze()):
+            self.q.seek(0)
+            self.assertIs(root(), self.long)
+            self.assertTrue(self.q.advance())
+            self.assertIs(root(), self.short)
+            self.assertTrue(self.q.advance())
+            self.assertIs(root(), self.short)
+            self.assertFalse(self.q.advance())
+            self.assertEqual(self.q.index, 2)
+
+        # reads are zero-copy, in-place writes to the array are visible
+        self.quotes["qty"][2] = 1
+        self.assertIs(self.root(), self.long)
+
+    def test_raw_buffer(self):
+        dtype = np.dtype([("x", "<f8"), ("y", "<i8")])
+        raw = np.array([(1.0, 3), (2.0, 4)], dtype=dtype).tobytes()
+        record = c_collection.LogicRecord(name="raw", data=raw, dtype=dtype, index=1)
+        self.assertEqual((record.x.eval(), record.y.eval()), (2.0, 4))
+        with self.assertRaises(IndexError):
+            record.seek(2)
+        with self.assertRaises(TypeError):
+            c_collection.LogicRecord(name="raw_bad", data=self.quotes.tobytes(), dtype=self.quotes.dtype)
+        with self.assertRaises(TypeError):
+            c_collection.LogicRecord(name="no_dtype", data=raw)
+        with self.assertRaises(ValueError):
+            c_collection.LogicRecord(name="strided", data=self.quotes[::2])
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data={"a": 0}) as m:
+                with m.a > 1:
+                    self.long = c_abc.LongAction()
+                    self.short = c_abc.ShortAction()
+        self.root = root
+        self.m = m
+        self.pulled = []
+
+    def source(self, values):
+        for value in values:
+            self.pulled.append(value)
+            yield None if value is None else {"m": {"a": value}}
+
+    def test_stream(self):
+        results = list(self.root.stream(self.source([2, 0, 3, None, 5]), batch=2))
+        self.assertEqual([i for i, _ in results], [0, 1, 2, 3, 4])
+        self.assertEqual([action for _, action in results], [self.long, self.short, self.long, self.short, self.long])
+        # the None context evaluates against the data of the mapping itself
+        self.assertEqual(self.m.data, {"a": 0})
+
+    def test_lazy_evaluation(self):
+        # a None context reads the mapping as the source left it, which only works if nothing is pulled ahead
+        def source():
+            for value in (2, 0, 3):
+                self.m["a"] = value
+                yield None
+
+        self.assertEqual([action for _, action in self.root.stream(source(), batch=1)], [self.long, self.short, self.long])
+        evaluated = []
+        self.root.add_listener(lambda root: evaluated.append(root.eval_path[-1]))
+        stream = self.root.stream(self.source([2, 0, 3]), batch=4)
+        self.assertEqual(evaluated, [])
+        # the whole batch is pulled, but only the context asked for is evaluated
+        self.assertEqual(next(stream), (0, self.long))
+        self.assertEqual((self.pulled, evaluated), ([2, 0, 3], [self.long]))
+        self.assertEqual(next(stream), (1, self.short))
+        self.assertEqual(evaluated, [self.long, self.short])
+
+    def test_batch_pulls(self):
+        for batch, pulls in ((1, [1, 2, 3, 4, 5]), (2, [2, 2, 4, 4, 5]), (4, [4, 4, 4, 4, 5])):
+            self.pulled.clear()
+            counts = [len(self.pulled) for _ in self.root.stream(self.source(range(5)), batch=batch)]
+            self.assertEqual(counts, pulls)
+
+    def test_backpressure_and_early_termination(self):
+        source = self.source(range(100))
+        stream = self.root.stream(source, batch=4)
+        self.assertEqual(next(stream), (0, self.short))
+        self.assertEqual(len(self.pulled), 4)
+        for index, action in stream:
+            if action is self.long:
+                break
+        self.assertEqual(index, 2)
+        self.assertEqual(len(self.pulled), 4)
+        # closing the stream closes the source
+        stream.close()
+        with self.assertRaises(StopIteration):
+            next(source)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.root.stream([], batch=0)
+        stream = self.root.stream([{"m": {"a": 2}}, "a", {"m": {"a": 2}}])
+        self.assertEqual(next(stream), (0, self.long))
+        with self.assertRaises(TypeError):
+            next(stream)
+
+
+class TestAsyncEval(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.calls = []
+        self.in_flight = self.max_in_flight = 0
+
+        async def lookup(name, value):
+            self.calls.append(name)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0)
+            self.in_flight -= 1
+            return value
+
+        def limit():
+            self.calls.append("limit")
+            return 5
+
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data={"a": 2}) as m:
+                risk = c_abc.LogicNode(expression=lambda: lookup("risk", 3), repr="risk")
+                cached = c_abc.LogicNode(expression=lambda: lookup("cache", 7), repr="cache")
+                with (m.a < risk) & c_node.ComparisonExpression(left=cached, op=c_node.ComparisonExpressionOperator.gt, right=c_abc.LogicNode(expression=limit, repr="limit"), logic_group=m):
+                    with c_abc.LogicNode(expression=lambda: lookup("flag", True), repr="flag"):
+                        self.long = c_abc.LongAction()
+                    self.short = c_abc.ShortAction()
+        self.root = root
+
+    def test_awaits_and_gathers_operands(self):
+        self.assertIs(asyncio.run(self.root.aeval()), self.long)
+        # the operands of the first node are all called before the branch below it
+        self.assertEqual(sorted(self.calls[:3]), ["cache", "limit", "risk"])
+        self.assertEqual(self.calls[3:], ["flag"])
+        self.assertEqual(self.max_in_flight, 2)
+        self.assertEqual([node.repr for node in self.root.eval_path][-1], self.long.repr)
+        self.assertIs(asyncio.run(self.root.aeval(context={"m": {"a": 4}})), self.short)
+
+    def test_concurrent_evaluations(self):
+        async def main():
+            return await asyncio.gather(*(self.root.aeval(context={"m": {"a": a}}) for a in (0, 4, 1)))
+
+        self.assertEqual(asyncio.run(main()), [self.long, self.short, self.long])
+
+    def test_sync_evaluation_unchanged(self):
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="s", data={"a": 2}) as s:
+                with s.a < c_abc.LogicNode(expression=lambda: 3, repr="three"):
+                    long = c_abc.LongAction()
+        self.assertIs(root(), long)
+        self.assertIs(asyncio.run(root.aeval()), long)
+
+
+class TestHotPathLogging(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        LGM.reset_stats()
+        self.log_interval = LGM.log_interval
+        self.node = c_abc.LogicNode(expression=2, repr="two")
+        self.node.append(c_abc.LongAction(auto_connect=False), c_abc.TRUE_CONDITION)
+
+    def tearDown(self):
+        LGM.log_interval = self.log_interval
+        LGM.reset_stats()
+
+    def test_fallback_rate_limited(self):
+        LGM.log_interval = 3600.
+        default = c_abc.NoAction(auto_connect=False)
+        with self.assertLogs("DecisionGraph", level="WARNING") as logs:
+            for _ in range(10):
+                self.assertIs(self.node.eval_recursively(default=default)[0], default)
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(LGM.stats(), {"default_fallback": 10, "dtype_mismatch": 0, "suppressed_logs": 9})
+
+    def test_suppressed_count_reported(self):
+        LGM.log_interval = 0.
+        with self.assertLogs("DecisionGraph", level="WARNING") as logs:
+            self.node.eval_recursively(default=None)
+            self.node.eval_recursively(default=None)
+        self.assertEqual(len(logs.records), 2)
+        self.assertNotIn("suppressed", logs.output[1])
+        self.assertEqual(LGM.n_suppressed_logs, 0)
+
+    def test_dtype_mismatch_counted(self):
+        LGM.log_interval = 3600.
+        expr = c_abc.LogicExpression(expression=1.5, dtype=int)
+        with self.assertLogs("DecisionGraph", level="WARNING") as logs:
+            expr.eval()
+            expr.eval()
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(LGM.stats()["dtype_mismatch"], 2)
+
+    def test_window_per_node_lifetime(self):
+        LGM.log_interval = 3600.
+        # a node allocated at the address of a released one starts with a window of its own
+        with self.assertLogs("DecisionGraph", level="WARNING") as logs:
+            for _ in range(20):
+                c_abc.LogicExpression(expression=1.5, dtype=int).eval()
+        self.assertEqual(len(logs.records), 20)
+
+    def test_window_reset_by_clear(self):
+        LGM.log_interval = 3600.
+        with self.assertLogs("DecisionGraph", level="WARNING") as logs:
+            self.node.eval_recursively(default=None)
+            self.node.eval_recursively(default=None)
+            LGM.clear()
+            self.node.eval_recursively(default=None)
+        self.assertEqual(len(logs.records), 2)
+
+
+
+class TestFrameArena(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.baseline = c_abc._frame_arena_stats()
+        self.groups = [c_abc.LogicGroup(name=f"arena {i}") for i in range(2000)]
+
+    def enter_all(self, groups):
+        # every active group holds one frame of the LGM stack
+        stack = contextlib.ExitStack()
+        for group in groups:
+            stack.enter_context(group)
+        return stack
+
+    def test_alloc_free_reuse(self):
+        stack = self.enter_all(self.groups)
+        grown = c_abc._frame_arena_stats()
+        self.assertEqual(grown["live"], self.baseline["live"] + 2000)
+        self.assertGreaterEqual(grown["slabs"], self.baseline["slabs"] + 2000 // 256)
+
+        # the slabs are released once all of their frames are freed, one spare is kept
+        stack.close()
+        released = c_abc._frame_arena_stats()
+        self.assertEqual(released["live"], self.baseline["live"])
+        self.assertLessEqual(released["slabs"], self.baseline["slabs"] + 1)
+
+        # freed frames are reused before any new slab is allocated
+        with self.enter_all(self.groups[:10]):
+            self.assertIs(LGM.active_group, self.groups[9])
+            self.assertEqual(c_abc._frame_arena_stats(), {"slabs": released["slabs"], "live": released["live"] + 10})
+
+
+class TestExpressEvaluationError(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2}
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    with m.missing > 0:
+                        c_abc.LongAction()
+        self.root = root
+
+    def tearDown(self):
+        LGM.vigilant_mode = False
+
+    def test_vigilant_mode_structured_error(self):
+        LGM.vigilant_mode = True
+        with self.assertRaises(ExpressEvaluationError) as ctx:
+            self.root()
+        err = ctx.exception
+        self.assertEqual(err.node.repr, "m.missing > 0")
+        self.assertEqual([node.repr for node in err.path], ["Entry Point", "m.a > 1", "m.missing > 0"])
+        self.assertIsInstance(err.exception, KeyError)
+        self.assertIs(err.__cause__, err.exception)
+        self.assertIn("m.a > 1 -> m.missing > 0", str(err))
+        self.assertIn("KeyError", str(err))
+
+    def test_dry_run_structured_error(self):
+        with self.assertRaises(ExpressEvaluationError) as ctx:
+            self.root.dry_run()
+        self.assertIn(ctx.exception.node.repr, ("m.missing", "m.missing > 0"))
+        self.assertIsNone(ctx.exception.path)
+
+    def test_plain_message(self):
+        self.assertEqual(str(ExpressEvaluationError("plain")), "plain")
+
+
+class TestContextBinding(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"price": 0.}
+        with c_node.RootLogicNode() as root:
+            with c_collection.LogicMapping(name="quote", data=self.data) as m:
+                with m.price > 100:
+                    self.long = c_abc.LongAction()
+                    self.short = c_abc.ShortAction()
+        self.root = root
+        self.quote = m
+
+    def test_call_with_context(self):
+        self.assertIs(self.root(), self.short)
+        self.assertIs(self.root(context={"quote": {"price": 101.}}), self.long)
+        self.assertIs(self.root(), self.short)
+        self.assertEqual(self.data, {"price": 0.})
+
+    def test_nested_bind(self):
+        with self.root.bind(quote={"price": 150.}):
+            self.assertIs(self.root(), self.long)
+            with self.root.bind({self.quote: {"price": 50.}}):
+                self.assertIs(self.root(), self.short)
+            self.assertIs(self.root(), self.long)
+        self.assertIs(self.root(), self.short)
+
+    def test_concurrent_contexts(self):
+        import threading
+        mismatches = []
+
+        def evaluate(price):
+            expected = self.long if price > 100 else self.short
+            for _ in range(500):
+                if self.root(context={"quote": {"price": price}}) is not expected:
+                    mismatches.append(price)
+
+        threads = [threading.Thread(target=evaluate, args=(price,)) for price in (50., 150., 99., 101.)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(mismatches, [])
+
+
 if __name__ == "__main__":
     unittest.main()
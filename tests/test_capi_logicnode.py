@@ -10,8 +10,9 @@ from decision_graph.decision_tree.capi.c_abc import (
     ShortAction,
     LogicGroup,
     TRUE_CONDITION,
-    FALSE_CONDITION, BreakpointNode, NoAction,
+    FALSE_CONDITION, BreakpointNode, NoAction, DEFAULT_ACTION,
 )
+from decision_graph.decision_tree.exc import NodeFrozenError, NodeValueError
 
 
 def node(name: str, v: bool = None):
@@ -298,6 +299,86 @@ def test_build_tree_withctx_inspection_mode_second():
         LGM.inspection_mode = original_mode
 
 
+def test_call_shares_default_action():
+    """Test calls without a default fall back to the shared DEFAULT_ACTION instead of allocating a NoAction."""
+    ln = LogicNode(expression=2, repr='two')
+    ln.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    assert ln() is DEFAULT_ACTION
+    assert ln() is DEFAULT_ACTION
+    assert isinstance(DEFAULT_ACTION, NoAction) and DEFAULT_ACTION.autogen
+    assert not DEFAULT_ACTION.children
+    # the shared node never gets a parent, whichever way it is attached
+    assert DEFAULT_ACTION.shared
+    placeholder = NoAction(auto_connect=False)
+    ln.append(placeholder, FALSE_CONDITION)
+    assert expect_raises(NodeValueError, ln.append, DEFAULT_ACTION)
+    assert expect_raises(NodeValueError, ln.overwrite, DEFAULT_ACTION, FALSE_CONDITION)
+    assert expect_raises(NodeValueError, ln.replace, placeholder, DEFAULT_ACTION)
+    assert DEFAULT_ACTION.parent is None and ln.children[FALSE_CONDITION] is placeholder
+    print("Shared default action test passed.")
+
+
+def test_bounded_logic_group_registry():
+    """Test the LGM registry evicts least recently used groups, and drops collected groups in weak mode."""
+    import gc
+    import time
+    LGM.clear()
+    try:
+        LGM.configure_registry(capacity=2)
+        g1 = LGM('g1', LogicGroup)
+        g2 = LGM('g2', LogicGroup)
+        assert LGM('g1', LogicGroup) is g1  # g1 is now the most recent
+        LGM('g3', LogicGroup)
+        assert g1 in LGM and g2 not in LGM
+        assert LGM('g2', LogicGroup) is not g2
+        assert LGM.registry_stats()['size'] == 2 and LGM.n_registry_evicted == 2
+
+        LGM.configure_registry(ttl=0.01)
+        time.sleep(0.02)
+        assert LGM('g1', LogicGroup) is not g1
+        assert LGM.registry_stats()['size'] == 1
+
+        LGM.configure_registry(weak=True)
+        transient = LGM('transient', LogicGroup)
+        assert LGM('transient', LogicGroup) is transient
+        del transient
+        gc.collect()
+        assert LGM.registry_stats()['size'] == 0
+        print("Bounded logic group registry test passed.")
+    finally:
+        LGM.configure_registry()
+        LGM.clear()
+
+
+def test_freeze():
+    """Test a frozen tree evaluates as before and rejects any further modification."""
+    LGM.clear()
+    root = node('root', True)
+    branch = node('branch', False)
+    short = ShortAction(auto_connect=False)
+    root.append(branch, TRUE_CONDITION)
+    branch.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    branch.append(short, FALSE_CONDITION)
+    assert root() is short
+
+    assert root.freeze() is root
+    assert root.frozen and branch.frozen and short.frozen
+    assert root() is short
+    assert root.eval_recursively()[1][-1] is short
+
+    assert expect_raises(NodeFrozenError, root.append, node('extra'), FALSE_CONDITION)
+    assert expect_raises(NodeFrozenError, branch.overwrite, NoAction(auto_connect=False), TRUE_CONDITION)
+    assert expect_raises(NodeFrozenError, branch.replace, short, NoAction(auto_connect=False))
+    assert expect_raises(NodeFrozenError, lambda: root >> node('chained'))
+    assert branch.children[FALSE_CONDITION] is short
+
+    # unmatched values still fall back to the default
+    fallback = node('fallback', False)
+    fallback.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    assert fallback.freeze()() is DEFAULT_ACTION
+    print("Freeze test passed.")
+
+
 # Simple runner for direct invocation: python tests/test_logicnode.py
 if __name__ == "__main__":
     import inspect
@@ -0,0 +1,306 @@
+import datetime
+import threading
+import unittest
+
+from algo_engine.profile import DefaultProfile
+
+from decision_graph.decision_tree import LGM, LogicNode, LongAction, ShortAction, NoAction, NodeValueError, DEFAULT_ACTION
+from decision_graph.logic_group import interned_action, TradingClock, TimerWheel, SignalLogicGroup, DelayedConfirmationLogicGroup, PendingRequest, RequestState, RequestStatus
+
+DAY = datetime.datetime(2024, 1, 2)
+
+
+def ts(hour: int, minute: int = 0, days: int = 0) -> float:
+    return (DAY + datetime.timedelta(days=days, hours=hour, minutes=minute)).timestamp()
+
+
+class SessionProfile(DefaultProfile):
+    """09:30 - 15:00 with a lunch break, spans across days are counted as one hour."""
+
+    def __init__(self):
+        super().__init__()
+        self.profile_id = 'session'
+        self.session_start = datetime.time(9, 30)
+        self.session_end = datetime.time(15, 0)
+        self.session_break = [(datetime.time(11, 30), datetime.time(13, 0))]
+
+    def trade_time_between(self, start_time, end_time, **kwargs) -> datetime.timedelta:
+        return datetime.timedelta(hours=1)
+
+
+def delayed_group(name: str, **kwargs) -> DelayedConfirmationLogicGroup:
+    with SignalLogicGroup(name=f'{name}.signal') as signal:
+        group = DelayedConfirmationLogicGroup(name=name, parent=signal)
+    for key, value in kwargs.items():
+        setattr(group.req, key, value)
+    return group
+
+
+class TestTradingClock(unittest.TestCase):
+    def setUp(self):
+        self.clock = TradingClock(profile=SessionProfile())
+
+    def test_offset_skips_breaks(self):
+        self.assertEqual(self.clock.offset(ts(9)), (DAY.date(), 0.))
+        self.assertEqual(self.clock.offset(ts(10))[1], 1800.)
+        self.assertEqual(self.clock.offset(ts(12))[1], 7200.)
+        self.assertEqual(self.clock.offset(ts(14))[1], 10800.)
+        self.assertEqual(self.clock.offset(ts(16))[1], 14400.)
+
+    def test_elapsed_within_day(self):
+        since = self.clock.offset(ts(11))
+        self.assertEqual(self.clock.elapsed(since, ts(11), ts(13, 30)), 3600.)
+        self.assertEqual(self.clock.elapsed(since, ts(11), ts(10)), 0.)
+
+    def test_elapsed_across_days_uses_profile(self):
+        since = self.clock.offset(ts(11))
+        self.assertEqual(self.clock.elapsed(since, ts(11), ts(11, days=1)), 3600.)
+
+        clock = TradingClock(profile=DefaultProfile())
+        self.assertEqual(clock.elapsed(clock.offset(ts(11)), ts(11), ts(12, days=1)), 90000.)
+
+
+class TestPendingRequestAcrossDays(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.group = delayed_group('cross_day', timer=None)
+        self.req = self.group.req
+        self.contexts = self.req.logic_group.contexts
+        self.register = self.group.register(1, timeout=60)
+        self.confirm = self.group.confirm(1)
+
+    def test_confirm_next_day(self):
+        self.contexts['timestamp'] = ts(10)
+        self.req.activate(self.register.uid)
+        self.contexts['timestamp'] = ts(10, days=1)
+        self.assertEqual(self.req.confirm(self.confirm.uid).sig, 0)
+        self.assertEqual(self.req.rstatus, RequestStatus.idle)
+
+    def test_expire_next_day(self):
+        self.contexts['timestamp'] = ts(10)
+        self.req.activate(self.register.uid)
+        self.assertFalse(self.req.expire(ts(10) + 30))
+        self.assertTrue(self.req.expire(ts(10, days=1)))
+        self.assertEqual(self.req.rstatus, RequestStatus.idle)
+
+
+class BrokenClock(TradingClock):
+    def elapsed(self, since, since_ts, timestamp) -> float:
+        raise RuntimeError('broken clock')
+
+
+class TestTimerWheel(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.group = delayed_group('wheel')
+        self.wheel = TimerWheel(resolution=1., slots=4, levels=2)
+        self.t0 = ts(10)
+
+    def request(self, timeout: float, clock: TradingClock = None) -> PendingRequest:
+        request = PendingRequest(
+            logic_group=self.group, timer=self.wheel, clock=clock or TradingClock(profile=DefaultProfile()),
+            sig=1, rstatus=RequestStatus.active, activated_ts=self.t0, timeout=timeout
+        )
+        self.wheel.schedule(request, self.t0, timeout)
+        return request
+
+    def run_until(self, seconds: int) -> dict[int, list[PendingRequest]]:
+        # one tick at a time, through the level 0 buckets and the cascades
+        return {i: expired for i in range(1, seconds + 1) if (expired := self.wheel.advance(self.t0 + i))}
+
+    def test_cascade_and_overflow(self):
+        # level 0 spans 4 ticks, level 1 spans 16, beyond is the overflow
+        near, far, beyond = self.request(2), self.request(6), self.request(20)
+        self.assertEqual(self.wheel.n_live, 3)
+        self.assertEqual(self.run_until(24), {2: [near], 6: [far], 20: [beyond]})
+        self.assertEqual(self.wheel.n_live, 0)
+        self.assertEqual(self.wheel.n_expired, 3)
+        self.assertTrue(all(request.rstatus == RequestStatus.idle for request in (near, far, beyond)))
+
+    def test_cancel_and_infinite_timeout(self):
+        cancelled, forever = self.request(3), self.request(float('inf'))
+        self.wheel.cancel(cancelled)
+        self.assertEqual(self.wheel.n_live, 0)
+        self.assertEqual(self.run_until(8), {})
+        self.assertEqual(forever.rstatus, RequestStatus.active)
+
+    def test_sparse_jump(self):
+        due, later = self.request(30), self.request(300)
+        self.assertEqual(self.wheel.advance(self.t0 + 100), [due])
+        self.assertEqual(self.wheel.n_live, 1)
+        self.assertEqual(self.wheel.advance(self.t0 + 299), [])
+        self.assertEqual(self.wheel.advance(self.t0 + 300), [later])
+
+    def test_expiry_errors_are_isolated(self):
+        broken = self.request(2, clock=BrokenClock(profile=DefaultProfile()))
+        healthy = self.request(2)
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual(self.wheel.advance(self.t0 + 2), [healthy])
+        # the failing request stays scheduled, and is retried
+        self.assertEqual(broken.rstatus, RequestStatus.active)
+        self.assertEqual(self.wheel.n_live, 1)
+
+    def test_activation_scheduled_before_advancing(self):
+        group = delayed_group('activation', timer=self.wheel)
+        contexts = group.req.logic_group.contexts
+        broken = self.request(60, clock=BrokenClock(profile=DefaultProfile()))
+        register = group.register(1, timeout=60)
+
+        contexts['timestamp'] = ts(10, days=1)
+        with self.assertLogs(level='ERROR'):
+            group.req.activate(register.uid)
+        self.assertEqual(group.req.rstatus, RequestStatus.active)
+        self.assertEqual(self.wheel.n_live, 2)
+        self.assertEqual(broken.rstatus, RequestStatus.active)
+
+    def test_expiry_recorded_as_deactivation(self):
+        request = self.request(2)
+        self.run_until(2)
+        self.assertEqual(request.rstatus, RequestStatus.idle)
+        self.assertIs(request.deactivated_by, request.expiry_node)
+
+    def test_own_wheel_per_request(self):
+        live, backtest = delayed_group('live'), delayed_group('backtest')
+        self.assertIsNot(live.req.timer, backtest.req.timer)
+        live_register, backtest_register = live.register(1, timeout=60), backtest.register(1, timeout=60)
+
+        live.req.logic_group.contexts['timestamp'] = ts(10, days=30)
+        live.req.activate(live_register.uid)
+        backtest.req.logic_group.contexts['timestamp'] = ts(10)
+        backtest.req.activate(backtest_register.uid)
+        # the backtest request expires on its own time base, not clamped to the live one
+        self.assertEqual(backtest.expire(ts(10) + 60), [backtest.req])
+        self.assertEqual(live.req.rstatus, RequestStatus.active)
+
+    def test_shared_wheel_rejects_time_going_backwards(self):
+        self.request(60)
+        self.wheel.advance(self.t0 + 10)
+        group = delayed_group('behind', timer=self.wheel)
+        register = group.register(1, timeout=60)
+        group.req.logic_group.contexts['timestamp'] = self.t0
+        with self.assertRaises(ValueError):
+            group.req.activate(register.uid)
+        self.assertEqual(group.req.rstatus, RequestStatus.idle)
+        self.assertEqual(self.wheel.n_live, 1)
+
+        # once empty, the wheel follows the time base of the next request
+        self.wheel.clear()
+        self.wheel.advance(self.t0 + 10)
+        group.req.activate(register.uid)
+        self.assertEqual(self.wheel.advance(self.t0 + 60), [group.req])
+
+
+class RacingRequest(PendingRequest):
+    """Runs ``race`` right before its next compare-and-swap, as a concurrent transition would."""
+    race = None
+
+    def compare_and_swap(self, expected, state) -> bool:
+        race, self.race = self.race, None
+        if race is not None:
+            race()
+        return super().compare_and_swap(expected, state)
+
+
+class TestRequestTransitions(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.group = delayed_group('transitions')
+        self.req = self.group.req = RacingRequest(logic_group=self.group, timer=None)
+        self.group.contexts['timestamp'] = ts(10)
+        self.register = self.group.register(1, timeout=60)
+        self.register_short = self.group.register(-1, timeout=60)
+        self.confirm = self.group.confirm(1)
+        self.deny = self.group.deny()
+
+    def test_state_key_access(self):
+        state = self.req.state
+        self.assertIsInstance(state, RequestState)
+        self.assertEqual(state['rstatus'], RequestStatus.idle)
+        self.assertEqual(state['sig'], 0)
+        with self.assertRaises(KeyError):
+            state['missing']
+
+    def test_confirm(self):
+        self.req.activate(self.register.uid)
+        action = self.req.confirm(self.confirm.uid)
+        self.assertIsInstance(action, LongAction)
+        self.assertEqual(action.sig, 1)
+        self.assertEqual(self.req.rstatus, RequestStatus.idle)
+        self.assertIs(self.req.confirmed_by, self.confirm)
+
+    def test_first_activation_wins(self):
+        self.req.race = lambda: self.req.activate(self.register_short.uid)
+        self.req.activate(self.register.uid)
+        self.assertEqual(self.req.sig, -1)
+        self.assertIs(self.req.activated_by, self.register_short)
+
+    def test_lost_confirm_yields_no_action(self):
+        self.req.activate(self.register.uid)
+        self.req.race = lambda: self.req.deactivate(self.deny.uid)
+        action = self.req.confirm(self.confirm.uid)
+        self.assertIsInstance(action, NoAction)
+        self.assertIs(self.req.deactivated_by, self.deny)
+        self.assertIsNone(self.req.confirmed_by)
+
+    def test_confirm_retries_on_a_concurrent_swap(self):
+        self.req.activate(self.register.uid)
+        # a transition keeping the request active, e.g. a concurrent expiry rescheduling it, forces a retry
+        self.req.race = lambda: super(RacingRequest, self.req).compare_and_swap(self.req.state, RequestState(
+            sig=1, rstatus=RequestStatus.active, activated_ts=ts(10), timeout=60
+        ))
+        self.assertIsInstance(self.req.confirm(self.confirm.uid), LongAction)
+
+    def test_expire_loses_to_confirm(self):
+        self.req.activate(self.register.uid)
+        self.req.race = lambda: self.req.confirm(self.confirm.uid)
+        self.assertFalse(self.req.expire(ts(11)))
+        self.assertIs(self.req.confirmed_by, self.confirm)
+
+    def test_single_confirmation_across_threads(self):
+        self.req.activate(self.register.uid)
+        barrier = threading.Barrier(8)
+        signals = []
+
+        def confirm():
+            barrier.wait()
+            # a confirmation arriving after the winner committed finds the request inactive
+            try:
+                signals.append(self.req.confirm(self.confirm.uid).sig)
+            except NodeValueError:
+                signals.append(0)
+
+        threads = [threading.Thread(target=confirm) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(signals), [0] * 7 + [1])
+
+
+class TestInternedAction(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+
+    def test_shared_per_type_and_signal(self):
+        self.assertIs(interned_action(LongAction, 1), interned_action(LongAction, 1))
+        self.assertIsNot(interned_action(LongAction, 1), interned_action(ShortAction, -1))
+        self.assertEqual(interned_action(ShortAction, -1).sig, -1)
+        self.assertIs(interned_action(NoAction, 0), DEFAULT_ACTION)
+
+    def test_built_outside_active_group(self):
+        with SignalLogicGroup(name='grpX'):
+            action = interned_action(LongAction, 7)
+            self.assertEqual(action.labels, [])
+            self.assertEqual(LGM.active_group.name, 'grpX')
+        self.assertIsNone(action.parent)
+
+    def test_not_attachable(self):
+        action = interned_action(ShortAction, -2)
+        self.assertTrue(action.shared)
+        with self.assertRaises(NodeValueError):
+            LogicNode(expression=True).append(action)
+        self.assertIsNone(action.parent)
+
+
+if __name__ == '__main__':
+    unittest.main()
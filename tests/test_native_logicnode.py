@@ -10,8 +10,9 @@ from decision_graph.decision_tree.native.abc import (
     ShortAction,
     LogicGroup,
     TRUE_CONDITION,
-    FALSE_CONDITION, BreakpointNode, NoAction,
+    FALSE_CONDITION, BreakpointNode, NoAction, DEFAULT_ACTION, LogicExpression,
 )
+from decision_graph.decision_tree.exc import NodeFrozenError, NodeValueError
 
 
 def node(name: str, v: bool = None):
@@ -299,6 +300,416 @@ def test_build_tree_withctx_inspection_mode_second():
         LGM.inspection_mode = original_mode
 
 
+def test_deduplicate_identical_subtrees():
+    """Test merging structurally identical subtrees keeps the evaluation result."""
+    def subtree():
+        ln = LogicNode(expression=True, dtype=bool, repr='sub')
+        ln.append(LongAction(auto_connect=False), TRUE_CONDITION)
+        ln.append(ShortAction(auto_connect=False), FALSE_CONDITION)
+        return ln
+
+    root = LogicNode(expression=False, dtype=bool, repr='root')
+    root.append(subtree(), TRUE_CONDITION)
+    root.append(subtree(), FALSE_CONDITION)
+    expected = root()
+
+    # the subtree roots differ in their edge condition, only the action leaves are shared
+    assert root.deduplicate() == 2
+    sub_true = root.children[TRUE_CONDITION]
+    sub_false = root.children[FALSE_CONDITION]
+    assert sub_true is not sub_false
+    assert sub_true.children[TRUE_CONDITION] is sub_false.children[TRUE_CONDITION]
+    assert sub_true.children[FALSE_CONDITION] is sub_false.children[FALSE_CONDITION]
+    assert root().repr == expected.repr
+    assert root.deduplicate() == 0
+
+    class TaggedAction(LongAction):
+        pass
+
+    def pair(build):
+        ln = LogicNode(expression=False, dtype=bool, repr='pair')
+        for condition in (TRUE_CONDITION, FALSE_CONDITION):
+            branch = LogicNode(expression=True, dtype=bool, repr=f"branch {condition}")
+            branch.append(build(), TRUE_CONDITION)
+            ln.append(branch, condition)
+        return ln.deduplicate()
+
+    assert pair(lambda: LongAction(auto_connect=False)) == 1
+    # subclasses defined outside the package and nodes of different logic groups are never merged
+    assert pair(lambda: TaggedAction(auto_connect=False)) == 0
+    groups = iter((group('g1'), group('g2')))
+
+    def labelled():
+        with next(groups):
+            return LongAction(auto_connect=False)
+
+    assert pair(labelled) == 0
+    print("Deduplicate identical subtrees test passed.")
+
+
+def test_eval_incremental_restarts_from_changed_node():
+    """Test incremental evaluation only restarts below unaffected decisions."""
+    from decision_graph.decision_tree.native import RootLogicNode
+
+    state = {'a': 1}
+    root = RootLogicNode()
+    volatile = LogicNode(expression=lambda: state['a'] > 0, dtype=bool, repr='volatile')
+    root.append(volatile)
+    volatile.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    volatile.append(ShortAction(auto_connect=False), FALSE_CONDITION)
+
+    assert root.dependencies == frozenset()
+    assert volatile.dependencies is None
+    assert isinstance(root(), LongAction)
+
+    state['a'] = -1
+    assert isinstance(root.eval_incremental(['a']), ShortAction)
+    assert len(root.eval_path) == 3
+    assert root.eval_path[1] is volatile
+    print("Eval incremental test passed.")
+
+
+def test_observable_mapping_triggers_callback():
+    """Test writes to a subscribed LogicMapping re-evaluate the tree and report action changes."""
+    from decision_graph.decision_tree.native import RootLogicNode, LogicMapping
+
+    mapping = LogicMapping(name='observable', data={'a': 1})
+    root = RootLogicNode()
+    volatile = LogicNode(expression=lambda: mapping.data['a'] > 0, dtype=bool, repr='volatile')
+    root.append(volatile)
+    volatile.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    volatile.append(ShortAction(auto_connect=False), FALSE_CONDITION)
+
+    events = []
+    mapping.subscribe(root, lambda r, value, previous: events.append((value, previous)))
+    mapping['a'] = 2
+    mapping['a'] = 3
+    mapping.update(a=-1)
+    assert len(events) == 2
+    assert isinstance(events[0][0], LongAction) and events[0][1] is None
+    assert isinstance(events[1][0], ShortAction) and events[1][1] is events[0][0]
+
+    mapping.unsubscribe(root)
+    mapping['a'] = 1
+    assert len(events) == 2
+    print("Observable mapping test passed.")
+
+
+def test_default_fallback_warning_rate_limited():
+    """Test repeated default fallbacks are counted but only logged once per interval."""
+    log_interval = LGM.log_interval
+    LGM.reset_stats()
+    LGM.log_interval = 3600.
+    try:
+        ln = LogicNode(expression=2, repr='two')
+        ln.append(LongAction(auto_connect=False), TRUE_CONDITION)
+        for _ in range(5):
+            value, _ = ln.eval_recursively(default=None)
+            assert value is None
+        assert LGM.stats() == {'default_fallback': 5, 'dtype_mismatch': 0, 'suppressed_logs': 4}
+
+        # the window lives on the node and restarts on clear, fresh nodes are never throttled by released ones
+        LGM.clear()
+        ln.eval_recursively(default=None)
+        for _ in range(5):
+            LogicExpression(expression=1.5, dtype=int, repr='mismatch').eval()
+        assert LGM.stats()['suppressed_logs'] == 4
+        print("Default fallback rate limit test passed.")
+    finally:
+        LGM.log_interval = log_interval
+        LGM.reset_stats()
+
+
+def test_vigilant_mode_structured_error():
+    """Test vigilant mode attaches the failing node, path and cause to the evaluation error."""
+    from decision_graph.decision_tree.exc import ExpressEvaluationError
+
+    original_mode = LGM.vigilant_mode
+    LGM.vigilant_mode = True
+    try:
+        root = LogicNode(expression=True, repr='root')
+        failing = LogicNode(expression=lambda: 1 / 0, repr='failing')
+        root.append(failing, TRUE_CONDITION)
+        expect_raises(ExpressEvaluationError, root.eval_recursively, [])
+        try:
+            root.eval_recursively([])
+        except ExpressEvaluationError as e:
+            assert e.node is failing
+            assert [n.repr for n in e.path] == ['root', 'failing']
+            assert isinstance(e.exception, ZeroDivisionError)
+            assert 'root -> failing' in str(e)
+        print("Vigilant mode structured error test passed.")
+    finally:
+        LGM.vigilant_mode = original_mode
+
+
+def test_call_shares_default_action():
+    """Test calls without a default fall back to the shared DEFAULT_ACTION instead of allocating a NoAction."""
+    ln = LogicNode(expression=2, repr='two')
+    ln.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    assert ln() is DEFAULT_ACTION
+    assert ln() is DEFAULT_ACTION
+    assert isinstance(DEFAULT_ACTION, NoAction) and DEFAULT_ACTION.autogen
+    assert not DEFAULT_ACTION.children
+    # the shared node never gets a parent, whichever way it is attached
+    assert DEFAULT_ACTION.shared
+    placeholder = NoAction(auto_connect=False)
+    ln.append(placeholder, FALSE_CONDITION)
+    assert expect_raises(NodeValueError, ln.append, DEFAULT_ACTION)
+    assert expect_raises(NodeValueError, ln.overwrite, DEFAULT_ACTION, FALSE_CONDITION)
+    assert expect_raises(NodeValueError, ln.replace, placeholder, DEFAULT_ACTION)
+    assert DEFAULT_ACTION.parent is None and ln.children[FALSE_CONDITION] is placeholder
+    print("Shared default action test passed.")
+
+
+def test_bounded_logic_group_registry():
+    """Test the LGM registry evicts least recently used groups, and drops collected groups in weak mode."""
+    import gc
+    import time
+    LGM.clear()
+    try:
+        LGM.configure_registry(capacity=2)
+        g1 = LGM('g1', LogicGroup)
+        g2 = LGM('g2', LogicGroup)
+        assert LGM('g1', LogicGroup) is g1  # g1 is now the most recent
+        LGM('g3', LogicGroup)
+        assert g1 in LGM and g2 not in LGM
+        assert LGM('g2', LogicGroup) is not g2
+        assert LGM.registry_stats()['size'] == 2 and LGM.n_registry_evicted == 2
+
+        LGM.configure_registry(ttl=0.01)
+        time.sleep(0.02)
+        assert LGM('g1', LogicGroup) is not g1
+        assert LGM.registry_stats()['size'] == 1
+
+        LGM.configure_registry(weak=True)
+        transient = LGM('transient', LogicGroup)
+        assert LGM('transient', LogicGroup) is transient
+        del transient
+        gc.collect()
+        assert LGM.registry_stats()['size'] == 0
+        print("Bounded logic group registry test passed.")
+    finally:
+        LGM.configure_registry()
+        LGM.clear()
+
+
+def test_freeze():
+    """Test a frozen tree evaluates as before and rejects any further modification."""
+    LGM.clear()
+    root = node('root', True)
+    branch = node('branch', False)
+    short = ShortAction(auto_connect=False)
+    root.append(branch, TRUE_CONDITION)
+    branch.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    branch.append(short, FALSE_CONDITION)
+    assert root() is short
+
+    assert root.freeze() is root
+    assert root.frozen and branch.frozen and short.frozen
+    assert root() is short
+    assert root.eval_recursively()[1][-1] is short
+
+    assert expect_raises(NodeFrozenError, root.append, node('extra'), FALSE_CONDITION)
+    assert expect_raises(NodeFrozenError, branch.overwrite, NoAction(auto_connect=False), TRUE_CONDITION)
+    assert expect_raises(NodeFrozenError, branch.replace, short, NoAction(auto_connect=False))
+    assert expect_raises(NodeFrozenError, lambda: root >> node('chained'))
+    assert branch.children[FALSE_CONDITION] is short
+
+    # unmatched values still fall back to the default
+    fallback = node('fallback', False)
+    fallback.append(LongAction(auto_connect=False), TRUE_CONDITION)
+    assert fallback.freeze()() is DEFAULT_ACTION
+    print("Freeze test passed.")
+
+
+def test_mapping_schema():
+    """Test frozen reads of declared keys follow every write, through the mapping or its data view."""
+    from decision_graph.decision_tree.native.node import RootLogicNode
+    from decision_graph.decision_tree.native.collection import LogicMapping
+    LGM.clear()
+    data = {"a": 2, "b": {"x": 5}}
+    with RootLogicNode() as root:
+        with LogicMapping(name="m", data=data, schema=("a", "b")) as m:
+            with (m.a > 1) & (m.b.x > 4):
+                long = LongAction()
+                short = ShortAction()
+    root.freeze()
+    assert m.schema == ("a", "b") and root() is long
+    m["a"] = 0
+    assert root() is short
+    m.set_row([3, {"x": 5}])
+    assert root() is long and m.data == {"a": 3, "b": {"x": 5}}
+    m.data["a"] = 0
+    assert root() is short
+    m.data.update(a=5, c=1)
+    assert root() is long and m._values == [5, {"x": 5}]
+    # the dict passed in is copied into the slots
+    assert data == {"a": 2, "b": {"x": 5}}
+    del m.data["a"]
+    assert expect_raises(KeyError, root)
+    assert dict(m.data) == {"b": {"x": 5}, "c": 1} and len(m.data) == 2 and "a" not in m.data
+    assert expect_raises(ValueError, m.set_row, [1])
+    assert expect_raises(ValueError, LogicMapping, name="duplicated", schema=("a", "a"))
+    print("Mapping schema test passed.")
+
+
+def test_stream():
+    """Test stream() pulls the source once per batch, evaluates one context per item asked for, and closes the source when stopped."""
+    from decision_graph.decision_tree.native.node import RootLogicNode
+    from decision_graph.decision_tree.native.collection import LogicMapping
+    LGM.clear()
+    with RootLogicNode() as root:
+        with LogicMapping(name="m", data={"a": 0}) as m:
+            with m.a > 1:
+                long = LongAction()
+                short = ShortAction()
+
+    pulled = []
+
+    def source(values):
+        for value in values:
+            pulled.append(value)
+            if value is None:
+                m["a"] = 3
+            yield None if value is None else {"m": {"a": value}}
+
+    results = list(root.stream(source([2, 0, None]), batch=1))
+    assert results == [(0, long), (1, short), (2, long)]
+
+    feed = source(range(100))
+    stream = root.stream(feed, batch=1)
+    assert next(stream) == (0, short) and pulled[3:] == [0]
+    assert next(stream) == (1, short) and pulled[3:] == [0, 1]
+    stream.close()
+    assert expect_raises(StopIteration, next, feed)
+
+    del pulled[:]
+    stream = root.stream(source(range(5)), batch=4)
+    assert next(stream) == (0, short) and pulled == [0, 1, 2, 3]
+    assert [len(pulled) for _ in stream] == [4, 4, 4, 5]
+    assert expect_raises(ValueError, root.stream, [], batch=0)
+
+    stream = root.stream([{"m": {"a": 2}}, "a"])
+    assert next(stream) == (0, long)
+    assert expect_raises(TypeError, next, stream)
+    print("Stream test passed.")
+
+
+def test_context_binding():
+    """Test contexts bound per evaluation, nested and across threads, leave the data of the groups untouched."""
+    import threading
+    from decision_graph.decision_tree.native.node import RootLogicNode
+    from decision_graph.decision_tree.native.collection import LogicMapping
+    LGM.clear()
+    data = {'price': 0.}
+    with RootLogicNode() as root:
+        with LogicMapping(name='quote', data=data) as quote:
+            with quote.price > 100:
+                long = LongAction()
+                short = ShortAction()
+
+    assert root() is short
+    assert root(context={'quote': {'price': 101.}}) is long
+    assert root() is short and data == {'price': 0.}
+
+    with root.bind(quote={'price': 150.}):
+        assert root() is long
+        with root.bind({quote: {'price': 50.}}):
+            assert root() is short
+        assert root() is long
+    assert root() is short
+
+    mismatches = []
+
+    def evaluate(price):
+        expected = long if price > 100 else short
+        for _ in range(200):
+            if root(context={'quote': {'price': price}}) is not expected:
+                mismatches.append(price)
+
+    threads = [threading.Thread(target=evaluate, args=(price,)) for price in (50., 150., 99., 101.)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert mismatches == []
+    print("Context binding test passed.")
+
+
+def test_logic_record():
+    """Test the fields of a LogicRecord follow its cursor, in plain and frozen trees."""
+    import numpy as np
+    from decision_graph.decision_tree.native.node import RootLogicNode
+    from decision_graph.decision_tree.native.collection import LogicRecord
+    LGM.clear()
+    quotes = np.zeros(3, dtype=[('price', '<f8'), ('qty', '<i4'), ('sym', 'S4'), ('seq', '>i8')])
+    quotes['price'] = [10.5, 9.5, 11.0]
+    quotes['qty'] = [100, 200, 0]
+    quotes['sym'] = [b'ab', b'abcd', b'x']
+    quotes['seq'] = [1, 2, 3]
+    with RootLogicNode() as root:
+        with LogicRecord(name='q', data=quotes) as q:
+            with (q.price > 10) & (q.qty > 0):
+                long = LongAction()
+                short = ShortAction()
+
+    assert len(q) == 3 and 'sym' in q and 'missing' not in q
+    for i in range(3):
+        q.seek(i)
+        assert [q[key].eval() for key in q.schema] == list(quotes[i].item())
+
+    for tree in (root, root.freeze()):
+        q.seek(0)
+        assert tree() is long
+        assert q.advance() and tree() is short
+        assert q.advance() and tree() is short
+        assert not q.advance() and q.index == 2
+
+    # reads are zero-copy, in-place writes to the array are visible
+    quotes['qty'][2] = 1
+    assert root() is long
+    assert expect_raises(IndexError, q.seek, 3)
+    assert expect_raises(ValueError, LogicRecord, name='strided', data=quotes[::2])
+    print("Logic record test passed.")
+
+
+def test_async_eval():
+    """Test aeval awaits awaitable expressions, gathers the operands of a node and matches the sync result."""
+    import asyncio
+    from decision_graph.decision_tree.native.node import RootLogicNode, ComparisonExpression, ComparisonExpressionOperator
+    from decision_graph.decision_tree.native.collection import LogicMapping
+    LGM.clear()
+    calls = []
+
+    async def lookup(name, value):
+        calls.append(name)
+        await asyncio.sleep(0)
+        return value
+
+    with RootLogicNode() as root:
+        with LogicMapping(name='m', data={'a': 2}) as m:
+            risk = LogicNode(expression=lambda: lookup('risk', 3), repr='risk')
+            cached = LogicNode(expression=lambda: lookup('cache', 7), repr='cache')
+            limit = LogicNode(expression=lambda: 5, repr='limit')
+            with (m.a < risk) & ComparisonExpression(left=cached, op=ComparisonExpressionOperator.gt, right=limit, logic_group=m):
+                with LogicNode(expression=lambda: lookup('flag', True), repr='flag'):
+                    long = LongAction()
+                short = ShortAction()
+
+    assert asyncio.run(root.aeval()) is long
+    # the operands of the first node are awaited before the branch below it
+    assert sorted(calls[:2]) == ['cache', 'risk'] and calls[2:] == ['flag']
+    assert root.eval_path[-1] is long
+    assert asyncio.run(root.aeval(context={'m': {'a': 4}})) is short
+
+    async def main():
+        return await asyncio.gather(*(root.aeval(context={'m': {'a': a}}) for a in (0, 4, 1)))
+
+    assert asyncio.run(main()) == [long, short, long]
+    print("Async eval test passed.")
+
+
 # Simple runner for direct invocation: python tests/test_logicnode.py
 if __name__ == "__main__":
     import inspect
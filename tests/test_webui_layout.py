@@ -0,0 +1,183 @@
+import gzip
+import json
+import sys
+import unittest
+import zlib
+
+from decision_graph.decision_tree import RootLogicNode, LogicNode, LogicMapping, LongAction, ShortAction, LGM, TRUE_CONDITION
+from decision_graph.decision_tree.webui.app import DecisionTreeWebUi
+
+
+def decode_columnar(document):
+    nodes = []
+    inactive, has_more = set(document["inactive"]), set(document["has_more"])
+    for i, parent in enumerate(document["parent"]):
+        node_obj = {
+            "id": document["ids"][i],
+            "name": document["name"][i],
+            "repr": document["repr"][i],
+            "type": document["types"][document["type"][i]],
+            "labels": document["label_sets"][document["labels"][i]],
+            "autogen": bool(document["autogen"][i]),
+            "_children": [],
+            "activated": i not in inactive,
+        }
+        if document["condition"][i] >= 0:
+            node_obj["condition_to_child"], node_obj["condition_type"] = document["conditions"][document["condition"][i]]
+        if i in has_more:
+            node_obj["has_more"] = True
+        nodes.append(node_obj)
+        if parent >= 0:
+            nodes[parent]["_children"].append(node_obj)
+    links = document["links"]
+    virtual_links = [
+        {"source": document["ids"][s], "target": document["ids"][t], "type": document["link_types"][k]}
+        for s, t, k in zip(links["source"], links["target"], links["type"])
+    ]
+    return {"root": nodes[0], "virtual_links": virtual_links}
+
+
+class TestTreeLayout(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2}
+        with RootLogicNode() as root:
+            with LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    LongAction()
+                    ShortAction()
+        self.root = root
+        self.root()
+        self.ui = DecisionTreeWebUi(host="127.0.0.1", port=5000, debug=False)
+
+    def test_encode_matches_json_dumps(self):
+        tree_data = DecisionTreeWebUi._convert_tree_to_d3_format(self.root, {str(n.uid) for n in self.root.eval_path})
+        self.assertEqual(json.loads(DecisionTreeWebUi._encode_tree(tree_data)), json.loads(json.dumps(tree_data)))
+
+    def test_deep_tree_beyond_recursion_limit(self):
+        root = RootLogicNode()
+        node = root
+        depth = sys.getrecursionlimit() * 2
+        for i in range(depth):
+            child = LogicNode(expression=True, repr=f"n{i}")
+            node.append(child, TRUE_CONDITION) if i else node.append(child)
+            node = child
+
+        tree_data = DecisionTreeWebUi._convert_tree_to_d3_format(root)
+        payload = DecisionTreeWebUi._encode_tree(tree_data)
+
+        n = 0
+        node_obj = tree_data["root"]
+        while node_obj["_children"]:
+            node_obj = node_obj["_children"][0]
+            self.assertEqual(node_obj["condition_type"], "unconditional" if n == 0 else "true")
+            n += 1
+        self.assertEqual(n, depth)
+        self.assertIn(node_obj["id"].encode(), payload)
+
+    def test_layout_cached_per_structure_version(self):
+        payload = self.ui._load_tree(self.root)
+        self.assertIs(self.ui._load_tree(self.root), payload)
+
+        # evaluation does not invalidate the layout
+        self.data["a"] = 0
+        self.root()
+        self.assertIs(self.ui._load_tree(self.root), payload)
+
+        extra = LogicNode(expression=True, repr="extra")
+        action = self.root.eval_path[-1]
+        self.root.eval_path[-2].overwrite(extra, action.condition_to_parent)
+        updated = self.ui._load_tree(self.root)
+        self.assertIsNot(updated, payload)
+        self.assertIn(str(extra.uid).encode(), updated)
+
+    def test_api_tree_data_ships_activation_separately(self):
+        self.ui.tree_root = self.root
+        self.ui.current_active_ids = [str(n.uid) for n in self.root.eval_path]
+        client = self.ui.app.test_client()
+
+        response = client.get("/api/tree_data")
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.data)
+        self.assertEqual(body["tree_id"], str(self.root.uid))
+        self.assertEqual(body["active_ids"], self.ui.current_active_ids)
+        self.assertTrue(body["tree_data"]["root"]["activated"])
+
+    def test_initial_layout_bounded(self):
+        ui = DecisionTreeWebUi(host="127.0.0.1", port=5000, debug=False, max_initial_nodes=3)
+        ui._load_tree(self.root)
+        index, level_sizes = ui._index_tree(self.root)
+        self.assertEqual(sum(level_sizes), len(index))
+
+        n_nodes, cut = 0, []
+        stack = [ui.current_tree_data["root"]]
+        while stack:
+            node_obj = stack.pop()
+            n_nodes += 1
+            if node_obj.get("has_more"):
+                cut.append(node_obj["id"])
+            stack.extend(node_obj["_children"])
+        self.assertLessEqual(n_nodes, 3)
+        self.assertEqual(len(cut), 1)
+
+        # the cut node is expanded on demand
+        ui.tree_root = self.root
+        client = ui.app.test_client()
+        body = json.loads(client.get(f"/api/subtree/{cut[0]}?depth=1").data)
+        subtree = body["tree_data"]["root"]
+        self.assertEqual(subtree["id"], cut[0])
+        self.assertEqual(len(subtree["_children"]), len(index[cut[0]].children))
+        self.assertFalse(any(child.get("has_more") for child in subtree["_children"]))
+
+        self.assertEqual(client.get("/api/subtree/unknown").status_code, 404)
+
+    def test_columnar_round_trip(self):
+        self.root.deduplicate()
+        tree_data = DecisionTreeWebUi._convert_tree_to_d3_format(self.root, {str(n.uid) for n in self.root.eval_path})
+        document = json.loads(DecisionTreeWebUi._encode_columnar(tree_data))
+        self.assertEqual(document["format"], "columnar")
+        self.assertEqual(decode_columnar(document), json.loads(json.dumps(tree_data)))
+
+    def test_api_tree_data_compressed(self):
+        self.ui.tree_root = self.root
+        self.ui.current_active_ids = [str(n.uid) for n in self.root.eval_path]
+        self.ui.min_compress_size = 0
+        client = self.ui.app.test_client()
+        plain = client.get("/api/tree_data").data
+
+        for _ in range(2):
+            response = client.get("/api/tree_data", headers={"Accept-Encoding": "gzip"})
+            self.assertEqual(response.headers["Content-Encoding"], "gzip")
+            self.assertEqual(gzip.decompress(response.data), plain)
+
+        # the activation tail is compressed per request
+        self.ui.current_active_ids = []
+        response = client.get("/api/tree_data", headers={"Accept-Encoding": "deflate"})
+        self.assertEqual(response.headers["Content-Encoding"], "deflate")
+        self.assertEqual(json.loads(zlib.decompress(response.data))["active_ids"], [])
+
+        response = client.get("/api/tree_data?format=columnar", headers={"Accept-Encoding": "gzip"})
+        body = json.loads(gzip.decompress(response.data))
+        self.assertEqual(decode_columnar(body["tree_data"]), json.loads(plain)["tree_data"])
+        self.assertEqual(client.get("/api/tree_data?format=xml").status_code, 400)
+
+    def test_api_tree_data_small_uncompressed(self):
+        self.ui.tree_root = self.root
+        client = self.ui.app.test_client()
+        plain = client.get("/api/tree_data").data
+        self.ui.min_compress_size = len(plain) + 1
+        response = client.get("/api/tree_data", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.data, plain)
+        # from the threshold on, the response is compressed
+        self.ui.min_compress_size = len(plain)
+        response = client.get("/api/tree_data", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+
+    def test_api_tree_data_empty(self):
+        client = self.ui.app.test_client()
+        self.assertEqual(client.get("/api/tree_data").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
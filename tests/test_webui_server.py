@@ -0,0 +1,168 @@
+import gzip
+import json
+import subprocess
+import sys
+import threading
+import types
+import unittest
+import unittest.mock
+import urllib.error
+import urllib.request
+
+from decision_graph.decision_tree import RootLogicNode, LogicMapping, LongAction, ShortAction, LGM
+from decision_graph.decision_tree.webui.app import DecisionTreeWebUi, EvalPathBroadcaster
+from decision_graph.decision_tree.webui import server
+from decision_graph.decision_tree.webui.server import WebUiHTTPServer, render_index
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_webui_not_imported_with_package(self):
+        code = (
+            "import sys, decision_graph.decision_tree as dt\n"
+            "assert not any('webui' in m for m in sys.modules), 'webui imported eagerly'\n"
+            "assert dt.show is dt.webui.show\n"
+            "assert 'decision_graph.decision_tree.webui' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+
+
+class TestEvalPathBroadcaster(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2}
+        with RootLogicNode() as root:
+            with LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    LongAction()
+                    ShortAction()
+        self.root = root
+        self.root()
+
+    def test_publish_compares_under_lock(self):
+        broadcaster = EvalPathBroadcaster(self.root)
+        q = broadcaster.register()
+        initial = list(self.root.eval_path)
+        self.data["a"] = 0
+        self.root()
+
+        # a publisher of the initial path arrives while the new one is being diffed, it must not compare a stale path
+        racer = threading.Thread(target=broadcaster.publish, args=(types.SimpleNamespace(eval_path=initial),))
+        node_ids = broadcaster._node_ids
+
+        def diffing(path):
+            if racer.ident is None:
+                racer.start()
+                racer.join(0.1)
+            return node_ids(path)
+
+        broadcaster._node_ids = diffing
+        broadcaster.publish()
+        racer.join()
+        self.assertEqual(broadcaster._last_path, initial)
+        # the snapshot of the registration, then both diffs
+        self.assertTrue(json.loads(q.get_nowait())["reset"])
+        diffs = [json.loads(q.get_nowait()) for _ in range(2)]
+        self.assertEqual((diffs[0]["added"], diffs[0]["removed"]), (diffs[1]["removed"], diffs[1]["added"]))
+        self.assertTrue(q.empty())
+
+
+class TestStdlibServer(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2}
+        with RootLogicNode() as root:
+            with LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    LongAction()
+                    ShortAction()
+        self.root = root
+        self.root()
+
+        self.ui = DecisionTreeWebUi(host="127.0.0.1", port=0, debug=False, backend="stdlib")
+        self.ui.tree_root = self.root
+        self.ui.node = self.root
+        self.ui.with_eval = True
+        self.ui.with_watch = True
+        self.ui.watch_interval = 0.05
+        self.ui.broadcaster = EvalPathBroadcaster(self.root)
+        self.root.add_listener(self.ui.broadcaster.publish)
+
+        self.server = WebUiHTTPServer(self.ui, ("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.root.remove_listener(self.ui.broadcaster.publish)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path: str, **headers):
+        return urllib.request.urlopen(urllib.request.Request(self.url + path, headers=headers), timeout=5)
+
+    def test_no_flask_app(self):
+        self.assertIsNone(self.ui.app)
+
+    def test_index(self):
+        page = self.get("/").read().decode()
+        self.assertNotIn("{{", page)
+        self.assertIn("/static/script.js", page)
+        self.assertIn("window.with_watch = true;", page)
+        self.assertEqual(page, render_index(self.ui._index_context()))
+
+    def test_tree_data(self):
+        plain = json.loads(self.get("/api/tree_data").read())
+        self.assertEqual(plain["tree_id"], str(self.root.uid))
+        self.assertEqual(set(plain["active_ids"]), {str(n.uid) for n in self.root.eval_path})
+
+        response = self.get("/api/tree_data", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(response.read())), plain)
+
+    def test_subtree_and_static(self):
+        node_id = str(self.root.uid)
+        body = json.loads(self.get(f"/api/subtree/{node_id}?depth=0").read())
+        self.assertTrue(body["tree_data"]["root"]["has_more"])
+        self.assertIn("javascript", self.get("/static/script.js").headers["Content-Type"])
+
+        for path in ("/api/subtree/unknown", "/static/../app.py", "/missing"):
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                self.get(path)
+            self.assertEqual(ctx.exception.code, 404)
+
+    def test_watch_stream(self):
+        response = self.get("/watch")
+        self.assertEqual(response.headers["Content-Type"], "text/event-stream")
+        snapshot = json.loads(response.readline().decode()[len("data: "):])
+        self.assertTrue(snapshot["reset"])
+        response.close()
+
+
+class TestRenderIndex(unittest.TestCase):
+    context = dict(
+        initial_tree_json='{"name": "<a & \'b\'>"}', active_ids=["x'<y>", "z&"], tree_id='t"1\'',
+        with_eval=True, with_watch=False
+    )
+
+    def test_every_expression_rendered_without_jinja(self):
+        # fails as soon as index.html uses an expression the stdlib renderer has no mapping for
+        page = server._render_index_stdlib(self.context)
+        self.assertNotIn("{{", page)
+        self.assertIn("window.with_eval = true;", page)
+        self.assertIn("window.with_watch = false;", page)
+
+        template = server._index_template() + "{{ unmapped }}"
+        with unittest.mock.patch.object(server, "_index_template", lambda: template):
+            with self.assertRaisesRegex(KeyError, "unmapped"):
+                server._render_index_stdlib(self.context)
+
+    def test_matches_jinja(self):
+        if server._jinja_environment() is None:
+            self.skipTest("Jinja is not installed")
+        self.assertEqual(render_index(self.context), server._render_index_stdlib(self.context))
+        with unittest.mock.patch.object(server, "_jinja_environment", lambda: None):
+            self.assertEqual(render_index(self.context), server._render_index_stdlib(self.context))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import unittest
+
+from decision_graph.decision_tree import RootLogicNode, LogicMapping, LongAction, ShortAction, LGM
+from decision_graph.decision_tree.webui.app import EvalPathBroadcaster, DecisionTreeWebUi
+
+
+class TestEvalPathBroadcaster(unittest.TestCase):
+    def setUp(self):
+        LGM.clear()
+        self.data = {"a": 2}
+        with RootLogicNode() as root:
+            with LogicMapping(name="m", data=self.data) as m:
+                with m.a > 1:
+                    LongAction()
+                    ShortAction()
+        self.root = root
+        self.root()
+        self.broadcaster = EvalPathBroadcaster(root, maxsize=2)
+        root.add_listener(self.broadcaster.publish)
+
+    def tearDown(self):
+        self.root.remove_listener(self.broadcaster.publish)
+
+    def test_register_starts_with_snapshot(self):
+        q = self.broadcaster.register()
+        snapshot = json.loads(q.get_nowait())
+        self.assertTrue(snapshot["reset"])
+        self.assertEqual(set(snapshot["added"]), {str(n.uid) for n in self.root.eval_path})
+
+    def test_publish_on_path_change_only(self):
+        q = self.broadcaster.register()
+        q.get_nowait()
+
+        self.root()
+        self.assertTrue(q.empty())
+
+        self.data["a"] = 0
+        self.root()
+        diff = json.loads(q.get_nowait())
+        self.assertEqual(len(diff["added"]), 1)
+        self.assertEqual(len(diff["removed"]), 1)
+        self.assertEqual(diff["added"], [str(self.root.eval_path[-1].uid)])
+
+    def test_lagging_client_resynced(self):
+        q = self.broadcaster.register()
+        for a in (0, 2, 0, 2):
+            self.data["a"] = a
+            self.root()
+        self.assertEqual(q.qsize(), 1)
+        snapshot = json.loads(q.get_nowait())
+        self.assertTrue(snapshot["reset"])
+        self.assertEqual(set(snapshot["added"]), {str(n.uid) for n in self.root.eval_path})
+
+    def test_unregister(self):
+        q = self.broadcaster.register()
+        self.assertEqual(self.broadcaster.n_clients, 1)
+        self.broadcaster.unregister(q)
+        self.assertEqual(self.broadcaster.n_clients, 0)
+
+    def test_uid_cache_dropped_on_structure_change(self):
+        self.data["a"] = 0
+        self.root()
+        short = self.root.eval_path[-1]
+        replacement = ShortAction(auto_connect=False)
+        short.parent.replace(short, replacement)
+        self.root()
+        # only the nodes of the current tree are cached
+        self.assertEqual(set(self.broadcaster._uid_cache), {id(n) for n in self.root.eval_path})
+        self.assertIn(str(replacement.uid), self.broadcaster.activated)
+
+    def test_watch_replaces_listener(self):
+        ui = DecisionTreeWebUi(host="127.0.0.1", port=0, debug=False, backend="stdlib")
+        # no server or browser, only the listener wiring is under test
+        ui._serve = lambda port, block=True: None
+        ui._open_browser = lambda url: None
+        ui.watch(self.root)
+        first = ui.broadcaster
+        ui.watch(self.root)
+        self.assertIsNot(ui.broadcaster, first)
+
+        q = first.register()
+        q.get_nowait()
+        self.data["a"] = 0
+        self.root()
+        self.assertTrue(q.empty())
+        self.root.remove_listener(ui.broadcaster.publish)
+
+
+if __name__ == "__main__":
+    unittest.main()